@@ -1,62 +1,182 @@
 """
 Script used to generate markdown for documentation
+
+    python generate-tables.py                              # 3..25 players
+    python generate-tables.py --from 3 --to 300 --jobs 4 --optimized
+
+Tables are built in parallel (process pool, --jobs). File is rewritten only
+when content hash differs from the file on disk. Manifest (manifest.json in
+tables folder) records generation parameters, content hash and timings per
+file - file with same parameters and unchanged hash is not generated again
+(unless --force).
 """
-import unittest
-from itertools import combinations
+from typing import List, Optional, Dict
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import hashlib
+import json
 import os, sys
+import time
 
 root_path = os.path.join(os.path.dirname(__file__), ".")
 sys.path.insert(0, root_path)
 tables_path = os.path.join(os.path.dirname(__file__), "tables")
 
 from round_robin_pairs import (
-        berger_tables, circle_tables, round_robin_rounds_to_str_list,
-        equalize_schedules_in_rounds, EqualizeType, pprint_player_pairs_row,
-        find_best_equalize_solution, has_ideal,
+        round_robin_rounds_to_str_list, find_best_equalize_solution, has_ideal,
         )
-from round_robin_pairs.base import FMT_WIDTH, create_demo_rounds_str_list
+from round_robin_pairs.base import create_demo_rounds_str_list
+
+# change when output of render_table() changes - all files are generated again
+GENERATOR_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+FMT_WIDTH = 3
+
+
+def get_file_name(nr_players: int) -> str:
+    return f"players-{nr_players:02d}.md"
+
+
+def get_params(nr_players: int, optimized: bool) -> Dict:
+    return {"generator_version": GENERATOR_VERSION, "nr_players": nr_players,
+            "fmt_width": FMT_WIDTH, "optimized": optimized}
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as fin:
+        return content_hash(fin.read())
+
+
+def render_table(nr_players: int, optimized: bool = False) -> str:
+    """
+    optimized - for number of players without ideal, Berger equalized
+    by find_best_equalize_solution() (without random search) is added
+    """
+    output = [f"# Round-robin pairs for {nr_players} players", "\n" * 1, "\n" * 1]
 
-def generate_tables(nr_players_from:int, nr_players_to:int):
+    variants = []
+    if has_ideal(nr_players):
+        if nr_players % 2 == 0:
+            variants.append(("Modified Berger (ideal)", {"berger": True, "ideal": True}))
+            variants.append(("Berger", {"berger": True}))
+        else:
+            variants.append(("Berger (ideal)", {"berger": True}))
+    else:
+        output.append(f"NOTE: **Currently ideal solution not available - issue with first schedule.**")
+        output.append("\n" * 2)
+        variants.append(("Berger", {"berger": True}))
+        if optimized:
+            variants.append(("Berger (optimized)", {"berger": True, "optimized": True}))
+    variants.append(("Circle", {"berger": False}))
+
+    for title, kwargs in variants:
+        kwargs["fmt_width"] = FMT_WIDTH
+        if kwargs.pop("optimized", False):
+            _, rounds, players = create_demo_rounds_str_list(nr_players, return_all=True, **kwargs)
+            best_result = find_best_equalize_solution(rounds, players, brute_force_factor=None)
+            str_list = round_robin_rounds_to_str_list(best_result.best_rounds, fmt_width=FMT_WIDTH)
+        else:
+            str_list = create_demo_rounds_str_list(nr_players, **kwargs)
+        output.append(f"## {title}")
+        output.append("\n" * 1)
+        output.append("\n```\n")
+        output.append("\n".join(str_list))
+        output.append("\n```\n")
+        output.append("\n" * 2)
+    return "".join(output)
+
+
+def generate_file(nr_players: int, optimized: bool, tables_path: str = tables_path) -> Dict:
+    " worker - renders one file, writes it only when content changed, returns manifest entry "
+    time_start = time.perf_counter()
+    content = render_table(nr_players, optimized=optimized)
+    seconds = time.perf_counter() - time_start
+
+    path = os.path.join(tables_path, get_file_name(nr_players))
+    sha256 = content_hash(content)
+    written = sha256 != file_hash(path)
+    if written:
+        with open(path, "w", encoding="utf-8") as fout:
+            fout.write(content)
+    return {"params": get_params(nr_players, optimized), "sha256": sha256,
+            "seconds": round(seconds, 4), "written": written}
+
+
+def read_manifest(tables_path: str = tables_path) -> Dict:
+    path = os.path.join(tables_path, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"files": {}}
+    with open(path, encoding="utf-8") as fin:
+        return json.load(fin)
+
+
+def write_manifest(manifest: Dict, tables_path: str = tables_path):
+    with open(os.path.join(tables_path, MANIFEST_NAME), "w", encoding="utf-8") as fout:
+        json.dump(manifest, fout, indent=2, sort_keys=True)
+        fout.write("\n")
+
+
+def generate_tables(nr_players_from:int, nr_players_to:int, jobs: int = 1, optimized: bool = False,
+                    force: bool = False, tables_path: str = tables_path) -> Dict:
+    """
+    jobs - number of worker processes, 1 - serial, 0 - number of cpus.
+    Returns manifest.
+    """
     assert nr_players_from < nr_players_to
+    manifest = read_manifest(tables_path)
+    files = manifest["files"]
 
-    print(f"Generate to '{tables_path}' folder:", end=" ")
+    todo: List[int] = []
     for nr_players in range(nr_players_from, nr_players_to+1):
-        fname = f"players-{nr_players:02d}.md"
-        with open(os.path.join(tables_path, fname), "w") as fout:
-
-            fout.write(f"# Round-robin pairs for {nr_players} players")
-            fout.write("\n" * 1)
-            fout.write("\n" * 1)
-
-            variants = []
-            if has_ideal(nr_players):
-                if nr_players % 2 == 0:
-                    variants.append(("Modified Berger (ideal)", {"berger": True, "ideal": True}))
-                    variants.append(("Berger", {"berger": True}))
-                else:
-                    variants.append(("Berger (ideal)", {"berger": True}))
-            else:
-                fout.write(f"NOTE: **Currently ideal solution not available - issue with first schedule.**")
-                fout.write("\n" * 2)
-                variants.append(("Berger", {"berger": True}))
-            variants.append(("Circle", {"berger": False}))
-
-            for title, kwargs in variants:
-                kwargs["fmt_width"] = 3
-                str_list = create_demo_rounds_str_list(nr_players, **kwargs)
-                fout.write(f"## {title}")
-                fout.write("\n" * 1)
-                fout.write("\n```\n")
-                fout.write("\n".join(str_list))
-                fout.write("\n```\n")
-                fout.write("\n" * 2)
-        print(f"{fname} ", end=" ")
+        fname = get_file_name(nr_players)
+        entry = files.get(fname)
+        if not force and entry and entry["params"] == get_params(nr_players, optimized) \
+                and entry["sha256"] == file_hash(os.path.join(tables_path, fname)):
+            continue
+        todo.append(nr_players)
 
+    print(f"Generate to '{tables_path}' folder, {len(todo)} of {nr_players_to - nr_players_from + 1} files:", end=" ")
+    time_start = time.perf_counter()
+    if jobs == 1:
+        results = [generate_file(nr_players, optimized, tables_path) for nr_players in todo]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+            # largest first - better balance
+            futures = {nr_players: executor.submit(generate_file, nr_players, optimized, tables_path)
+                       for nr_players in sorted(todo, reverse=True)}
+            results = [futures[nr_players].result() for nr_players in todo]
+
+    for nr_players, entry in zip(todo, results):
+        fname = get_file_name(nr_players)
+        files[fname] = entry
+        print(f"{fname}{'' if entry['written'] else ' (unchanged)'} ", end=" ")
     print(".")
 
+    manifest["last_run"] = {"from": nr_players_from, "to": nr_players_to, "jobs": jobs,
+                            "generated": len(todo), "written": sum(entry["written"] for entry in results),
+                            "seconds": round(time.perf_counter() - time_start, 4)}
+    write_manifest(manifest, tables_path)
+    return manifest
 
 
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Generate markdown tables")
+    parser.add_argument("--from", dest="nr_players_from", type=int, default=3)
+    parser.add_argument("--to", dest="nr_players_to", type=int, default=25)
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes, 0 - number of cpus")
+    parser.add_argument("--optimized", action="store_true", help="add optimized Berger when ideal is not available")
+    parser.add_argument("--force", action="store_true", help="generate even when manifest is up to date")
+    parser.add_argument("--tables-path", default=tables_path)
+    args = parser.parse_args(argv)
+    generate_tables(args.nr_players_from, args.nr_players_to, jobs=args.jobs, optimized=args.optimized,
+                    force=args.force, tables_path=args.tables_path)
 
-if __name__=="__main__":
-    generate_tables(3, 25)
 
+if __name__=="__main__":
+    main()
@@ -2,7 +2,66 @@ from .base import (
         berger_tables, circle_tables, round_robin_rounds_to_str_list,
         equalize_schedules_in_rounds, EqualizeType, pprint_player_pairs_row,
         find_best_equalize_solution, BestResult, has_ideal,
+        iter_berger_rounds, iter_circle_rounds, PlayerTable,
+        write_round_robin_rounds, iter_round_robin_rounds_str,
         )
+from typing import TYPE_CHECKING
+import importlib
+
+# other modules are imported on first use of their names (see __getattr__),
+# import round_robin_pairs + berger_tables() stays fast
+_LAZY_MODULES = {
+    "lookup": ("Pairing", "PairingLookup", "berger_pairing", "berger_meeting", "circle_pairing", "circle_meeting"),
+    "schedule_array": ("ScheduleArray", "berger_array", "circle_array"),
+    "cache": ("TemplateCache", "Algorithm", "cached_tables"),
+    "store": ("ScheduleStore", "StoreVariant", "build_store"),
+    "scoring": ("IncrementalScore", "batch_scores", "batch_scores_permutations", "diagonal_scores"),
+    "annealing": ("anneal_schedule",),
+    "exact": ("exact_schedule", "ExactResult"),
+    "assignment": ("assignment_schedule",),
+    "tabu": ("tabu_schedule",),
+    "genetic": ("genetic_schedule",),
+    "round_order": ("round_order_schedule",),
+    "validate": ("find_violation", "validate_schedule", "Violation", "ViolationKind"),
+    "export": ("ExportFormat", "write_csv", "read_csv", "write_ndjson", "read_ndjson",
+               "write_binary", "read_binary", "export_schedule", "load_schedule"),
+    }
+_LAZY_NAMES = {name: module_name for module_name, names in _LAZY_MODULES.items() for name in names}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
+
+if TYPE_CHECKING:
+    from .lookup import (
+            Pairing, PairingLookup,
+            berger_pairing, berger_meeting, circle_pairing, circle_meeting,
+            )
+    from .schedule_array import ScheduleArray, berger_array, circle_array
+    from .cache import TemplateCache, Algorithm, cached_tables
+    from .store import ScheduleStore, StoreVariant, build_store
+    from .scoring import IncrementalScore, batch_scores, batch_scores_permutations, diagonal_scores
+    from .annealing import anneal_schedule
+    from .exact import exact_schedule, ExactResult
+    from .assignment import assignment_schedule
+    from .tabu import tabu_schedule
+    from .genetic import genetic_schedule
+    from .round_order import round_order_schedule
+    from .validate import find_violation, validate_schedule, Violation, ViolationKind
+    from .export import (
+            ExportFormat, write_csv, read_csv, write_ndjson, read_ndjson,
+            write_binary, read_binary, export_schedule, load_schedule,
+            )
 
 __all__ = [
     "berger_tables", 
@@ -14,4 +73,48 @@ __all__ = [
     "find_best_equalize_solution",
     "BestResult",
     "has_ideal",
+    "iter_berger_rounds",
+    "iter_circle_rounds",
+    "PlayerTable",
+    "write_round_robin_rounds",
+    "iter_round_robin_rounds_str",
+    "Pairing",
+    "PairingLookup",
+    "berger_pairing",
+    "berger_meeting",
+    "circle_pairing",
+    "circle_meeting",
+    "ScheduleArray",
+    "berger_array",
+    "circle_array",
+    "TemplateCache",
+    "Algorithm",
+    "cached_tables",
+    "ScheduleStore",
+    "StoreVariant",
+    "build_store",
+    "IncrementalScore",
+    "batch_scores",
+    "batch_scores_permutations",
+    "diagonal_scores",
+    "anneal_schedule",
+    "exact_schedule",
+    "ExactResult",
+    "assignment_schedule",
+    "tabu_schedule",
+    "genetic_schedule",
+    "round_order_schedule",
+    "find_violation",
+    "validate_schedule",
+    "Violation",
+    "ViolationKind",
+    "ExportFormat",
+    "write_csv",
+    "read_csv",
+    "write_ndjson",
+    "read_ndjson",
+    "write_binary",
+    "read_binary",
+    "export_schedule",
+    "load_schedule",
     ]
@@ -0,0 +1,8 @@
+"""
+python -m round_robin_pairs --help
+"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Simulated annealing optimizer
+-----------------------------
+https://en.wikipedia.org/wiki/Simulated_annealing
+
+Starts from given (Berger) schedule and explores in-round pair swaps across
+all slots. Move is swap of two random pairs in random round, score delta is
+O(1) (IncrementalScore). Worse moves are accepted with probability
+exp(-delta / T), temperature is lowered geometrically from temperature_start
+to temperature_end over the budget (iterations and/or time).
+
+    best_result = anneal_schedule(round_robin_rounds, players, time_budget=1.0, seed=1)
+"""
+from typing import List, Optional
+import math
+import random
+import time
+
+from .base import (
+        PlayerName, RoundRobnRounds, JustScore, BestResult, EqualizeType,
+        get_score_lower_bound,
+        )
+from .scoring import IncrementalScore
+
+TEMPERATURE_START = 0.6
+TEMPERATURE_END = 0.05
+# part of moves which start from a player with unjust schedules
+DIRECTED_RATIO = 0.5
+DIRECTED_TRIES = 8
+# how often time budget is checked
+TIME_CHECK_EVERY = 1000
+
+
+def anneal_schedule(
+        round_robin_rounds: RoundRobnRounds,
+        players: List[PlayerName],
+        max_iterations: Optional[int] = 100_000,
+        time_budget: Optional[float] = None,
+        temperature_start: float = TEMPERATURE_START,
+        temperature_end: float = TEMPERATURE_END,
+        seed: Optional[int] = None,
+        directed_ratio: float = DIRECTED_RATIO,
+        target_score: Optional[JustScore] = None,
+        verbose: bool = False) -> BestResult:
+    """ 
+    max_iterations and/or time_budget (seconds) - at least one is required,
+    when both are given the first one reached stops the search. Stops as
+    well when score reaches target_score or lower bound (ideal).
+    """
+    if not max_iterations and not time_budget:
+        raise ValueError("Provide max_iterations and/or time_budget")
+    assert 0 < temperature_end <= temperature_start
+
+    rnd = random.Random(seed)
+    scorer = IncrementalScore(round_robin_rounds, players=players)
+    nr_rounds, nr_slots = scorer.nr_rounds, scorer.nr_slots
+    nr_players = len(scorer.players)
+    score_by_players = scorer.score_by_players
+    # slot of player in the round - index: round_idx * nr_players + player_idx
+    positions = [0] * (nr_rounds * nr_players)
+    for round_idx in range(nr_rounds):
+        for slot_idx in range(nr_slots):
+            pl1, pl2 = scorer.schedule.pair_idxs(round_idx, slot_idx)
+            positions[round_idx * nr_players + pl1] = slot_idx
+            positions[round_idx * nr_players + pl2] = slot_idx
+
+    best_result = BestResult(players=players)
+    best_result.score_before = scorer.score
+    best_result.best_score = scorer.score
+    best_result.best_eq_type = EqualizeType.ANNEALING
+    best_result.best_offset_x = 0
+    best_data = scorer.schedule.data[:]
+
+    stop_score = get_score_lower_bound(len(players))
+    if target_score is not None:
+        stop_score = max(stop_score, target_score)
+
+    log_ratio = math.log(temperature_end / temperature_start)
+    time_start = time.perf_counter()
+    temperature = temperature_start
+    iteration = 0
+    while nr_slots > 1 and best_result.best_score > stop_score:
+        if iteration % TIME_CHECK_EVERY == 0:
+            progress = 0.0
+            if max_iterations:
+                progress = iteration / max_iterations
+            if time_budget:
+                progress = max(progress, (time.perf_counter() - time_start) / time_budget)
+            if progress >= 1.0:
+                break
+            temperature = temperature_start * math.exp(log_ratio * progress)
+        iteration += 1
+
+        round_idx = rnd.randrange(nr_rounds)
+        slot_idx_1 = -1
+        if rnd.random() < directed_ratio:
+            # player with unjust schedules -> its pair in the round
+            for _ in range(DIRECTED_TRIES):
+                player_idx = rnd.randrange(nr_players)
+                if score_by_players[player_idx] > 1:
+                    slot_idx_1 = positions[round_idx * nr_players + player_idx]
+                    break
+        if slot_idx_1 < 0:
+            slot_idx_1 = rnd.randrange(nr_slots)
+        slot_idx_2 = rnd.randrange(nr_slots - 1)
+        if slot_idx_2 >= slot_idx_1:
+            slot_idx_2 += 1
+
+        delta = scorer.swap_delta(round_idx, slot_idx_1, slot_idx_2)
+        if delta <= 0 or rnd.random() < math.exp(-delta / temperature):
+            scorer.apply_swap(round_idx, slot_idx_1, slot_idx_2, record=False)
+            for slot_idx in (slot_idx_1, slot_idx_2):
+                pl1, pl2 = scorer.schedule.pair_idxs(round_idx, slot_idx)
+                positions[round_idx * nr_players + pl1] = slot_idx
+                positions[round_idx * nr_players + pl2] = slot_idx
+            if scorer.score < best_result.best_score:
+                best_result.best_score = scorer.score
+                best_data = scorer.schedule.data[:]
+                if verbose:
+                    print(f"-- ANNEALING: it={iteration:>8}, T={temperature:.3f}, score={scorer.score}")
+
+    scorer.schedule.data = best_data
+    best_result.best_rounds = scorer.schedule.to_rounds()
+    if verbose:
+        print(f"-- ANNEALING: done after {iteration} iterations, {time.perf_counter() - time_start:.2f}s: {best_result}")
+    return best_result
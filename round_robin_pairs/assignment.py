@@ -0,0 +1,155 @@
+"""
+Per-round linear assignment optimizer
+-------------------------------------
+Equalizers swap only pair in slot 0 with one other slot. Here whole round
+is reassigned: when all other rounds are fixed, cost of putting pair to
+slot is marginal penalty of its 2 players from their slot counts in other
+rounds. Players in a round are different, so the costs are independent and
+the optimal assignment of the round is linear assignment problem, solved
+with Hungarian algorithm in O(slots^3).
+
+Rounds are reassigned one after another in sweeps until no round changes
+(score never gets worse), which is deterministic and polynomial.
+
+Works as improvement pass on any schedule. Berger schedule itself is local
+optimum (no single round can be improved), so start from best_rounds of
+find_best_equalize_solution():
+
+    best_result = find_best_equalize_solution(round_robin_rounds, players, brute_force_factor=None)
+    best_result = assignment_schedule(best_result.best_rounds, players)
+"""
+from typing import List, Optional, Sequence
+import time
+
+from .base import (
+        PlayerName, RoundRobnRounds, JustScore, BestResult, EqualizeType,
+        get_score_lower_bound, slot_count_penalty,
+        )
+from .schedule_array import ScheduleArray
+
+
+def linear_assignment(cost: Sequence[Sequence[JustScore]]) -> List[int]:
+    """
+    minimal cost assignment for square cost matrix - returns column for
+    every row. Hungarian algorithm with potentials (shortest augmenting
+    paths), rows are added one by one.
+    """
+    size = len(cost)
+    inf = float("inf")
+    # potentials and matching are 1-based, column 0 is virtual
+    row_pot = [0] * (size + 1)
+    col_pot = [0] * (size + 1)
+    col_row = [0] * (size + 1)
+    way = [0] * (size + 1)
+    for row in range(1, size + 1):
+        col_row[0] = row
+        col = 0
+        min_to = [inf] * (size + 1)
+        used = [False] * (size + 1)
+        while True:
+            used[col] = True
+            row_cur = col_row[col]
+            row_cost = cost[row_cur - 1]
+            delta, col_next = inf, 0
+            for col_idx in range(1, size + 1):
+                if not used[col_idx]:
+                    reduced = row_cost[col_idx - 1] - row_pot[row_cur] - col_pot[col_idx]
+                    if reduced < min_to[col_idx]:
+                        min_to[col_idx] = reduced
+                        way[col_idx] = col
+                    if min_to[col_idx] < delta:
+                        delta, col_next = min_to[col_idx], col_idx
+            for col_idx in range(size + 1):
+                if used[col_idx]:
+                    row_pot[col_row[col_idx]] += delta
+                    col_pot[col_idx] -= delta
+                else:
+                    min_to[col_idx] -= delta
+            col = col_next
+            if col_row[col] == 0:
+                break
+        # augment along the path
+        while col:
+            col_prev = way[col]
+            col_row[col] = col_row[col_prev]
+            col = col_prev
+
+    row_cols = [0] * size
+    for col_idx in range(1, size + 1):
+        row_cols[col_row[col_idx] - 1] = col_idx - 1
+    return row_cols
+
+
+def assignment_schedule(
+        round_robin_rounds: RoundRobnRounds,
+        players: List[PlayerName],
+        max_sweeps: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        verbose: bool = False) -> BestResult:
+    """
+    max_sweeps - max. number of passes over all rounds, None - until
+    converged (no round changed in a pass). Stops as well on time_budget
+    (seconds, checked after every round) or when score reaches lower bound.
+    """
+    schedule = ScheduleArray.from_rounds(round_robin_rounds, players=players)
+    nr_rounds, nr_slots = schedule.nr_rounds, schedule.nr_slots
+    data = schedule.data
+    penalties = [slot_count_penalty(sch_cnt) for sch_cnt in range(nr_rounds + 2)]
+    # marginal penalty of one more game in slot with count
+    marginals = [penalties[sch_cnt + 1] - penalties[sch_cnt] for sch_cnt in range(nr_rounds + 1)]
+
+    counts = [0] * (len(schedule.players) * nr_slots)
+    for offset in range(0, len(data), 2):
+        slot_idx = (offset // 2) % nr_slots
+        counts[data[offset] * nr_slots + slot_idx] += 1
+        counts[data[offset + 1] * nr_slots + slot_idx] += 1
+    score = sum(penalties[sch_cnt] for sch_cnt in counts)
+
+    best_result = BestResult(players=players)
+    best_result.score_before = score
+    best_result.best_eq_type = EqualizeType.ASSIGNMENT
+    best_result.best_offset_x = 0
+    stop_score = get_score_lower_bound(len(schedule.players))
+
+    time_start = time.perf_counter()
+    sweep, changed = 0, True
+    while changed and (max_sweeps is None or sweep < max_sweeps) and score > stop_score:
+        sweep += 1
+        changed = False
+        for round_idx in range(nr_rounds):
+            round_offset = round_idx * nr_slots * 2
+            pairs = [(data[round_offset + slot_idx * 2], data[round_offset + slot_idx * 2 + 1])
+                     for slot_idx in range(nr_slots)]
+            for slot_idx, (pl1, pl2) in enumerate(pairs):
+                counts[pl1 * nr_slots + slot_idx] -= 1
+                counts[pl2 * nr_slots + slot_idx] -= 1
+
+            cost = [[marginals[counts[pl1 * nr_slots + slot_idx]] + marginals[counts[pl2 * nr_slots + slot_idx]]
+                     for slot_idx in range(nr_slots)]
+                    for pl1, pl2 in pairs]
+            slots = linear_assignment(cost)
+            cost_before = sum(cost[pair_idx][pair_idx] for pair_idx in range(nr_slots))
+            cost_after = sum(cost[pair_idx][slot_idx] for pair_idx, slot_idx in enumerate(slots))
+            # keep current on ties - no cycling between equal assignments
+            if cost_after < cost_before:
+                score += cost_after - cost_before
+                changed = True
+            else:
+                slots = range(nr_slots)
+
+            for (pl1, pl2), slot_idx in zip(pairs, slots):
+                counts[pl1 * nr_slots + slot_idx] += 1
+                counts[pl2 * nr_slots + slot_idx] += 1
+                data[round_offset + slot_idx * 2] = pl1
+                data[round_offset + slot_idx * 2 + 1] = pl2
+            if score <= stop_score or (time_budget is not None and time.perf_counter() - time_start > time_budget):
+                changed = False
+                break
+        if verbose:
+            print(f"-- ASSIGNMENT: sweep={sweep:>3}, score={score}")
+
+    best_result.best_score = score
+    best_result.best_rounds = schedule.to_rounds()
+    if verbose:
+        print(f"-- ASSIGNMENT: done after {sweep} sweeps, {time.perf_counter() - time_start:.2f}s: {best_result}")
+    return best_result
@@ -26,21 +26,49 @@ TODO: functions equalize_schedules_in_rounds() and find_best_equalize_solution()
 
 """
 
-from typing import List, Tuple, Dict, Optional
-from pprint import pprint
-from collections import OrderedDict
-from copy import deepcopy
+from typing import List, Tuple, Dict, Optional, Iterator, Callable, TYPE_CHECKING
+import importlib
+import importlib.util
 import enum
 import random
-from dataclasses import dataclass, field
-from itertools import combinations
+import sys
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
-try:
-    # optional
-    import colorama 
-except ImportError:
-    colorama = None
+
+class _LazyModule:
+    " module imported on first attribute access, attributes are cached "
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        value = getattr(importlib.import_module(self._name), attr)
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}>"
+
+
+def optional_import(name: str):
+    """
+    optional dependency - None when not installed, otherwise module is
+    imported on first use (batch jobs and CLI do not pay for it when unused)
+    """
+    if name in sys.modules:
+        # None when import is blocked
+        return sys.modules[name]
+    if importlib.util.find_spec(name) is None:
+        return None
+    return _LazyModule(name)
+
+
+# optional - only for mark_players
+colorama = optional_import("colorama")
 
 PlayerName = str
 RoundRobinRow = List[Tuple[PlayerName, PlayerName]]
@@ -48,6 +76,7 @@ RoundRobnRounds = List[RoundRobinRow]
 JustScore = float
 
 FMT_WIDTH = 1
+BYE: PlayerName = "BYE"
 
 def pp_players_row(players_row, fmt_width: int = FMT_WIDTH):
     return " ".join([f"{pl:>{fmt_width}}" for pl in players_row])
@@ -66,57 +95,120 @@ def pp_player_pairs_row(player_pairs_row: RoundRobinRow, fmt_width: int = FMT_WI
     fmt_same_width = get_fmt_pair_same_width(fmt_width)
     return " ".join([fmt_same_width.format(pl1, pl2) for pl1, pl2 in player_pairs_row])
 
-def round_robin_rounds_to_str_list(round_robin_rounds: RoundRobnRounds, fmt_width:int = FMT_WIDTH, mark_players:Optional[PlayerName]=None) -> List[str]:
-    fmt_same_width = get_fmt_pair_same_width(fmt_width)
-    output = []
-    fmt_rd = f"{{:>{fmt_width}}}"
-    sep = " " if fmt_width== 1 else "  "
-    if fmt_width>1:
-        pair_len = len(fmt_same_width.format("x", "y"))
-        game_round0 = round_robin_rounds[0]
-        header ="Round {}  {}".format(fmt_rd.format(""), sep.join([f"{nr:>{pair_len}}" for nr, _ in enumerate(game_round0, 1)])) 
-        output.append(header)
-        output.append("-" * len(header))
-
-    if colorama and mark_players:
-        all_colors = [
-                    [colorama.Back.BLUE], 
-                    [colorama.Fore.BLACK, colorama.Back.YELLOW], 
-                    [colorama.Fore.MAGENTA], 
-                    [colorama.Fore.GREEN], 
-                    [colorama.Fore.BLUE], 
-                    [colorama.Fore.RED],
-                    ]
-        # 'LIGHTBLACK_EX', 'LIGHTBLUE_EX', 'LIGHTCYAN_EX', 'LIGHTGREEN_EX', 'LIGHTMAGENTA_EX', 'LIGHTRED_EX', 
-        # 'LIGHTWHITE_EX', 'LIGHTYELLOW_EX', 'RED', 'RESET', 'WHITE', 
-        assert len(mark_players) <= len(all_colors)
-        player_colors = dict([(pl, all_colors[idx]) for idx, pl in enumerate(mark_players)])
-    else:
-        player_colors = {}
+# characters collected before one write() to the stream
+WRITE_BUFFER_SIZE = 64 * 1024
 
 
-    fmt_pl = get_fmt_pl_same_width(fmt_width)
+class _PlayerTokens(dict):
+    " player name -> encoded string, each player encoded once on first use (renderer, exporters) "
+
+    def __init__(self, encode: Callable[[PlayerName], str]):
+        super().__init__()
+        self.encode = encode
 
-    for rd, game_round in enumerate(round_robin_rounds, 1):
-        pair_out = []
-        for p1, p2 in game_round:
+    def __missing__(self, pl: PlayerName) -> str:
+        pl_str = self[pl] = self.encode(pl)
+        return pl_str
 
-            p1_str, p2_str = fmt_pl.format(p1), fmt_pl.format(p2)
-            if colorama:
-                if p1 in player_colors:
-                    p1_str = "".join(player_colors[p1]) + p1_str + colorama.Style.RESET_ALL
-                if p2 in player_colors:
-                    p2_str = "".join(player_colors[p2]) + p2_str + colorama.Style.RESET_ALL
-            # fmt_same_width.format(p1, p2)
-            pair_out.append(f"{p1_str}-{p2_str}")
-        output.append("Round {}: {}".format(fmt_rd.format(rd), sep.join(pair_out)))
 
+def _get_player_encode(fmt_width: int, mark_players: Optional[List[PlayerName]]) -> Callable[[PlayerName], str]:
+    " player name -> formatted (and colored) string "
+    fmt_pl = get_fmt_pl_same_width(fmt_width)
+    player_colors = _get_player_colors(mark_players)
+    if not player_colors:
+        return fmt_pl.format
+
+    def encode(pl: PlayerName) -> str:
+        if pl in player_colors:
+            return "".join(player_colors[pl]) + fmt_pl.format(pl) + colorama.Style.RESET_ALL
+        return fmt_pl.format(pl)
+    return encode
+
+
+def _get_player_colors(mark_players: Optional[List[PlayerName]]) -> Dict[PlayerName, List[str]]:
+    if not (colorama and mark_players):
+        return {}
+    all_colors = [
+                [colorama.Back.BLUE], 
+                [colorama.Fore.BLACK, colorama.Back.YELLOW], 
+                [colorama.Fore.MAGENTA], 
+                [colorama.Fore.GREEN], 
+                [colorama.Fore.BLUE], 
+                [colorama.Fore.RED],
+                ]
+    # 'LIGHTBLACK_EX', 'LIGHTBLUE_EX', 'LIGHTCYAN_EX', 'LIGHTGREEN_EX', 'LIGHTMAGENTA_EX', 'LIGHTRED_EX', 
+    # 'LIGHTWHITE_EX', 'LIGHTYELLOW_EX', 'RED', 'RESET', 'WHITE', 
+    assert len(mark_players) <= len(all_colors)
+    return dict([(pl, all_colors[idx]) for idx, pl in enumerate(mark_players)])
+
+
+def iter_round_robin_rounds_str(round_robin_rounds: RoundRobnRounds, fmt_width:int = FMT_WIDTH, 
+                                mark_players:Optional[List[PlayerName]]=None,
+                                round_range:Optional[range]=None) -> Iterator[str]:
+    """
+    lines of round_robin_rounds_to_str_list() one by one. round_range - round
+    indexes (0-based) to render, default all. Format strings and player
+    strings are prepared once, ScheduleArray is rendered from player indexes.
+    """
+    fmt_rd = f"{{:>{fmt_width}}}"
+    sep = " " if fmt_width== 1 else "  "
+    header = None
     if fmt_width>1:
-        output.append("-" * len(header))
-    return output
+        pair_len = len(get_fmt_pair_same_width(fmt_width).format("x", "y"))
+        nr_slots = len(round_robin_rounds[0])
+        header ="Round {}  {}".format(fmt_rd.format(""), sep.join([f"{nr:>{pair_len}}" for nr in range(1, nr_slots + 1)])) 
+        yield header
+        yield "-" * len(header)
+
+    player_strs = _PlayerTokens(_get_player_encode(fmt_width, mark_players))
+    if round_range is None:
+        round_range = range(len(round_robin_rounds))
+
+    data = getattr(round_robin_rounds, "data", None)
+    if data is not None:
+        # ScheduleArray - tokens by player index
+        pl_strs = [player_strs[pl] for pl in round_robin_rounds.players]
+        size = round_robin_rounds.nr_slots * 2
+        for rd in round_range:
+            idxs = iter(data[rd * size: (rd + 1) * size])
+            yield "Round {}: {}".format(fmt_rd.format(rd + 1), sep.join([f"{pl_strs[p1]}-{pl_strs[p2]}" for p1, p2 in zip(idxs, idxs)]))
+    else:
+        for rd in round_range:
+            pair_out = [f"{player_strs[p1]}-{player_strs[p2]}" for p1, p2 in round_robin_rounds[rd]]
+            yield "Round {}: {}".format(fmt_rd.format(rd + 1), sep.join(pair_out))
+
+    if header is not None:
+        yield "-" * len(header)
+
+
+def write_round_robin_rounds(round_robin_rounds: RoundRobnRounds, stream, fmt_width:int = FMT_WIDTH, 
+                             mark_players:Optional[List[PlayerName]]=None,
+                             round_range:Optional[range]=None,
+                             buffer_size:int = WRITE_BUFFER_SIZE) -> None:
+    """
+    streaming renderer - writes lines of round_robin_rounds_to_str_list() to
+    text stream (file, sys.stdout, StringIO) in chunks of ~buffer_size
+    characters. Whole output is never held in memory.
+    """
+    buffer, buffered = [], 0
+    for line in iter_round_robin_rounds_str(round_robin_rounds, fmt_width=fmt_width, 
+                                            mark_players=mark_players, round_range=round_range):
+        buffer.append(line)
+        buffered += len(line) + 1
+        if buffered >= buffer_size:
+            buffer.append("")
+            stream.write("\n".join(buffer))
+            buffer, buffered = [], 0
+    if buffer:
+        buffer.append("")
+        stream.write("\n".join(buffer))
+
+
+def round_robin_rounds_to_str_list(round_robin_rounds: RoundRobnRounds, fmt_width:int = FMT_WIDTH, mark_players:Optional[PlayerName]=None) -> List[str]:
+    return list(iter_round_robin_rounds_str(round_robin_rounds, fmt_width=fmt_width, mark_players=mark_players))
 
 def pprint_player_pairs_row(round_robin_rounds: RoundRobnRounds, fmt_width:int = FMT_WIDTH, mark_players:Optional[PlayerName]=None) -> None:
-    print("\n".join(round_robin_rounds_to_str_list(round_robin_rounds, fmt_width=fmt_width, mark_players=mark_players)))
+    write_round_robin_rounds(round_robin_rounds, sys.stdout, fmt_width=fmt_width, mark_players=mark_players)
 
 def pprint_schedules(schedule_dict: Dict, players: List, nr_schedules:int):
     schedules = range(1, nr_schedules+1)
@@ -150,14 +242,57 @@ def berger_tables(players: List[PlayerName], ideal:bool=False, verbose:bool = Fa
         print(players)
     assert n > 0 
     if n % 2 == 1:
-        players.append("BYE")
-        n = len(players)
+        players.append(BYE)
+
+    rounds = list(iter_berger_rounds(players, verbose=verbose))
+
+    if ideal and nr_players % 2 == 0:
+        rounds, _, _ = \
+                equalize_schedules_in_rounds(rounds, 
+                                             eq_type="DIAG_R2L2R", 
+                                             verbose=verbose)
+        # ALT: 
+        #   best_result = BestResult(players=players)
+        #   _find_best_iteration(
+        #       round_robin_rounds= round_robin_rounds,
+        #       eq_type = "DIAG_R2L2R",
+        #       offset_x = 0,
+        #       best_result = best_result,
+        #       players = players,
+        #       verbose = verbose,
+        #       )
+        #   rounds = best_result.best_rounds
+
+    return rounds
+
+
+def circle_tables(players: List[PlayerName], verbose:bool = False) -> RoundRobnRounds:
+    n = len(players)
+    assert n > 0 
+    if n % 2 == 1:
+        players.insert(0, BYE)
+
+    return list(iter_circle_rounds(players, verbose=verbose))
+
+
+def iter_berger_rounds(players: List[PlayerName], verbose:bool = False) -> Iterator[RoundRobinRow]:
+    """ 
+    streaming variant of berger_tables() without ideal - yields one round at
+    a time, same pairs and order. Working memory is O(n).  Input players
+    list is not changed (BYE is added to internal copy for odd number of
+    players).
+    """
+    n = len(players)
+    assert n > 0 
+    fixed_players = list(players)
+    if n % 2 == 1:
+        fixed_players.append(BYE)
+        n = len(fixed_players)
     n_half = n // 2
 
-    fixed = players[-1]
-    wheel = list(reversed(players[:-1]))
+    fixed = fixed_players[-1]
+    wheel = list(reversed(fixed_players[:-1]))
 
-    rounds = []
     for round_nr in range(n-1):
         even_round = (round_nr % 2 == 0)
         pairs = []
@@ -176,58 +311,135 @@ def berger_tables(players: List[PlayerName], ideal:bool=False, verbose:bool = Fa
         if verbose:
             print(f"{round_nr+1:>2}. {pp_player_pairs_row(pairs)}")
 
-        rounds.append(pairs)
+        yield pairs
 
         wheel = wheel[n_half-1:] + wheel[:n_half-1]
-        # if round_nr > 4: break
-
-    if ideal and nr_players % 2 == 0:
-        rounds, _, _ = \
-                equalize_schedules_in_rounds(rounds, 
-                                             eq_type="DIAG_R2L2R", 
-                                             verbose=verbose)
-        # ALT: 
-        #   best_result = BestResult(players=players)
-        #   _find_best_iteration(
-        #       round_robin_rounds= round_robin_rounds,
-        #       eq_type = "DIAG_R2L2R",
-        #       offset_x = 0,
-        #       best_result = best_result,
-        #       players = players,
-        #       verbose = verbose,
-        #       )
-        #   rounds = best_result.best_rounds
-
-    return rounds
 
 
-def circle_tables(players: List[PlayerName], verbose:bool = False) -> RoundRobnRounds:
+def iter_circle_rounds(players: List[PlayerName], verbose:bool = False) -> Iterator[RoundRobinRow]:
+    """ 
+    streaming variant of circle_tables() - yields one round at a time, same
+    pairs and order. Working memory is O(n). Input players list is not
+    changed (BYE is added to internal copy for odd number of players).
+    """
     n = len(players)
     assert n > 0 
+    players_round = list(players)
     if n % 2 == 1:
-        players.insert(0, "BYE")
-        n = len(players)
+        players_round.insert(0, BYE)
+        n = len(players_round)
     
     half_n = n // 2
-    players_round = players[:]
     players_up   = players_round[:half_n]
     players_down = list(reversed(players_round[half_n:]))
-    output = []
     
     for game_round in range(1, (n +1)-1):
         pairs = list(zip(players_up, players_down))
-        output.append(pairs)
         if verbose:
             print(game_round, 
                     "\n", " ".join([f"{pl:>2}" for pl in players_up]), 
                     "\n", " ".join([f"{pl:>2}" for pl in players_down])) # , "\n", pairs)
+        yield pairs
         last_up    = players_up.pop(-1)
         first_down = players_down.pop(0)
         players_up.insert(0 + 1, first_down)
         players_down.append(last_up)
 
 
-    return output
+PlayerIdxRounds = List[List[Tuple[int, int]]]
+
+
+class PlayerTable:
+    """ 
+    players names interned to dense ints 0..n-1 (index in players). Names
+    are translated once at the edges - internal loops work with ints:
+
+        table = PlayerTable.from_rounds(round_robin_rounds)
+        rounds_idxs = table.intern_rounds(round_robin_rounds)
+        ...
+        round_robin_rounds = table.names_rounds(rounds_idxs)
+    """
+    __slots__ = ("players", "player_idxs")
+
+    def __init__(self, players: List[PlayerName]):
+        self.players = list(players)
+        self.player_idxs: Dict[PlayerName, int] = {pl: idx for idx, pl in enumerate(self.players)}
+        if len(self.player_idxs) != len(self.players):
+            raise ValueError("Players names should be unique")
+
+    @classmethod
+    def from_rounds(cls, round_robin_rounds: RoundRobnRounds, 
+                    players: Optional[List[PlayerName]] = None) -> "PlayerTable":
+        """ 
+        players if not provided are detected in order of appearance,
+        otherwise checked against players in rounds
+        """
+        player_idxs: Dict[PlayerName, int] = {}
+        for round_pairs in round_robin_rounds:
+            for pl1, pl2 in round_pairs:
+                if pl1 not in player_idxs:
+                    player_idxs[pl1] = len(player_idxs)
+                if pl2 not in player_idxs:
+                    player_idxs[pl2] = len(player_idxs)
+        if players:
+            set_d, set_p = set(player_idxs), set(players)
+            if set_d!=set_p:
+                raise Exception(f"From schedules detected players which differs from given players: {set_d - set_p} / {set_p - set_d}")
+            return cls(players)
+        return cls(list(player_idxs))
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __contains__(self, player: PlayerName) -> bool:
+        return player in self.player_idxs
+
+    def index(self, player: PlayerName) -> int:
+        return self.player_idxs[player]
+
+    def name(self, player_idx: int) -> PlayerName:
+        return self.players[player_idx]
+
+    def intern_rounds(self, round_robin_rounds: RoundRobnRounds) -> PlayerIdxRounds:
+        " rounds of pairs of player indexes - ScheduleArray with same players is not translated "
+        if getattr(round_robin_rounds, "players", None) == self.players:
+            return round_robin_rounds.to_indexes()
+        player_idxs = self.player_idxs
+        return [[(player_idxs[pl1], player_idxs[pl2]) for pl1, pl2 in round_pairs]
+                for round_pairs in round_robin_rounds]
+
+    def names_rounds(self, rounds_idxs: PlayerIdxRounds) -> RoundRobnRounds:
+        players = self.players
+        return [[(players[pl1], players[pl2]) for pl1, pl2 in round_pairs]
+                for round_pairs in rounds_idxs]
+
+
+def slot_count_penalty(sch_cnt: int) -> JustScore:
+    " penalty for number of player's games in one schedule "
+    # only preffered values is 1 
+    # each player plays in a schedule once 
+    if True:
+        if sch_cnt==2:
+            add = 0
+        elif sch_cnt<2:
+            # 1 -> 1, 0->2
+            add = (2 - sch_cnt)
+        else:
+            # 3 -> 2, 4 -> 3, ...
+            add = (sch_cnt - 2) + 1
+    else:
+        add = abs(sch_cnt -1) 
+    # new:
+    #   a) ako ima 1 za termin -> 1
+    #   b) ako ima 2 za termin -> 0
+    #   c) ako ima 0 za termin -> -2
+    #   d) ako ima 3+ za termin -> +1 * (N-2), npr. 3 ima (3-1) = +2
+    # old:
+    #   a) ako ima 1 za termin -> 0
+    #   b) ako ima 2 za termin -> +1
+    #   c) ako ima 0 za termin -> +1
+    #   d) ako ima 3+ za termin -> +1 * (N-1), npr. 3 ima (3-1) = +2
+    return add
 
 
 def get_just_score(players: List[PlayerName], 
@@ -235,44 +447,26 @@ def get_just_score(players: List[PlayerName],
                    round_robin_rounds: RoundRobnRounds, 
                    verbose:bool = False) -> Tuple[Dict[PlayerName, JustScore], JustScore, Dict, Dict]:
 
-    schedule_dict = {pl : {sch_nr: 0 for sch_nr in range(1, nr_schedules+1)} for pl in players}
-    first_dict = {pl : 0 for pl in players}
-
+    # counted by player indexes, dicts by names are built at the end
+    table = PlayerTable(players)
+    counts = [0] * (len(players) * nr_schedules)
+    first_counts = [0] * len(players)
+    player_idxs = table.player_idxs
     for round_pairs in round_robin_rounds:
-        for sch_nr, (pl1, pl2) in enumerate(round_pairs, 1):
-            schedule_dict[pl1][sch_nr] += 1
-            schedule_dict[pl2][sch_nr] += 1
-            first_dict[pl1] +=1
-
-
-    score_by_players = {pl : 0 for pl in players}
-
-    for pl, sch_cnt_dict in schedule_dict.items():
-        for sch_nr, sch_cnt in sch_cnt_dict.items():
-            # only preffered values is 1 
-            # each player plays in a schedule once 
-            if True:
-                if sch_cnt==2:
-                    add = 0
-                elif sch_cnt<2:
-                    # 1 -> 1, 0->2
-                    add = (2 - sch_cnt)
-                else:
-                    # 3 -> 2, 4 -> 3, ...
-                    add = (sch_cnt - 2) + 1
-            else:
-                add = abs(sch_cnt -1) 
-            score_by_players[pl] += add
-            # new:
-            #   a) ako ima 1 za termin -> 1
-            #   b) ako ima 2 za termin -> 0
-            #   c) ako ima 0 za termin -> -2
-            #   d) ako ima 3+ za termin -> +1 * (N-2), npr. 3 ima (3-1) = +2
-            # old:
-            #   a) ako ima 1 za termin -> 0
-            #   b) ako ima 2 za termin -> +1
-            #   c) ako ima 0 za termin -> +1
-            #   d) ako ima 3+ za termin -> +1 * (N-1), npr. 3 ima (3-1) = +2
+        for sch_idx, (pl1, pl2) in enumerate(round_pairs):
+            pl1, pl2 = player_idxs[pl1], player_idxs[pl2]
+            counts[pl1 * nr_schedules + sch_idx] += 1
+            counts[pl2 * nr_schedules + sch_idx] += 1
+            first_counts[pl1] +=1
+
+    penalties = [slot_count_penalty(sch_cnt) for sch_cnt in range(len(round_robin_rounds) + 1)]
+    sch_nrs = range(1, nr_schedules+1)
+    schedule_dict, score_by_players = {}, {}
+    for pl_idx, pl in enumerate(players):
+        pl_counts = counts[pl_idx * nr_schedules: (pl_idx + 1) * nr_schedules]
+        schedule_dict[pl] = dict(zip(sch_nrs, pl_counts))
+        score_by_players[pl] = sum(map(penalties.__getitem__, pl_counts))
+    first_dict = dict(zip(players, first_counts))
 
     score = sum(score_by_players.values())
     if verbose:
@@ -322,12 +516,130 @@ class EqualizeType(str, enum.Enum):
     DIAG_L2R2L = "DIAG_L2R2L"
     BRUTE_FORCE = "BRUTE_FORCE"
     CROSS = "CROSS"
+    # optimizers - all slots, see annealing, exact, assignment, tabu and genetic modules
+    ANNEALING = "ANNEALING"
+    EXACT = "EXACT"
+    ASSIGNMENT = "ASSIGNMENT"
+    TABU = "TABU"
+    GENETIC = "GENETIC"
 
     @classmethod
     def values(cls):
         return [k for k,v in EqualizeType.__members__.items()]
 
 
+def get_swap_idxs(eq_type: EqualizeType, nr_rounds: int, nr_schedules: int, offset_x: int = 0,
+                  rnd: Optional[random.Random] = None) -> List[int]:
+    """ 
+    equalize candidate - for each round index of schedule (slot) which is
+    swapped with the first one (where berger and circle put fixed player).
+    Can be negative - same as list index.
+    rnd - for BRUTE_FORCE, when not provided global random is reseeded
+    """
+    swap_idxs: List[int] = []
+    if eq_type==EqualizeType.BRUTE_FORCE:
+        if rnd is None:
+            random.seed()
+            rnd = random
+        random_swaps = []
+        for rnr in range(nr_rounds):
+            # 1. the most simple method:
+            #    berger and cricle put fixed player in first schedule
+            #    this method swaps first pair based on round number
+            l2r = None
+            if not random_swaps:
+                random_swaps = list(range(nr_schedules))
+                rnd.shuffle(random_swaps)
+                # print("random", rnr, random_swaps)
+            idx_other = random_swaps.pop(0)
+            # print("random", idx_other)
+            swap_idxs.append(idx_other)
+    else:
+        for rnr in range(nr_rounds):
+            if eq_type==EqualizeType.CROSS:
+                # div = rnr // nr_schedules
+                if rnr % 2 ==0:
+                    l2r = True
+                    nr = rnr // 2
+                    idx_other = nr % nr_schedules
+                else:
+                    l2r = False
+                    idx_other = -1 * ((nr+1) % nr_schedules)
+                # print(rnr, idx_other)
+            elif eq_type==EqualizeType.DIAG_L2R:
+                l2r = True
+                idx_other = rnr % nr_schedules
+                # print(rnr, idx_other)
+            elif eq_type==EqualizeType.DIAG_R2L:
+                l2r = False
+                idx_other = -1 * ((rnr+1) % nr_schedules)
+            elif eq_type==EqualizeType.DIAG_L2R2L:
+                div = rnr // nr_schedules
+                if div % 2 == 0:
+                    l2r = True
+                    idx_other = rnr % nr_schedules
+                else:
+                    l2r = False
+                    idx_other = -1 * ((rnr+2) % nr_schedules)
+                # print(idx_other)
+            elif eq_type==EqualizeType.DIAG_R2L2R:
+                div = rnr // nr_schedules
+                if div % 2 == 0:
+                    l2r = False
+                    idx_other = -1 * ((rnr+1) % nr_schedules)
+                else:
+                    l2r = True
+                    idx_other = ((rnr+1) % nr_schedules)
+            else:
+                raise Exception(f"Unknown for {eq_type}. Select one of: {', '.join(EqualizeType.values())}")
+
+            if offset_x:
+                idx_other = (idx_other + offset_x) 
+                if abs(idx_other) >= nr_schedules:
+                    idx_other = ((idx_other + 0) % nr_schedules) * +1
+            swap_idxs.append(idx_other)
+    return swap_idxs
+
+
+def apply_swap_idxs(round_robin_rounds: RoundRobnRounds, swap_idxs: List[int]) -> RoundRobnRounds:
+    " materializes equalize candidate - copy of rounds with first pair swapped by swap_idxs "
+    from copy import deepcopy
+    round_robin_rounds = deepcopy(round_robin_rounds)
+    for round_pairs, idx_other in zip(round_robin_rounds, swap_idxs):
+        swap(round_pairs, (0, idx_other))
+    return round_robin_rounds
+
+
+class SwapCandidateScorer:
+    """ 
+    scores equalize candidates (swap_idxs from get_swap_idxs()) lazily on
+    shared read-only base rounds - same score as get_just_score() of
+    apply_swap_idxs() result, but nothing is copied per candidate.
+    """
+    def __init__(self, round_robin_rounds: RoundRobnRounds, players: List[PlayerName]):
+        table = PlayerTable.from_rounds(round_robin_rounds, players=players)
+        self.nr_schedules = len(round_robin_rounds[0])
+        self.base = table.intern_rounds(round_robin_rounds)
+        self.penalties = [slot_count_penalty(sch_cnt) for sch_cnt in range(len(self.base) + 1)]
+        self.zeros = [0] * (len(players) * self.nr_schedules)
+        self.counts = self.zeros[:]
+
+    def score(self, swap_idxs: Optional[List[int]] = None) -> JustScore:
+        nr_schedules, counts = self.nr_schedules, self.counts
+        counts[:] = self.zeros
+        for round_idx, round_pairs in enumerate(self.base):
+            idx_other = swap_idxs[round_idx] % nr_schedules if swap_idxs else 0
+            for sch_idx, (pl1, pl2) in enumerate(round_pairs):
+                if sch_idx == 0:
+                    sch_idx = idx_other
+                elif sch_idx == idx_other:
+                    sch_idx = 0
+                counts[pl1 * nr_schedules + sch_idx] += 1
+                counts[pl2 * nr_schedules + sch_idx] += 1
+        penalties = self.penalties
+        return sum([penalties[sch_cnt] for sch_cnt in counts])
+
+
 def equalize_schedules_in_rounds(
         round_robin_rounds: RoundRobnRounds, 
         eq_type: EqualizeType, 
@@ -343,23 +655,8 @@ def equalize_schedules_in_rounds(
     #   - nearly equal times of schedule order 
     #   - nearly equal times of first in a pair
 
-    players_detect: List[PlayerName] = []
-    schedules: List[int] = []
-    for round_pairs in round_robin_rounds:
-        for sch_nr, (pl1, pl2) in enumerate(round_pairs, 1):
-            if sch_nr not in schedules:  # TODO: silly, this is fixed
-                schedules.append(sch_nr)
-            if pl1 not in players_detect:
-                players_detect.append(pl1)
-            if pl2 not in players_detect:
-                players_detect.append(pl2)
-
-    if players:
-        set_d, set_p = set(players_detect), set(players)
-        if set_d!=set_p:
-            raise Exception(f"From schedules detected players which differs from given players: {set_d - set_p} / {set_p - set_d}")
-    else:
-        players = players_detect
+    players = PlayerTable.from_rounds(round_robin_rounds, players=players).players
+    nr_schedules_detect = max((len(round_pairs) for round_pairs in round_robin_rounds), default=0)
 
     mark_players=[players[-1], players[0], players[1]]
     if verbose or stats_only_rounds:
@@ -370,8 +667,8 @@ def equalize_schedules_in_rounds(
     nr_of_players = len(players)
     # TODO: consider: nr_schedules = nr_of_players // 2 + nr_of_players % 2
     nr_schedules = nr_of_players // 2
-    if nr_schedules != len(schedules):
-        raise Exception(f"Expected number of schedules {nr_schedules}, got {len(schedules)}")
+    if nr_schedules != nr_schedules_detect:
+        raise Exception(f"Expected number of schedules {nr_schedules}, got {nr_schedules_detect}")
 
     score_by_players, score_before, schedule_dict, first_dict = \
             get_just_score(players=players, 
@@ -384,76 +681,18 @@ def equalize_schedules_in_rounds(
     if stats_only_rounds:
         round_robin_rounds = stats_only_rounds
     else:
+        from copy import deepcopy
         round_robin_rounds = deepcopy(round_robin_rounds)
 
         nr_rounds = len(round_robin_rounds)
         idx_fixed = 0
 
-        if eq_type==EqualizeType.BRUTE_FORCE:
-            random.seed()
-            random_swaps = []
-            for rnr, round_pairs in enumerate(round_robin_rounds, 0):
-                # 1. the most simple method:
-                #    berger and cricle put fixed player in first schedule
-                #    this method swaps first pair based on round number
-                l2r = None
-                if not random_swaps:
-                    random_swaps = list(range(nr_schedules))
-                    random.shuffle(random_swaps)
-                    # print("random", rnr, random_swaps)
-                idx_other = random_swaps.pop(0)
-                # print("random", idx_other)
-                idxs_to_swap = [idx_fixed, idx_other]
-                # if verbose: print(rnr, div, idxs_to_swap)
-                swap(round_pairs, idxs_to_swap, verbose=verbose)
-        else:
-            for rnr, round_pairs in enumerate(round_robin_rounds, 0):
-                if eq_type==EqualizeType.CROSS:
-                    # div = rnr // nr_schedules
-                    if rnr % 2 ==0:
-                        l2r = True
-                        nr = rnr // 2
-                        idx_other = nr % nr_schedules
-                    else:
-                        l2r = False
-                        idx_other = -1 * ((nr+1) % nr_schedules)
-                    # print(rnr, idx_other)
-                elif eq_type==EqualizeType.DIAG_L2R:
-                    l2r = True
-                    idx_other = rnr % nr_schedules
-                    # print(rnr, idx_other)
-                elif eq_type==EqualizeType.DIAG_R2L:
-                    l2r = False
-                    idx_other = -1 * ((rnr+1) % nr_schedules)
-                elif eq_type==EqualizeType.DIAG_L2R2L:
-                    div = rnr // nr_schedules
-                    if div % 2 == 0:
-                        l2r = True
-                        idx_other = rnr % nr_schedules
-                    else:
-                        l2r = False
-                        idx_other = -1 * ((rnr+2) % nr_schedules)
-                    # print(idx_other)
-                elif eq_type==EqualizeType.DIAG_R2L2R:
-                    div = rnr // nr_schedules
-                    if div % 2 == 0:
-                        l2r = False
-                        idx_other = -1 * ((rnr+1) % nr_schedules)
-                    else:
-                        l2r = True
-                        idx_other = ((rnr+1) % nr_schedules)
-                else:
-                    raise Exception(f"Unknown for {eq_type}. Select one of: {', '.join(EqualizeType.values())}")
-
-                if offset_x:
-                    idx_other = (idx_other + offset_x) 
-                    if abs(idx_other) >= nr_schedules:
-                        idx_other = ((idx_other + 0) % nr_schedules) * +1
-
-                idxs_to_swap = [idx_fixed, idx_other]
-                # if verbose: print(rnr, div, idxs_to_swap)
-                # print("---", rnr, idxs_to_swap)
-                swap(round_pairs, idxs_to_swap, verbose=verbose)
+        swap_idxs = get_swap_idxs(eq_type, nr_rounds=nr_rounds, nr_schedules=nr_schedules, offset_x=offset_x)
+        for round_pairs, idx_other in zip(round_robin_rounds, swap_idxs):
+            idxs_to_swap = [idx_fixed, idx_other]
+            # if verbose: print(rnr, div, idxs_to_swap)
+            # print("---", rnr, idxs_to_swap)
+            swap(round_pairs, idxs_to_swap, verbose=verbose)
 
     # if verbose:
     #     first_nearly_equal = ((nr_of_players-1) // 2, (nr_of_players-1) // 2 +1)
@@ -482,21 +721,40 @@ def equalize_schedules_in_rounds(
     return round_robin_rounds, score_before, score_after
 
 
-@dataclass
 class BestResult:
-    players : List[PlayerName] = field(repr=False)
-    # nr_schedules : int = field(repr=False)
-    has_ideal: bool = field(init=False) 
-    best_score: Optional[JustScore] = None
-    best_eq_type: Optional[EqualizeType] = None
-    best_offset_x: Optional[int] = None
-    score_before: Optional[JustScore] = None
-    best_rounds: Optional[RoundRobnRounds] = field(repr=False, default=None)
-    score_ideal: JustScore = field(init=False, repr=True)
-
-    def __post_init__(self):
-        self.has_ideal = has_ideal(len(self.players))
-        self.score_ideal = len(self.players) * 1
+    # dataclass like init/repr/eq without dataclasses import (slow, base is
+    # imported by every process). Not in repr: players, best_rounds,
+    # best_swap_idxs and best_round_order (original round indexes in new
+    # order - only when rounds are reordered, see round_order module)
+    _REPR_FIELDS = ("has_ideal", "best_score", "best_eq_type", "best_offset_x", "score_before", "score_ideal")
+
+    def __init__(self, 
+                 players: List[PlayerName],
+                 best_score: Optional[JustScore] = None,
+                 best_eq_type: Optional[EqualizeType] = None,
+                 best_offset_x: Optional[int] = None,
+                 score_before: Optional[JustScore] = None,
+                 best_rounds: Optional[RoundRobnRounds] = None,
+                 best_swap_idxs: Optional[List[int]] = None,
+                 best_round_order: Optional[List[int]] = None):
+        self.players = players
+        self.best_score = best_score
+        self.best_eq_type = best_eq_type
+        self.best_offset_x = best_offset_x
+        self.score_before = score_before
+        self.best_rounds = best_rounds
+        self.best_swap_idxs = best_swap_idxs
+        self.best_round_order = best_round_order
+        self.has_ideal: bool = has_ideal(len(self.players))
+        self.score_ideal: JustScore = len(self.players) * 1
+
+    def __repr__(self) -> str:
+        return "BestResult({})".format(", ".join(f"{name}={getattr(self, name)!r}" for name in self._REPR_FIELDS))
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return vars(self) == vars(other)
 
     def is_ideal(self):
         return self.best_score == self.score_ideal
@@ -508,19 +766,33 @@ def _find_best_iteration(
     best_result: BestResult, # inout
     offset_x: int = 0,
     players: Optional[List[PlayerName]] = None, 
+    scorer: Optional[SwapCandidateScorer] = None,
+    score_after: Optional[JustScore] = None,
     verbose:bool = False) -> bool:
+    # candidate is only swap_idxs - scored lazily on shared base rounds,
+    # best_rounds are materialized only for the winner - see _set_best_rounds()
+    # score_after - already computed score (see diagonal_scores()), swap_idxs
+    # are then built only when selected
 
-    rounds_new, score_before, score_after = equalize_schedules_in_rounds(round_robin_rounds, eq_type=eq_type, offset_x=offset_x, players=players, verbose=False)
+    if scorer is None:
+        scorer = SwapCandidateScorer(round_robin_rounds, players=players)
     if best_result.score_before is None:
-        best_result.score_before = score_before
-    else:
-        assert best_result.score_before == score_before
+        best_result.score_before = scorer.score()
+
+    swap_idxs = None
+    if score_after is None:
+        swap_idxs = get_swap_idxs(eq_type, nr_rounds=len(round_robin_rounds), nr_schedules=scorer.nr_schedules, offset_x=offset_x)
+        score_after = scorer.score(swap_idxs)
+    score_before = best_result.score_before
 
     if best_result.best_score is None or score_after < best_result.best_score:
+        if swap_idxs is None:
+            swap_idxs = get_swap_idxs(eq_type, nr_rounds=len(round_robin_rounds), nr_schedules=scorer.nr_schedules, offset_x=offset_x)
         best_result.best_score = score_after 
         best_result.best_eq_type = eq_type
         best_result.best_offset_x = offset_x
-        best_result.best_rounds = rounds_new
+        best_result.best_swap_idxs = swap_idxs
+        best_result.best_rounds = None
         selected = True
     else:
         selected = False
@@ -531,17 +803,122 @@ def _find_best_iteration(
     return selected
 
 
+def _set_best_rounds(round_robin_rounds: RoundRobnRounds, best_result: BestResult):
+    if best_result.best_rounds is None and best_result.best_swap_idxs is not None:
+        best_result.best_rounds = apply_swap_idxs(round_robin_rounds, best_result.best_swap_idxs)
+
+
+def _random_search_worker(
+        round_robin_rounds: RoundRobnRounds, 
+        players: List[PlayerName],
+        nr_trials: int,
+        seed: str,
+        stop_score: Optional[JustScore] = None) -> Tuple[Optional[JustScore], Optional[List[int]]]:
+    " BRUTE_FORCE trials with own random stream - returns best score and swap_idxs "
+    rnd = random.Random(seed)
+    scorer = SwapCandidateScorer(round_robin_rounds, players=players)
+    nr_rounds = len(round_robin_rounds)
+    best_score, best_swap_idxs = None, None
+    for _ in range(nr_trials):
+        swap_idxs = get_swap_idxs(EqualizeType.BRUTE_FORCE, nr_rounds=nr_rounds, nr_schedules=scorer.nr_schedules, rnd=rnd)
+        score = scorer.score(swap_idxs)
+        if best_score is None or score < best_score:
+            best_score, best_swap_idxs = score, swap_idxs
+            if stop_score is not None and best_score <= stop_score:
+                break
+    return best_score, best_swap_idxs
+
+
+def _random_search(
+        round_robin_rounds: RoundRobnRounds, 
+        players: List[PlayerName],
+        nr_trials: int,
+        best_result: BestResult, # inout
+        workers: int = 1,
+        seed: Optional[int] = None,
+        stop_score: Optional[JustScore] = None,
+        executor: Optional["Executor"] = None,
+        verbose: bool = False) -> bool:
+    """ 
+    BRUTE_FORCE trials split to workers (process pool when workers > 1,
+    given executor or new one). Worker i gets own random stream seeded by
+    (seed, i), results are reduced in worker order, so result is
+    reproducible for given seed and number of workers.
+    """
+    if seed is None:
+        seed = random.randrange(2**32)
+    trials = [nr_trials // workers + (1 if idx < nr_trials % workers else 0) for idx in range(workers)]
+    args = [(round_robin_rounds, players, nr_trials_worker, f"{seed}:{idx}", stop_score) 
+            for idx, nr_trials_worker in enumerate(trials) if nr_trials_worker]
+    if workers > 1 and executor is not None:
+        results = list(executor.map(_random_search_worker, *zip(*args)))
+    elif workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_random_search_worker, *zip(*args)))
+    else:
+        results = [_random_search_worker(*worker_args) for worker_args in args]
+
+    selected = False
+    for score, swap_idxs in results:
+        if score is not None and (best_result.best_score is None or score < best_result.best_score):
+            best_result.best_score = score
+            best_result.best_eq_type = EqualizeType.BRUTE_FORCE
+            best_result.best_offset_x = 0
+            best_result.best_swap_idxs = swap_idxs
+            best_result.best_rounds = None
+            selected = True
+            if verbose:
+                print(f"-- SELECTED: eq={EqualizeType.BRUTE_FORCE:<10}, seed={seed}, workers={workers}, after={score:>3}")
+    return selected
+
+
+def get_score_lower_bound(nr_of_players: int) -> JustScore:
+    " no schedule can have better score - every player plays once in one schedule and twice in others (BYE included) "
+    return nr_of_players * 1
+
+
+def _is_search_done(best_result: BestResult, stop_score: Optional[JustScore]) -> bool:
+    return (stop_score is not None 
+            and best_result.best_score is not None 
+            and best_result.best_score <= stop_score)
+
+
 def find_best_equalize_solution(
         round_robin_rounds: RoundRobnRounds, 
         players: List[PlayerName],
         brute_force_factor: Optional[int] = 1000,
+        stop_on_ideal: bool = True,
+        target_score: Optional[JustScore] = None,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None,
+        executor: Optional["Executor"] = None,
         verbose:bool = False) -> BestResult:
+    """ 
+    stop_on_ideal - return as soon as score reaches lower bound (ideal),
+        later candidates can not be better so result is the same, only faster.
+    target_score - return as soon as score is equal or better than this one.
+    workers - BRUTE_FORCE trials are split to this number of workers, each
+        with own random stream derived from seed. Process pool is used only
+        when workers > 1, seed alone runs in this process.
+    seed - makes BRUTE_FORCE reproducible (for the same number of workers).
+    executor - existing pool used when workers > 1 (e.g. reused by batch
+        callers), otherwise new process pool is created for each call.
+    """
 
     nr_of_players = len(players)
 
     nr_schedules = len(round_robin_rounds[0])
 
+    stop_scores = []
+    if stop_on_ideal:
+        stop_scores.append(get_score_lower_bound(nr_of_players))
+    if target_score is not None:
+        stop_scores.append(target_score)
+    stop_score = max(stop_scores) if stop_scores else None
+
     best_result = BestResult(players=players)
+    scorer = SwapCandidateScorer(round_robin_rounds, players=players)
     if best_result.has_ideal:
         _find_best_iteration(
             # ideal solutinn is: berger + DIAG_R2L2R for 2/3 cases
@@ -550,22 +927,45 @@ def find_best_equalize_solution(
             offset_x = 0,
             best_result = best_result,
             players = players,
+            scorer = scorer,
             verbose = verbose,
             )
     else:
-        for eq_type in ("DIAG_L2R", "DIAG_R2L", "DIAG_L2R2L", "DIAG_R2L2R", "CROSS"):
-            # for offset_x in range(0, nr_schedules):
+        # all diagonal candidates scored in one pass, selection in the same
+        # order as one by one
+        from .scoring import diagonal_scores, DIAGONAL_EQ_TYPES
+        scores = diagonal_scores(scorer.base, nr_of_players, eq_types=DIAGONAL_EQ_TYPES)
+        for eq_idx, eq_type in enumerate(DIAGONAL_EQ_TYPES):
             for offset_x in range(0, nr_schedules):
                 _find_best_iteration(
                     round_robin_rounds= round_robin_rounds,
-                    eq_type = eq_type,
+                    eq_type = eq_type.value,
                     offset_x = offset_x,
                     best_result = best_result,
                     players = players,
+                    scorer = scorer,
+                    score_after = scores[eq_idx * nr_schedules + offset_x],
                     verbose = verbose,
                     )
-
-        if brute_force_factor:
+                if _is_search_done(best_result, stop_score):
+                    break
+            if _is_search_done(best_result, stop_score):
+                break
+
+        if brute_force_factor and not _is_search_done(best_result, stop_score) \
+                and (workers or seed is not None):
+            _random_search(
+                round_robin_rounds=round_robin_rounds,
+                players=players,
+                nr_trials=nr_schedules * brute_force_factor,
+                best_result=best_result,
+                workers=workers or 1,
+                seed=seed,
+                stop_score=stop_score,
+                executor=executor,
+                verbose=verbose,
+                )
+        elif brute_force_factor and not _is_search_done(best_result, stop_score):
             for random_nr in range(0, nr_schedules * brute_force_factor):
                 selected = _find_best_iteration(
                     round_robin_rounds= round_robin_rounds,
@@ -573,8 +973,13 @@ def find_best_equalize_solution(
                     best_result = best_result,
                     offset_x = 0,
                     players = players,
+                    scorer = scorer,
                     verbose = verbose,
                     )
+                if selected and _is_search_done(best_result, stop_score):
+                    break
+
+    _set_best_rounds(round_robin_rounds, best_result)
 
     if verbose:
         # just to show verbose data
@@ -604,14 +1009,9 @@ def create_demo_rounds_str_list(nr_of_players:int, berger:bool,
 
     round_robin_rounds = function(players, verbose=verbose, **kwargs)
 
-    expected = set([tuple(sorted(pair)) for pair in combinations(players, 2)])
-    got = [tuple(sorted(pair)) for row in round_robin_rounds for pair in row]
-    #print(expected); print(got)
-
-    if not len(expected)== len(got):
-        raise ValueError("found some duplicates or missing")
-    if not expected== set(got):
-        raise ValueError("some pair combinations not found")
+    # local import - validate depends on base
+    from .validate import validate_schedule
+    validate_schedule(round_robin_rounds, players)
 
     rounds_str_list = round_robin_rounds_to_str_list(round_robin_rounds, fmt_width=fmt_width)
     if verbose:
@@ -624,5 +1024,6 @@ def create_demo_rounds_str_list(nr_of_players:int, berger:bool,
 
 
 if __name__=="__main__":
-    pass # TODO: CLI
+    # CLI is in cli module: python -m round_robin_pairs --help
+    pass
 
@@ -0,0 +1,161 @@
+"""
+Schedule templates cache
+------------------------
+Schedules depend only on the number of players, player names are just
+labels. Templates are index based ScheduleArray-s (players 0..n-1 + BYE)
+kept in bounded LRU cache keyed by:
+
+    (algorithm, nr_players, ideal, eq_type, offset_x)
+
+Generating for a new list of players is then just relabeling of the cached
+template:
+
+    cache = TemplateCache(max_size=256)
+    rounds = cache.tables(players, ideal=True)
+    print(cache.stats())
+"""
+from typing import List, Optional, Tuple, Hashable, Callable, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+import enum
+
+from .base import (
+        PlayerName, RoundRobnRounds, BYE, EqualizeType,
+        berger_tables, circle_tables, equalize_schedules_in_rounds,
+        )
+from .schedule_array import ScheduleArray, berger_array, circle_array
+
+DEFAULT_MAX_SIZE = 128
+
+TemplateKey = Tuple[str, int, bool, Optional[str], int]
+
+
+class Algorithm(str, enum.Enum):
+    BERGER = "BERGER"
+    CIRCLE = "CIRCLE"
+
+    @classmethod
+    def values(cls):
+        return [k for k,v in Algorithm.__members__.items()]
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+
+def _template_players(nr_players: int) -> List[Hashable]:
+    return list(range(nr_players))
+
+
+def build_template(algorithm: Algorithm, nr_players: int, ideal: bool = False,
+                   eq_type: Optional[EqualizeType] = None, offset_x: int = 0) -> ScheduleArray:
+    " index based schedule - player names are 0..nr_players-1 and BYE "
+    algorithm = Algorithm(algorithm)
+    players = _template_players(nr_players)
+    if eq_type == EqualizeType.BRUTE_FORCE:
+        raise ValueError(f"Template for {eq_type} can not be cached, it is random")
+
+    if algorithm == Algorithm.CIRCLE:
+        if ideal:
+            raise ValueError("Ideal is available only for Berger algorithm")
+        if not eq_type:
+            return circle_array(players)
+        rounds = circle_tables(players)
+    elif not ideal and not eq_type:
+        return berger_array(players)
+    else:
+        # checks ideal availability too
+        rounds = berger_tables(players, ideal=ideal)
+
+    if eq_type:
+        rounds, _, _ = equalize_schedules_in_rounds(rounds, eq_type=eq_type, offset_x=offset_x)
+    return ScheduleArray.from_rounds(rounds)
+
+
+class TemplateCache:
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError(f"Cache max size should be positive, got {max_size}")
+        self.max_size = max_size
+        self.templates: "OrderedDict[Hashable, ScheduleArray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_template(self, algorithm: Algorithm, nr_players: int, ideal: bool = False,
+                     eq_type: Optional[EqualizeType] = None, offset_x: int = 0) -> ScheduleArray:
+        " returned template is shared - do not change it "
+        key = (Algorithm(algorithm).value, nr_players, ideal,
+               EqualizeType(eq_type).value if eq_type else None, offset_x)
+        return self.get_or_build(key, lambda: build_template(algorithm, nr_players, ideal=ideal,
+                                                             eq_type=eq_type, offset_x=offset_x))
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        shared LRU for other values derived from templates (e.g. optimized
+        templates in cli module) - key should not clash with TemplateKey
+        """
+        template = self.templates.get(key)
+        if template is not None:
+            self.hits += 1
+            self.templates.move_to_end(key)
+            return template
+
+        self.misses += 1
+        template = build()
+        self.templates[key] = template
+        self._evict()
+        return template
+
+    def schedule(self, players: List[PlayerName], algorithm: Algorithm = Algorithm.BERGER,
+                 ideal: bool = False, eq_type: Optional[EqualizeType] = None, offset_x: int = 0) -> ScheduleArray:
+        template = self.get_template(algorithm, len(players), ideal=ideal, eq_type=eq_type, offset_x=offset_x)
+        return relabel(template, players)
+
+    def tables(self, players: List[PlayerName], algorithm: Algorithm = Algorithm.BERGER,
+               ideal: bool = False, eq_type: Optional[EqualizeType] = None, offset_x: int = 0) -> RoundRobnRounds:
+        " same rounds as berger_tables() / circle_tables() (pairs are tuples), players list is not changed "
+        return self.schedule(players, algorithm=algorithm, ideal=ideal, eq_type=eq_type, offset_x=offset_x).to_rounds()
+
+    def set_max_size(self, max_size: int):
+        if max_size < 1:
+            raise ValueError(f"Cache max size should be positive, got {max_size}")
+        self.max_size = max_size
+        self._evict()
+
+    def _evict(self):
+        while len(self.templates) > self.max_size:
+            self.templates.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.templates.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                          size=len(self.templates), max_size=self.max_size)
+
+
+def relabel(template: ScheduleArray, players: List[PlayerName]) -> ScheduleArray:
+    " template players are 0..n-1 and BYE, replaced by players names "
+    nr_players = len(template.players) - (BYE in template.players)
+    if nr_players != len(players):
+        raise ValueError(f"Template is for {nr_players} players, got {len(players)}")
+    names = [BYE if pl == BYE else players[pl] for pl in template.players]
+    return ScheduleArray(names, template.nr_rounds, template.nr_slots, template.data[:])
+
+
+TEMPLATE_CACHE = TemplateCache()
+
+
+def cached_tables(players: List[PlayerName], algorithm: Algorithm = Algorithm.BERGER,
+                  ideal: bool = False, eq_type: Optional[EqualizeType] = None, offset_x: int = 0) -> RoundRobnRounds:
+    " berger_tables() / circle_tables() through module level TEMPLATE_CACHE "
+    return TEMPLATE_CACHE.tables(players, algorithm=algorithm, ideal=ideal, eq_type=eq_type, offset_x=offset_x)
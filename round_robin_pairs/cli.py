@@ -0,0 +1,307 @@
+"""
+Command line interface
+----------------------
+    python -m round_robin_pairs generate -n 10 --ideal
+    python -m round_robin_pairs generate Ann Bob Cid Dan --algorithm CIRCLE --format ndjson
+    python -m round_robin_pairs optimize -n 16 --optimizer tabu --seed 1
+    python -m round_robin_pairs export -n 100 --optimizer best -o players-100.rrpb
+    python -m round_robin_pairs export --input players-100.rrpb -o players-100.csv
+    python -m round_robin_pairs validate players-100.csv
+
+Batch mode reads tournament specs as NDJSON from stdin and writes one result
+per line to stdout:
+
+    echo '{"id": 1, "nr_players": 10, "optimize": "best"}' | python -m round_robin_pairs batch
+
+    spec:   id (echoed), players (list of names) or nr_players,
+            algorithm (BERGER | CIRCLE), ideal, optimize (see OPTIMIZERS),
+            seed, time_budget, output (rounds | text), validate
+    result: id, rounds (or text), score_before and score (when optimized),
+            violation (when validated), error (instead of result)
+
+Schedules depend only on the number of players, so templates (index based)
+and optimized templates are kept in one TemplateCache for the whole batch
+and relabeled for each spec - repeated specs cost only relabeling and output.
+Random optimizers are cached only when seed is given. Optimizer modules are
+imported only when used - short-lived processes start fast.
+"""
+from typing import List, Optional, Dict, Any, Callable, IO, Tuple
+from dataclasses import dataclass
+import argparse
+import json
+import sys
+
+from .base import (
+        PlayerName, RoundRobnRounds, BestResult, find_best_equalize_solution,
+        write_round_robin_rounds, round_robin_rounds_to_str_list,
+        )
+from .schedule_array import ScheduleArray
+from .cache import TemplateCache, Algorithm, relabel
+from .validate import find_violation
+from .export import ExportFormat, write_csv, write_ndjson, write_binary, load_schedule, export_schedule
+
+Optimizer = Callable[[RoundRobnRounds, List[PlayerName], Optional[int], Optional[float]], BestResult]
+
+
+def _optimize_best(rounds, players, seed, time_budget):
+    return find_best_equalize_solution(rounds, players, brute_force_factor=None)
+
+
+def _optimize_tabu(rounds, players, seed, time_budget):
+    from .tabu import tabu_schedule
+    return tabu_schedule(rounds, players, time_budget=time_budget, seed=seed)
+
+
+def _optimize_annealing(rounds, players, seed, time_budget):
+    from .annealing import anneal_schedule
+    return anneal_schedule(rounds, players, time_budget=time_budget, seed=seed)
+
+
+def _optimize_genetic(rounds, players, seed, time_budget):
+    from .genetic import genetic_schedule
+    return genetic_schedule(rounds, players, time_budget=time_budget, seed=seed)
+
+
+def _optimize_round_order(rounds, players, seed, time_budget):
+    from .round_order import round_order_schedule
+    return round_order_schedule(rounds, players, time_budget=time_budget, seed=seed)
+
+
+def _optimize_assignment(rounds, players, seed, time_budget):
+    from .assignment import assignment_schedule
+    return assignment_schedule(rounds, players, time_budget=time_budget)
+
+
+OPTIMIZERS: Dict[str, Optimizer] = {
+    "best": _optimize_best,
+    "tabu": _optimize_tabu,
+    "annealing": _optimize_annealing,
+    "genetic": _optimize_genetic,
+    "round_order": _optimize_round_order,
+    "assignment": _optimize_assignment,
+    }
+# same result for the same input - cached without seed too
+DETERMINISTIC_OPTIMIZERS = ("best", "assignment")
+
+
+@dataclass
+class ScheduleSpec:
+    players: Optional[List[PlayerName]] = None
+    nr_players: Optional[int] = None
+    algorithm: Algorithm = Algorithm.BERGER
+    ideal: bool = False
+    optimize: Optional[str] = None
+    seed: Optional[int] = None
+    time_budget: Optional[float] = None
+
+    def __post_init__(self):
+        self.algorithm = Algorithm(self.algorithm)
+        if self.players is None:
+            if not self.nr_players:
+                raise ValueError("Provide players or nr_players")
+            self.players = [str(nr) for nr in range(1, self.nr_players + 1)]
+        else:
+            self.players = list(self.players)
+            self.nr_players = len(self.players)
+        if self.optimize and self.optimize not in OPTIMIZERS:
+            raise ValueError(f"Unknown optimizer {self.optimize}. Select one of: {', '.join(OPTIMIZERS)}")
+
+
+@dataclass
+class ScheduleResult:
+    schedule: ScheduleArray
+    score_before: Optional[int] = None
+    best_score: Optional[int] = None
+
+
+def optimize_schedule(schedule: ScheduleArray, optimize: str, seed: Optional[int] = None,
+                      time_budget: Optional[float] = None) -> ScheduleResult:
+    best_result = OPTIMIZERS[optimize](schedule.to_rounds(), schedule.players, seed, time_budget)
+    return ScheduleResult(schedule=ScheduleArray.from_rounds(best_result.best_rounds, players=schedule.players),
+                          score_before=best_result.score_before, best_score=best_result.best_score)
+
+
+def build_schedule(spec: ScheduleSpec, cache: TemplateCache) -> ScheduleResult:
+    " template (and optimized template) from cache, relabeled with spec players "
+    if not spec.optimize:
+        return ScheduleResult(schedule=cache.schedule(spec.players, algorithm=spec.algorithm, ideal=spec.ideal))
+
+    def build() -> ScheduleResult:
+        template = cache.get_template(spec.algorithm, spec.nr_players, ideal=spec.ideal)
+        return optimize_schedule(template, spec.optimize, seed=spec.seed, time_budget=spec.time_budget)
+
+    if spec.optimize in DETERMINISTIC_OPTIMIZERS or (spec.seed is not None and spec.time_budget is None):
+        # deterministic optimizers do not use seed - one entry for any seed
+        seed = None if spec.optimize in DETERMINISTIC_OPTIMIZERS else spec.seed
+        key = ("OPTIMIZED", spec.optimize, seed, spec.algorithm.value, spec.nr_players, spec.ideal)
+        result = cache.get_or_build(key, build)
+    else:
+        result = build()
+    return ScheduleResult(schedule=relabel(result.schedule, spec.players),
+                          score_before=result.score_before, best_score=result.best_score)
+
+
+# ------------------------------------------------------------
+# Batch
+# ------------------------------------------------------------
+BATCH_OUTPUTS = ("rounds", "text")
+
+
+def run_batch_spec(spec_dict: Dict[str, Any], cache: TemplateCache) -> Dict[str, Any]:
+    spec_dict = dict(spec_dict)
+    output = spec_dict.pop("output", "rounds")
+    validate = spec_dict.pop("validate", False)
+    result_dict: Dict[str, Any] = {"id": spec_dict.pop("id")} if "id" in spec_dict else {}
+    if output not in BATCH_OUTPUTS:
+        raise ValueError(f"Unknown output {output}. Select one of: {', '.join(BATCH_OUTPUTS)}")
+
+    result = build_schedule(ScheduleSpec(**spec_dict), cache)
+    if output == "text":
+        fmt_width = max(len(str(pl)) for pl in result.schedule.players)
+        result_dict["text"] = round_robin_rounds_to_str_list(result.schedule, fmt_width=fmt_width)
+    else:
+        result_dict["rounds"] = result.schedule.to_rounds()
+    if result.best_score is not None:
+        result_dict["score_before"] = result.score_before
+        result_dict["score"] = result.best_score
+    if validate:
+        violation = find_violation(result.schedule)
+        result_dict["violation"] = str(violation) if violation else None
+    return result_dict
+
+
+def run_batch(stdin: IO[str], stdout: IO[str], cache: Optional[TemplateCache] = None,
+              flush_every: int = 1) -> Tuple[int, int]:
+    """
+    one result line per non empty spec line, in the same order. Errors are
+    reported in result line ({"id": .., "error": ..}), processing continues.
+    flush_every - flush stdout after this number of results (0 - only at the
+    end). Returns number of results and number of errors.
+    """
+    if cache is None:
+        cache = TemplateCache(max_size=1024)
+    nr_results = nr_errors = 0
+    for line in stdin:
+        if not line.strip():
+            continue
+        spec_dict = None
+        try:
+            spec_dict = json.loads(line)
+            if not isinstance(spec_dict, dict):
+                raise ValueError(f"Spec should be JSON object, got: {line.strip()[:50]}")
+            result_dict = run_batch_spec(spec_dict, cache)
+        except Exception as ex:
+            nr_errors += 1
+            result_dict = {"id": spec_dict.get("id") if isinstance(spec_dict, dict) else None,
+                           "error": f"{type(ex).__name__}: {ex}"}
+        stdout.write(json.dumps(result_dict))
+        stdout.write("\n")
+        nr_results += 1
+        if flush_every and nr_results % flush_every == 0:
+            stdout.flush()
+    stdout.flush()
+    return nr_results, nr_errors
+
+
+# ------------------------------------------------------------
+# Commands
+# ------------------------------------------------------------
+def _spec_from_args(args) -> ScheduleSpec:
+    return ScheduleSpec(players=args.players or None, nr_players=args.nr_players,
+                        algorithm=args.algorithm, ideal=args.ideal, optimize=args.optimizer,
+                        seed=args.seed, time_budget=args.time_budget)
+
+
+def _schedule_from_args(args, stderr: IO[str]) -> ScheduleArray:
+    " from --input file or generated by spec, optimized when --optimizer is given "
+    if getattr(args, "input", None):
+        schedule = load_schedule(args.input)
+        if args.optimizer:
+            result = optimize_schedule(schedule, args.optimizer, seed=args.seed, time_budget=args.time_budget)
+            stderr.write(f"score: {result.score_before} -> {result.best_score}\n")
+            schedule = result.schedule
+        return schedule
+    result = build_schedule(_spec_from_args(args), TemplateCache())
+    if result.best_score is not None:
+        stderr.write(f"score: {result.score_before} -> {result.best_score}\n")
+    return result.schedule
+
+
+def _write(schedule: ScheduleArray, export_format: str, stdout: IO[str]):
+    if export_format == "TEXT":
+        fmt_width = max(len(str(pl)) for pl in schedule.players)
+        write_round_robin_rounds(schedule, stdout, fmt_width=fmt_width)
+    elif export_format == ExportFormat.CSV:
+        write_csv(schedule, stdout)
+    elif export_format == ExportFormat.NDJSON:
+        write_ndjson(schedule, stdout)
+    else:
+        buffer = getattr(stdout, "buffer", None)
+        if buffer is None:
+            raise ValueError("Format BINARY needs binary output, use: export -o FILE.rrpb")
+        stdout.flush()
+        write_binary(schedule, buffer)
+
+
+def _add_spec_arguments(parser: argparse.ArgumentParser, optimizer_default: Optional[str] = None):
+    parser.add_argument("players", nargs="*", help="player names")
+    parser.add_argument("-n", "--nr-players", type=int, help="players 1..n when names are not given")
+    parser.add_argument("--algorithm", choices=Algorithm.values(), default=Algorithm.BERGER.value)
+    parser.add_argument("--ideal", action="store_true")
+    parser.add_argument("--optimizer", choices=list(OPTIMIZERS), default=optimizer_default)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--time-budget", type=float, help="seconds, for optimizers which support it")
+
+
+def main(argv: Optional[List[str]] = None, stdin: Optional[IO[str]] = None,
+         stdout: Optional[IO[str]] = None, stderr: Optional[IO[str]] = None) -> int:
+    stdin, stdout, stderr = stdin or sys.stdin, stdout or sys.stdout, stderr or sys.stderr
+    parser = argparse.ArgumentParser(prog="python -m round_robin_pairs",
+                                     description="Round-robin tournament schedules")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    formats = ["TEXT"] + ExportFormat.values()
+
+    generate_parser = subparsers.add_parser("generate", help="generate schedule to stdout")
+    _add_spec_arguments(generate_parser)
+    generate_parser.add_argument("--format", type=str.upper, choices=formats, default="TEXT")
+
+    optimize_parser = subparsers.add_parser("optimize", help="generate (or load) and optimize schedule")
+    _add_spec_arguments(optimize_parser, optimizer_default="best")
+    optimize_parser.add_argument("--input", help="schedule file (csv, ndjson, rrpb) instead of generating")
+    optimize_parser.add_argument("--format", type=str.upper, choices=formats, default="TEXT")
+
+    export_parser = subparsers.add_parser("export", help="generate (or load) schedule and write it to file")
+    _add_spec_arguments(export_parser)
+    export_parser.add_argument("--input", help="schedule file (csv, ndjson, rrpb) instead of generating")
+    export_parser.add_argument("-o", "--output", required=True, help="format by extension: csv, ndjson, rrpb")
+    export_parser.add_argument("--format", type=str.upper, choices=ExportFormat.values())
+
+    validate_parser = subparsers.add_parser("validate", help="validate schedule file")
+    validate_parser.add_argument("input", help="schedule file (csv, ndjson, rrpb)")
+    validate_parser.add_argument("--players", nargs="+", help="expected players")
+
+    batch_parser = subparsers.add_parser("batch", help="NDJSON specs from stdin, results to stdout")
+    batch_parser.add_argument("--cache-size", type=int, default=1024)
+    batch_parser.add_argument("--flush-every", type=int, default=1, help="0 - flush only at the end")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command in ("generate", "optimize"):
+            _write(_schedule_from_args(args, stderr), args.format, stdout)
+        elif args.command == "export":
+            schedule = _schedule_from_args(args, stderr)
+            export_schedule(schedule, args.output, export_format=args.format)
+        elif args.command == "validate":
+            violation = find_violation(load_schedule(args.input), players=args.players)
+            if violation:
+                stdout.write(f"{args.input}: {violation}\n")
+                return 1
+            stdout.write(f"{args.input}: OK\n")
+        elif args.command == "batch":
+            _, nr_errors = run_batch(stdin, stdout, cache=TemplateCache(max_size=args.cache_size),
+                                     flush_every=args.flush_every)
+            return 1 if nr_errors else 0
+    except (ValueError, KeyError, OSError) as ex:
+        stderr.write(f"Error: {ex}\n")
+        return 2
+    return 0
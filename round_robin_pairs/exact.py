@@ -0,0 +1,411 @@
+"""
+Exact search
+------------
+Searches all in-round slot assignments of base (Berger) schedule and proves
+that the found schedule is optimal - or returns the best schedule and the
+best lower bound found within time budget:
+
+    exact_result = exact_schedule(round_robin_rounds, players, time_budget=60)
+    exact_result.proven_optimal, exact_result.lower_bound, exact_result.best_result
+
+Score lower bound is number of players (ideal) - every player in every slot
+(schedule) 1 or 2 times, 1 time only in one slot. Search is done in 2 phases:
+
+1. ideal - constraint search with variable per pair (round, base slot),
+   domain is bitmask of allowed slots. Propagation after every assignment:
+   slot is used once per round, player is at most 2 times in a slot, every
+   slot of a player (and of a round) must still be reachable. Pair with the
+   smallest domain is assigned first, slots where its players were less
+   often first. Found ideal is optimal, if there is none lower bound is
+   number of players + 1.
+
+2. branch and bound - when ideal does not exist. Rounds are assigned one by
+   one, in each round pairs are placed to free slots. Admissible lower bound
+   is sum per player from its slot counts histogram (the same counts as in
+   get_just_score()) and number of games g not yet placed, as if remaining
+   games could be placed ignoring other players:
+
+    - each game into a slot with count < 2 lowers the penalty by 1
+    - if games remain when all slots have 2+, the first one into a slot
+      with 2 costs +2 (2 -> 3), every other one +1 (or all +1 if some
+      slot already has 3+)
+
+   Players in a round are different, so pairs left in the current round
+   add at least their minimal lower bound increase.
+
+Symmetry breaking: slots are interchangeable - relabeling of slots does not
+change the score, so the first round is fixed as in the base schedule.
+"""
+from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+import time
+
+from .base import (
+        PlayerName, RoundRobnRounds, JustScore, BestResult, EqualizeType,
+        get_score_lower_bound, slot_count_penalty, find_best_equalize_solution,
+        )
+from .schedule_array import ScheduleArray
+
+# how often (nodes) time budget is checked
+TIME_CHECK_EVERY = 100
+
+# domains, counts, assigned slots
+IdealState = Tuple[List[int], List[int], List[int]]
+
+
+@dataclass
+class ExactResult:
+    best_result: BestResult
+    # ideal is found or the whole search tree is searched
+    proven_optimal: bool
+    # no in-round slot assignment of base schedule has better score
+    lower_bound: JustScore
+    nodes: int = 0
+    elapsed: float = field(default=0.0, repr=False)
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class _Infeasible(Exception):
+    pass
+
+
+class _Search:
+
+    def __init__(self, base: ScheduleArray, time_start: float, time_budget: Optional[float]):
+        self.base = base
+        self.nr_rounds, self.nr_slots = base.nr_rounds, base.nr_slots
+        self.nr_players = len(base.players)
+        self.pairs = [[base.pair_idxs(round_idx, slot_idx) for slot_idx in range(self.nr_slots)]
+                      for round_idx in range(self.nr_rounds)]
+        self.time_start = time_start
+        self.time_budget = time_budget
+        self.nodes = 0
+
+    def _check_time(self):
+        self.nodes += 1
+        if self.time_budget is not None and self.nodes % TIME_CHECK_EVERY == 0 \
+                and time.perf_counter() - self.time_start > self.time_budget:
+            raise _SearchTimeout()
+
+    def to_rounds(self, assignment: List[List[int]]) -> RoundRobnRounds:
+        " assignment - slot for each pair (round_idx, base slot_idx) "
+        players = self.base.players
+        rounds = []
+        for round_pairs, round_assignment in zip(self.pairs, assignment):
+            row = [None] * self.nr_slots
+            for (pl1, pl2), slot_idx in zip(round_pairs, round_assignment):
+                row[slot_idx] = (players[pl1], players[pl2])
+            rounds.append(row)
+        return rounds
+
+
+class _IdealSearch(_Search):
+    """
+    variable is pair with index round_idx * nr_slots + base slot_idx,
+    state is copied on each branch.
+    """
+
+    def __init__(self, base: ScheduleArray, time_start: float, time_budget: Optional[float]):
+        super().__init__(base, time_start, time_budget)
+        self.var_pairs = [pair for round_pairs in self.pairs for pair in round_pairs]
+        self.player_vars: List[List[int]] = [[] for _ in range(self.nr_players)]
+        for var, (pl1, pl2) in enumerate(self.var_pairs):
+            self.player_vars[pl1].append(var)
+            self.player_vars[pl2].append(var)
+        self.round_vars = [list(range(round_idx * self.nr_slots, (round_idx + 1) * self.nr_slots))
+                           for round_idx in range(self.nr_rounds)]
+        self.solution: Optional[List[List[int]]] = None
+
+    def run(self) -> bool:
+        " returns True if ideal is found, False if it does not exist "
+        nr_vars = len(self.var_pairs)
+        state = ([(1 << self.nr_slots) - 1] * nr_vars, [0] * (self.nr_players * self.nr_slots), [-1] * nr_vars)
+        try:
+            # symmetry breaking - first round as in base
+            for slot_idx in range(self.nr_slots):
+                self._assign(state, slot_idx, slot_idx)
+            self._propagate(state)
+        except _Infeasible:
+            return False
+        return self._search(state)
+
+    def _remove_slot(self, state: IdealState, var: int, slot_idx: int):
+        domains, _, assigned = state
+        if assigned[var] < 0:
+            domain = domains[var] & ~(1 << slot_idx)
+            if not domain:
+                raise _Infeasible()
+            domains[var] = domain
+
+    def _assign(self, state: IdealState, var: int, slot_idx: int):
+        domains, counts, assigned = state
+        if not domains[var] >> slot_idx & 1:
+            raise _Infeasible()
+        assigned[var] = slot_idx
+        domains[var] = 1 << slot_idx
+
+        for other in self.round_vars[var // self.nr_slots]:
+            self._remove_slot(state, other, slot_idx)
+        for pl in self.var_pairs[var]:
+            idx = pl * self.nr_slots + slot_idx
+            counts[idx] += 1
+            if counts[idx] > 2:
+                raise _Infeasible()
+            if counts[idx] == 2:
+                for other in self.player_vars[pl]:
+                    self._remove_slot(state, other, slot_idx)
+
+    @staticmethod
+    def _single_var(state: IdealState, vars: List[int], slot_idx: int) -> Optional[int]:
+        " the only not assigned var which can be placed to the slot "
+        domains, _, assigned = state
+        found = None
+        for var in vars:
+            if domains[var] >> slot_idx & 1:
+                if found is not None:
+                    return None
+                found = var
+        if found is None:
+            raise _Infeasible()
+        return found if assigned[found] < 0 else None
+
+    def _propagate(self, state: IdealState):
+        domains, counts, assigned = state
+        nr_slots = self.nr_slots
+        changed = True
+        while changed:
+            changed = False
+            for var, domain in enumerate(domains):
+                if assigned[var] < 0 and domain & (domain - 1) == 0:
+                    self._assign(state, var, domain.bit_length() - 1)
+                    changed = True
+            # every slot in a round gets a pair
+            for vars in self.round_vars:
+                for slot_idx in range(nr_slots):
+                    var = self._single_var(state, vars, slot_idx)
+                    if var is not None:
+                        self._assign(state, var, slot_idx)
+                        changed = True
+            # every player at least once in every slot
+            for pl, vars in enumerate(self.player_vars):
+                for slot_idx in range(nr_slots):
+                    if counts[pl * nr_slots + slot_idx] == 0:
+                        var = self._single_var(state, vars, slot_idx)
+                        if var is not None:
+                            self._assign(state, var, slot_idx)
+                            changed = True
+
+    def _search(self, state: IdealState) -> bool:
+        self._check_time()
+        domains, counts, assigned = state
+        var, var_key = None, None
+        for idx, domain in enumerate(domains):
+            if assigned[idx] < 0:
+                key = bin(domain).count("1")
+                if var_key is None or key < var_key:
+                    var, var_key = idx, key
+        if var is None:
+            self.solution = [assigned[round_idx * self.nr_slots: (round_idx + 1) * self.nr_slots]
+                             for round_idx in range(self.nr_rounds)]
+            return True
+
+        pl1, pl2 = self.var_pairs[var]
+        slots = sorted((slot_idx for slot_idx in range(self.nr_slots) if domains[var] >> slot_idx & 1),
+                       key=lambda slot_idx: counts[pl1 * self.nr_slots + slot_idx] + counts[pl2 * self.nr_slots + slot_idx])
+        for slot_idx in slots:
+            state_next = (domains[:], counts[:], assigned[:])
+            try:
+                self._assign(state_next, var, slot_idx)
+                self._propagate(state_next)
+            except _Infeasible:
+                continue
+            if self._search(state_next):
+                return True
+        return False
+
+
+def _player_lower_bound(fixed: int, deficit: int, over: int, games: int) -> int:
+    if games <= deficit:
+        return fixed - games
+    left = games - deficit
+    return fixed - deficit + left + (0 if over else 1)
+
+
+class _BranchAndBound(_Search):
+
+    def __init__(self, base: ScheduleArray, time_start: float, time_budget: Optional[float],
+                 upper_bound: Optional[JustScore], stop_score: JustScore):
+        super().__init__(base, time_start, time_budget)
+        self.penalties = [slot_count_penalty(sch_cnt) for sch_cnt in range(self.nr_rounds + 2)]
+
+        nr_slots = self.nr_slots
+        self.counts = [0] * (self.nr_players * nr_slots)
+        # per player: sum of penalties, sum of missing to 2, nr. of slots with 3+, games left
+        self.fixed = [self.penalties[0] * nr_slots] * self.nr_players
+        self.deficit = [2 * nr_slots] * self.nr_players
+        self.over = [0] * self.nr_players
+        self.games = [0] * self.nr_players
+        for round_pairs in self.pairs:
+            for pl1, pl2 in round_pairs:
+                self.games[pl1] += 1
+                self.games[pl2] += 1
+        self.lower_bound = sum(self._player_lb(pl) for pl in range(self.nr_players))
+
+        self.assignment = [list(range(nr_slots)) for _ in range(self.nr_rounds)]
+        self.best_score = upper_bound
+        self.best_assignment: Optional[List[List[int]]] = None
+        self.stop_score = stop_score
+
+    def _player_lb(self, pl: int) -> int:
+        return _player_lower_bound(self.fixed[pl], self.deficit[pl], self.over[pl], self.games[pl])
+
+    def _player_delta(self, pl: int, slot_idx: int) -> int:
+        " lower bound change if player would be placed to the slot - nothing is changed "
+        sch_cnt = self.counts[pl * self.nr_slots + slot_idx]
+        lb_after = _player_lower_bound(
+                self.fixed[pl] + self.penalties[sch_cnt + 1] - self.penalties[sch_cnt],
+                self.deficit[pl] - (sch_cnt < 2),
+                self.over[pl] + (sch_cnt == 2),
+                self.games[pl] - 1)
+        return lb_after - self._player_lb(pl)
+
+    def _pair_delta(self, pl1: int, pl2: int, slot_idx: int) -> int:
+        return self._player_delta(pl1, slot_idx) + self._player_delta(pl2, slot_idx)
+
+    def _place(self, pl: int, slot_idx: int, sign: int):
+        " sign 1 places, -1 removes player "
+        idx = pl * self.nr_slots + slot_idx
+        sch_cnt = self.counts[idx] if sign > 0 else self.counts[idx] - 1
+        self.counts[idx] += sign
+        self.fixed[pl] += sign * (self.penalties[sch_cnt + 1] - self.penalties[sch_cnt])
+        if sch_cnt < 2:
+            self.deficit[pl] -= sign
+        elif sch_cnt == 2:
+            self.over[pl] += sign
+        self.games[pl] -= sign
+
+    def _place_pair(self, pl1: int, pl2: int, slot_idx: int, sign: int, delta: int):
+        self._place(pl1, slot_idx, sign)
+        self._place(pl2, slot_idx, sign)
+        self.lower_bound += sign * delta
+
+    def _is_pruned(self, lower_bound: JustScore) -> bool:
+        return self.best_score is not None and lower_bound >= self.best_score
+
+    def run(self) -> bool:
+        " returns True if whole tree is searched (or stop score reached) "
+        # symmetry breaking - first round as in base
+        deltas = []
+        for slot_idx, (pl1, pl2) in enumerate(self.pairs[0]):
+            deltas.append(self._pair_delta(pl1, pl2, slot_idx))
+            self._place_pair(pl1, pl2, slot_idx, 1, deltas[-1])
+        try:
+            if self.nr_rounds > 1:
+                self._search(1, 0, list(range(self.nr_slots)))
+            else:
+                self._solution()
+        except _SearchTimeout:
+            return False
+        finally:
+            for slot_idx, (pl1, pl2) in enumerate(self.pairs[0]):
+                self._place_pair(pl1, pl2, slot_idx, -1, deltas[slot_idx])
+        return True
+
+    def _solution(self):
+        # all placed - lower bound is exact score
+        if self.best_score is None or self.lower_bound < self.best_score:
+            self.best_score = self.lower_bound
+            self.best_assignment = [row[:] for row in self.assignment]
+
+    def _search(self, round_idx: int, pair_idx: int, free_slots: List[int]):
+        self._check_time()
+        round_pairs = self.pairs[round_idx]
+        round_bound = self.lower_bound
+        for pl1, pl2 in round_pairs[pair_idx + 1:]:
+            round_bound += min(self._pair_delta(pl1, pl2, slot_idx) for slot_idx in free_slots)
+
+        pl1, pl2 = round_pairs[pair_idx]
+        # slots with smaller lower bound first
+        candidates = sorted((self._pair_delta(pl1, pl2, slot_idx), slot_idx) for slot_idx in free_slots)
+        for delta, slot_idx in candidates:
+            if self._is_pruned(round_bound + delta):
+                break
+            self._place_pair(pl1, pl2, slot_idx, 1, delta)
+            self.assignment[round_idx][pair_idx] = slot_idx
+            if pair_idx + 1 < self.nr_slots:
+                self._search(round_idx, pair_idx + 1, [idx for idx in free_slots if idx != slot_idx])
+            elif round_idx + 1 < self.nr_rounds:
+                self._search(round_idx + 1, 0, list(range(self.nr_slots)))
+            else:
+                self._solution()
+            self._place_pair(pl1, pl2, slot_idx, -1, delta)
+            if self.best_score is not None and self.best_score <= self.stop_score:
+                return
+
+
+def exact_schedule(
+        round_robin_rounds: RoundRobnRounds,
+        players: List[PlayerName],
+        time_budget: Optional[float] = None,
+        upper_bound_result: Optional[BestResult] = None,
+        verbose: bool = False) -> ExactResult:
+    """
+    time_budget - seconds for both phases, None - until proven.
+    upper_bound_result - known solution (e.g. from anneal_schedule()) for
+    branch and bound, when not given find_best_equalize_solution() without
+    random search is used. Returned when nothing better is found.
+    """
+    time_start = time.perf_counter()
+    if upper_bound_result is None:
+        upper_bound_result = find_best_equalize_solution(round_robin_rounds, players=players, brute_force_factor=None)
+    base = ScheduleArray.from_rounds(round_robin_rounds, players=players)
+    lower_bound = get_score_lower_bound(len(base.players))
+    best_score, best_rounds, nodes = upper_bound_result.best_score, None, 0
+    proven_optimal = best_score <= lower_bound
+
+    if not proven_optimal:
+        search = _IdealSearch(base, time_start, time_budget)
+        try:
+            found = search.run()
+        except _SearchTimeout:
+            found = None
+        nodes += search.nodes
+        if found:
+            best_score, best_rounds, proven_optimal = lower_bound, search.to_rounds(search.solution), True
+        elif found is not None:
+            lower_bound += 1
+            if verbose:
+                print(f"-- EXACT: no ideal, nodes={search.nodes}")
+            search = _BranchAndBound(base, time_start, time_budget,
+                                     upper_bound=best_score, stop_score=lower_bound)
+            completed = search.run()
+            nodes += search.nodes
+            if search.best_assignment is not None:
+                best_score, best_rounds = search.best_score, search.to_rounds(search.best_assignment)
+            proven_optimal = completed or best_score <= lower_bound
+
+    best_result = BestResult(players=players)
+    best_result.score_before = upper_bound_result.score_before
+    if best_rounds is None:
+        best_result.best_score = upper_bound_result.best_score
+        best_result.best_eq_type = upper_bound_result.best_eq_type
+        best_result.best_offset_x = upper_bound_result.best_offset_x
+        best_result.best_rounds = upper_bound_result.best_rounds
+    else:
+        best_result.best_score = best_score
+        best_result.best_eq_type = EqualizeType.EXACT
+        best_result.best_offset_x = 0
+        best_result.best_rounds = best_rounds
+
+    exact_result = ExactResult(
+            best_result=best_result,
+            proven_optimal=proven_optimal,
+            lower_bound=best_score if proven_optimal else lower_bound,
+            nodes=nodes,
+            elapsed=time.perf_counter() - time_start)
+    if verbose:
+        print(f"-- EXACT: {exact_result}, elapsed={exact_result.elapsed:.3f}s")
+    return exact_result
@@ -0,0 +1,281 @@
+"""
+Machine readable exporters and loaders
+--------------------------------------
+Formats:
+
+    CSV     - header "round,slot,player1,player2" and one row per pair,
+              round and slot are 1-based
+    NDJSON  - one round per line: {"round": 1, "pairs": [["1", "4"], ...]}
+    BINARY  - struct packed: header (magic "RRPB", version, typecode, nr. of
+              players, nr. of slots), player names (JSON list) and player
+              indexes rounds x slots x 2 (int16/int32 little-endian) -
+              number of rounds is given by data size
+
+Exporters stream - rounds are written one by one, so rounds can be a list,
+ScheduleArray or a generator (iter_berger_rounds(), iter_circle_rounds()).
+ScheduleArray is written from player indexes (binary without translation).
+
+Loaders return ScheduleArray (players in order of appearance for text
+formats). Binary data is read in one block - 5000 players (~50MB) in tens
+of milliseconds, text formats need parsing (seconds for 5000 players).
+
+    with open("players-100.rrpb", "wb") as fout:
+        write_binary(iter_berger_rounds(players), fout, players=players)
+    with open("players-100.rrpb", "rb") as fin:
+        schedule = read_binary(fin)
+
+    export_schedule(rounds, "players-100.csv")
+    rounds = load_schedule("players-100.csv")
+"""
+from typing import List, Optional, Iterable, Dict, IO
+from array import array
+import csv
+import enum
+import io
+import json
+import struct
+import sys
+
+from .base import PlayerName, RoundRobinRow, BYE, PlayerTable, _PlayerTokens
+from .schedule_array import ScheduleArray, get_typecode
+
+MAGIC = b"RRPB"
+VERSION = 1
+HEADER = struct.Struct("<4sHcxII")
+NAMES_SIZE = struct.Struct("<I")
+CSV_HEADER = ["round", "slot", "player1", "player2"]
+
+
+class ExportFormat(str, enum.Enum):
+    CSV = "CSV"
+    NDJSON = "NDJSON"
+    BINARY = "BINARY"
+
+    @classmethod
+    def values(cls):
+        return [k for k,v in ExportFormat.__members__.items()]
+
+    @classmethod
+    def from_path(cls, path: str) -> "ExportFormat":
+        " by file extension "
+        extension = path.rsplit(".", 1)[-1].lower()
+        for export_format, extensions in EXTENSIONS.items():
+            if extension in extensions:
+                return export_format
+        raise ValueError(f"Unknown format of {path}, expected extension: "
+                         f"{', '.join(ext for extensions in EXTENSIONS.values() for ext in extensions)}")
+
+
+EXTENSIONS = {
+    ExportFormat.CSV: ("csv",),
+    ExportFormat.NDJSON: ("ndjson", "jsonl"),
+    ExportFormat.BINARY: ("rrpb", "bin"),
+    }
+
+
+def _iter_rounds_idxs(round_robin_rounds, table: PlayerTable) -> Iterable[array]:
+    " rounds as flat arrays of player indexes "
+    if getattr(round_robin_rounds, "players", None) == table.players:
+        # array or memoryview (store) - each round copied as bytes
+        data = memoryview(round_robin_rounds.data).cast("B")
+        typecode = round_robin_rounds.typecode
+        size = round_robin_rounds.nr_slots * 2 * array(typecode).itemsize
+        for rnr in range(round_robin_rounds.nr_rounds):
+            round_idxs = array(typecode)
+            round_idxs.frombytes(data[rnr * size: (rnr + 1) * size])
+            yield round_idxs
+        return
+    typecode, player_idxs = get_typecode(len(table)), table.player_idxs
+    for round_pairs in round_robin_rounds:
+        yield array(typecode, [player_idxs[pl] for pair in round_pairs for pl in pair])
+
+
+def _iter_rounds_names(round_robin_rounds) -> Iterable[RoundRobinRow]:
+    if isinstance(round_robin_rounds, ScheduleArray):
+        players, data, size = round_robin_rounds.players, round_robin_rounds.data, round_robin_rounds.nr_slots * 2
+        for rnr in range(round_robin_rounds.nr_rounds):
+            idxs = iter(data[rnr * size: (rnr + 1) * size])
+            yield [(players[pl1], players[pl2]) for pl1, pl2 in zip(idxs, idxs)]
+        return
+    yield from round_robin_rounds
+
+
+class _ScheduleBuilder:
+    " text loaders - players interned in order of appearance, indexes collected round by round "
+
+    def __init__(self):
+        self.player_idxs: Dict[PlayerName, int] = {}
+        self.data = array("i")
+        self.nr_rounds = 0
+        self.nr_slots: Optional[int] = None
+
+    def add_round(self, names: List[PlayerName]):
+        " names - pair members of one round, flat "
+        nr_slots = len(names) // 2
+        if self.nr_slots is None:
+            self.nr_slots = nr_slots
+        elif nr_slots != self.nr_slots:
+            raise ValueError(f"Round {self.nr_rounds + 1} has {nr_slots} pairs, expected {self.nr_slots}")
+        player_idxs = self.player_idxs
+        # len() is evaluated before new player is added
+        self.data.extend([player_idxs.setdefault(pl, len(player_idxs)) for pl in names])
+        self.nr_rounds += 1
+
+    def schedule(self) -> ScheduleArray:
+        players = list(self.player_idxs)
+        typecode = get_typecode(len(players))
+        data = self.data if typecode == self.data.typecode else array(typecode, self.data)
+        return ScheduleArray(players, self.nr_rounds, self.nr_slots or 0, data)
+
+
+def _check_round_nr(round_nr, nr_rounds: int):
+    if round_nr != nr_rounds + 1:
+        raise ValueError(f"Rounds not in order, got round {round_nr} after {nr_rounds}")
+
+
+# ------------------------------------------------------------
+# CSV
+# ------------------------------------------------------------
+def _csv_encode(pl: PlayerName) -> str:
+    """
+    quoted when needed - with default line terminator, csv module decides
+    quoting by it, so names with \r or \n are quoted too
+    """
+    output = io.StringIO()
+    csv.writer(output).writerow([pl])
+    return output.getvalue()[:-2]
+
+
+def write_csv(round_robin_rounds, stream: IO[str]) -> None:
+    " stream - text file opened with newline='' (lines end with \\r\\n as in csv module) "
+    player_strs = _PlayerTokens(_csv_encode)
+    stream.write(",".join(CSV_HEADER) + "\r\n")
+    for rnr, round_pairs in enumerate(_iter_rounds_names(round_robin_rounds), 1):
+        stream.write("".join([f"{rnr},{snr},{player_strs[pl1]},{player_strs[pl2]}\r\n"
+                              for snr, (pl1, pl2) in enumerate(round_pairs, 1)]))
+
+
+def read_csv(stream: IO[str]) -> ScheduleArray:
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header != CSV_HEADER:
+        raise ValueError(f"Expected CSV header {','.join(CSV_HEADER)}, got: {header}")
+    builder = _ScheduleBuilder()
+    round_nr, names = None, []
+    for rnr, snr, pl1, pl2 in reader:
+        if rnr != round_nr:
+            if names:
+                builder.add_round(names)
+            _check_round_nr(int(rnr), builder.nr_rounds)
+            round_nr, names = rnr, []
+        names.append(pl1)
+        names.append(pl2)
+    if names:
+        builder.add_round(names)
+    return builder.schedule()
+
+
+# ------------------------------------------------------------
+# NDJSON
+# ------------------------------------------------------------
+def write_ndjson(round_robin_rounds, stream: IO[str]) -> None:
+    player_strs = _PlayerTokens(json.dumps)
+    for rnr, round_pairs in enumerate(_iter_rounds_names(round_robin_rounds), 1):
+        pair_out = ", ".join([f"[{player_strs[pl1]}, {player_strs[pl2]}]" for pl1, pl2 in round_pairs])
+        stream.write(f'{{"round": {rnr}, "pairs": [{pair_out}]}}\n')
+
+
+def read_ndjson(stream: IO[str]) -> ScheduleArray:
+    builder = _ScheduleBuilder()
+    for line in stream:
+        if not line.strip():
+            continue
+        round_dict = json.loads(line)
+        _check_round_nr(round_dict["round"], builder.nr_rounds)
+        builder.add_round([pl for pair in round_dict["pairs"] for pl in pair])
+    return builder.schedule()
+
+
+# ------------------------------------------------------------
+# Binary
+# ------------------------------------------------------------
+def write_binary(round_robin_rounds, stream: IO[bytes], players: Optional[List[PlayerName]] = None) -> None:
+    """
+    players - required when rounds is a generator (BYE is added for odd
+    number), otherwise detected (ScheduleArray players or from rounds).
+    """
+    if isinstance(round_robin_rounds, ScheduleArray):
+        table = round_robin_rounds.table
+    elif players is not None:
+        players = list(players)
+        if len(players) % 2 == 1 and BYE not in players:
+            players.append(BYE)
+        table = PlayerTable(players)
+    elif isinstance(round_robin_rounds, list):
+        table = PlayerTable.from_rounds(round_robin_rounds)
+    else:
+        raise ValueError("Players are required when rounds are given by generator")
+
+    names = json.dumps(table.players).encode("utf-8")
+    typecode = get_typecode(len(table))
+    stream.write(HEADER.pack(MAGIC, VERSION, typecode.encode("ascii"), len(table), len(table) // 2))
+    stream.write(NAMES_SIZE.pack(len(names)))
+    stream.write(names)
+    for round_idxs in _iter_rounds_idxs(round_robin_rounds, table):
+        if round_idxs.typecode != typecode:
+            round_idxs = array(typecode, round_idxs)
+        if sys.byteorder != "little":
+            round_idxs.byteswap()
+        stream.write(round_idxs.tobytes())
+
+
+def read_binary(stream: IO[bytes]) -> ScheduleArray:
+    header = stream.read(HEADER.size + NAMES_SIZE.size)
+    if len(header) != HEADER.size + NAMES_SIZE.size or header[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary schedule")
+    magic, version, typecode, nr_players, nr_slots = HEADER.unpack_from(header, 0)
+    if version != VERSION:
+        raise ValueError(f"Binary schedule version {version} not supported, expected {VERSION}")
+    names_size, = NAMES_SIZE.unpack_from(header, HEADER.size)
+    players = json.loads(stream.read(names_size).decode("utf-8"))
+    if len(players) != nr_players:
+        raise ValueError(f"Expected {nr_players} players, got {len(players)}")
+
+    data = array(typecode.decode("ascii"))
+    data.frombytes(stream.read())
+    if sys.byteorder != "little":
+        data.byteswap()
+    round_size = nr_slots * 2
+    if round_size == 0 or len(data) % round_size:
+        raise ValueError(f"Data size {len(data)} is not multiple of round size {round_size}")
+    return ScheduleArray(players, len(data) // round_size, nr_slots, data)
+
+
+# ------------------------------------------------------------
+# Files
+# ------------------------------------------------------------
+def export_schedule(round_robin_rounds, path: str, export_format: Optional[ExportFormat] = None,
+                    players: Optional[List[PlayerName]] = None) -> None:
+    " export_format - by file extension if not given "
+    export_format = ExportFormat(export_format) if export_format else ExportFormat.from_path(path)
+    if export_format == ExportFormat.BINARY:
+        with open(path, "wb") as fout:
+            write_binary(round_robin_rounds, fout, players=players)
+    elif export_format == ExportFormat.CSV:
+        with open(path, "w", newline="", encoding="utf-8") as fout:
+            write_csv(round_robin_rounds, fout)
+    else:
+        with open(path, "w", encoding="utf-8") as fout:
+            write_ndjson(round_robin_rounds, fout)
+
+
+def load_schedule(path: str, export_format: Optional[ExportFormat] = None):
+    export_format = ExportFormat(export_format) if export_format else ExportFormat.from_path(path)
+    if export_format == ExportFormat.BINARY:
+        with open(path, "rb") as fin:
+            return read_binary(fin)
+    if export_format == ExportFormat.CSV:
+        with open(path, newline="", encoding="utf-8") as fin:
+            return read_csv(fin)
+    with open(path, encoding="utf-8") as fin:
+        return read_ndjson(fin)
@@ -0,0 +1,215 @@
+"""
+Genetic optimizer
+-----------------
+https://en.wikipedia.org/wiki/Genetic_algorithm
+
+Genome is per-round slot permutation of base (Berger) schedule -
+genome[r][s] is the slot in base round r whose pair plays in slot s, so
+every genome is a valid schedule with the same pairs in each round.
+
+Whole population is kept in numpy (population, rounds, slots) array and each
+generation is done with a few array operations:
+
+    - elitism - best genomes are copied to next generation unchanged
+    - selection - tournaments between random genomes
+    - crossover - per round, each round of a child from one of 2 parents
+    - mutation - swap of 2 slots in a random round, random or directed
+      (unjust player moved from its most frequent slot to its rarest one)
+    - fitness - per-player slot counts of all children in one bincount,
+      updated by mutation swaps, score is sum of slot_count_penalty() of
+      counts (same as get_just_score())
+
+Initial population is base schedule, the best diagonal candidates of
+find_best_equalize_solution() (diagonal_scores()) and their mutations.
+
+    best_result = genetic_schedule(round_robin_rounds, players, time_budget=1.0, seed=1)
+
+numpy is required.
+"""
+from typing import List, Optional
+import time
+
+from .base import (
+        PlayerName, RoundRobnRounds, JustScore, BestResult, EqualizeType,
+        get_score_lower_bound,
+        )
+from .schedule_array import ScheduleArray, np
+from .scoring import diagonal_scores, diagonal_swap_slots, DIAGONAL_EQ_TYPES, _penalties_table
+
+POPULATION_SIZE = 64
+ELITE_SIZE = 4
+TOURNAMENT_SIZE = 3
+# probability that round of a child is taken from the first parent
+CROSSOVER_RATE = 0.5
+# part of children with directed mutation, others get random swap
+DIRECTED_RATIO = 0.5
+
+
+def _diagonal_permutations(nr_rounds: int, nr_slots: int, nr_permutations: int, scores: List[JustScore]):
+    " best diagonal candidates as slot permutations - slot 0 swapped with t0 + offset_x "
+    swap_slots = np.asarray(diagonal_swap_slots(DIAGONAL_EQ_TYPES, nr_rounds, nr_slots))
+    order = np.argsort(np.asarray(scores), kind="stable")[:nr_permutations]
+    types, offsets = np.divmod(order, nr_slots)
+    others = (swap_slots[types] + offsets[:, None]) % nr_slots
+    permutations = np.broadcast_to(np.arange(nr_slots), (len(order), nr_rounds, nr_slots)).copy()
+    cands, rounds = np.indices(others.shape)
+    permutations[cands, rounds, 0] = others
+    permutations[cands, rounds, others] = 0
+    return permutations
+
+
+class _Population:
+    " genomes with per-player slot counts - (genome, player, slot) "
+
+    def __init__(self, block, genomes, penalties):
+        # block - base schedule (rounds, slots, 2) player indexes
+        self.block = block
+        self.nr_rounds, self.nr_slots, _ = block.shape
+        self.nr_players = int(block.max()) + 1
+        self.penalties = penalties
+        self.genomes = genomes
+        self.genome_idxs = np.arange(len(genomes))
+        self.round_idxs = np.arange(self.nr_rounds)
+        size = self.nr_players * self.nr_slots
+        pairs = block[self.round_idxs[None, :, None], genomes]
+        keys = (self.genome_idxs[:, None, None, None] * size + pairs * self.nr_slots
+                + np.arange(self.nr_slots)[None, None, :, None])
+        self.counts = np.bincount(keys.ravel(), minlength=len(genomes) * size) \
+                        .reshape(len(genomes), self.nr_players, self.nr_slots)
+
+    def fitness(self):
+        return self.penalties[self.counts].sum(axis=(1, 2))
+
+    def swap(self, genome_idxs, rounds, slots_1, slots_2):
+        " swaps pairs in slots_1 and slots_2 of one round in each of genomes, counts are updated "
+        genomes, counts = self.genomes, self.counts
+        base_slots_1 = genomes[genome_idxs, rounds, slots_1]
+        base_slots_2 = genomes[genome_idxs, rounds, slots_2]
+        for side in (0, 1):
+            players_1 = self.block[rounds, base_slots_1, side]
+            players_2 = self.block[rounds, base_slots_2, side]
+            counts[genome_idxs, players_1, slots_1] -= 1
+            counts[genome_idxs, players_1, slots_2] += 1
+            counts[genome_idxs, players_2, slots_2] -= 1
+            counts[genome_idxs, players_2, slots_1] += 1
+        genomes[genome_idxs, rounds, slots_1] = base_slots_2
+        genomes[genome_idxs, rounds, slots_2] = base_slots_1
+
+    def mutate_random(self, genome_idxs, rng):
+        size = len(genome_idxs)
+        slots_1 = rng.integers(self.nr_slots, size=size)
+        # different slots
+        slots_2 = (slots_1 + rng.integers(1, self.nr_slots, size=size)) % self.nr_slots
+        self.swap(genome_idxs, rng.integers(self.nr_rounds, size=size), slots_1, slots_2)
+
+    def mutate_directed(self, genome_idxs, rng):
+        """
+        unjust player (random, weighted by its penalty) is moved in a random
+        round from its most frequent slot to its rarest slot
+        """
+        size = len(genome_idxs)
+        counts = self.counts[genome_idxs]
+        player_penalties = self.penalties[counts].sum(axis=2)
+        players = np.argmax(player_penalties * rng.random(player_penalties.shape), axis=1)
+        player_counts = counts[np.arange(size), players] + rng.random((size, self.nr_slots))
+        slots_from = np.argmax(player_counts, axis=1)
+        slots_to = np.argmin(player_counts, axis=1)
+
+        # random round where player is in slot_from
+        base_slots = self.genomes[genome_idxs[:, None], self.round_idxs[None, :], slots_from[:, None]]
+        in_slot = (self.block[self.round_idxs[None, :], base_slots] == players[:, None, None]).any(axis=2)
+        rounds = np.argmax(in_slot * rng.random(in_slot.shape), axis=1)
+        self.swap(genome_idxs, rounds, slots_from, slots_to)
+
+
+def genetic_schedule(
+        round_robin_rounds: RoundRobnRounds,
+        players: List[PlayerName],
+        max_generations: Optional[int] = 1000,
+        time_budget: Optional[float] = None,
+        population_size: int = POPULATION_SIZE,
+        elite_size: int = ELITE_SIZE,
+        tournament_size: int = TOURNAMENT_SIZE,
+        directed_ratio: float = DIRECTED_RATIO,
+        seed: Optional[int] = None,
+        target_score: Optional[JustScore] = None,
+        verbose: bool = False) -> BestResult:
+    """
+    max_generations and/or time_budget (seconds) - at least one is required,
+    when both are given the first one reached stops the search. Stops as
+    well when score reaches target_score or lower bound (ideal).
+    """
+    if np is None:
+        raise ImportError("numpy is required for genetic_schedule()")
+    if not max_generations and not time_budget:
+        raise ValueError("Provide max_generations and/or time_budget")
+    assert 0 <= elite_size < population_size and tournament_size > 0
+
+    rng = np.random.default_rng(seed)
+    base = ScheduleArray.from_rounds(round_robin_rounds, players=players)
+    nr_rounds, nr_slots = base.nr_rounds, base.nr_slots
+    block = base.to_numpy().astype(np.int64)
+    penalties = np.asarray(_penalties_table(nr_rounds))
+
+    # base, best diagonal candidates, mutations of them
+    genomes = np.broadcast_to(np.arange(nr_slots), (population_size, nr_rounds, nr_slots)).copy()
+    nr_seeded = 1
+    if nr_slots > 1:
+        scores = diagonal_scores(block, len(base.players))
+        diagonals = _diagonal_permutations(nr_rounds, nr_slots, population_size // 4, scores)
+        genomes[1: 1 + len(diagonals)] = diagonals
+        nr_seeded += len(diagonals)
+        genomes[nr_seeded:] = genomes[rng.integers(nr_seeded, size=population_size - nr_seeded)]
+    population = _Population(block, genomes, penalties)
+    if nr_slots > 1:
+        population.mutate_random(np.arange(nr_seeded, population_size), rng)
+    fitness = population.fitness()
+
+    best_result = BestResult(players=players)
+    best_result.score_before = int(fitness[0])
+    best_idx = int(np.argmin(fitness))
+    best_result.best_score = int(fitness[best_idx])
+    best_result.best_eq_type = EqualizeType.GENETIC
+    best_result.best_offset_x = 0
+    best_genome = genomes[best_idx].copy()
+
+    stop_score = get_score_lower_bound(len(players))
+    if target_score is not None:
+        stop_score = max(stop_score, target_score)
+
+    nr_children = population_size - elite_size
+    nr_directed = int(round(nr_children * directed_ratio))
+    time_start = time.perf_counter()
+    generation = 0
+    while nr_slots > 1 and best_result.best_score > stop_score:
+        if (max_generations and generation >= max_generations) \
+                or (time_budget and time.perf_counter() - time_start > time_budget):
+            break
+        generation += 1
+
+        elite = np.argsort(fitness, kind="stable")[:elite_size]
+        # tournaments - 2 parents per child, winner is the one with lowest score
+        contestants = rng.integers(population_size, size=(2, nr_children, tournament_size))
+        winners = np.take_along_axis(contestants, np.argmin(fitness[contestants], axis=2)[..., None], axis=2)[..., 0]
+        # per round crossover
+        from_first = rng.random((nr_children, nr_rounds)) < CROSSOVER_RATE
+        children = np.where(from_first[:, :, None], genomes[winners[0]], genomes[winners[1]])
+
+        population = _Population(block, np.concatenate((genomes[elite], children)), penalties)
+        children_idxs = np.arange(elite_size, population_size)
+        population.mutate_directed(children_idxs[:nr_directed], rng)
+        population.mutate_random(children_idxs[nr_directed:], rng)
+        genomes, fitness = population.genomes, population.fitness()
+
+        best_idx = int(np.argmin(fitness))
+        if fitness[best_idx] < best_result.best_score:
+            best_result.best_score = int(fitness[best_idx])
+            best_genome = genomes[best_idx].copy()
+            if verbose:
+                print(f"-- GENETIC: gen={generation:>6}, score={best_result.best_score}")
+
+    best_rounds = block[np.arange(nr_rounds)[:, None], best_genome]
+    best_result.best_rounds = ScheduleArray.from_numpy(base.players, best_rounds).to_rounds()
+    if verbose:
+        print(f"-- GENETIC: done after {generation} generations, {time.perf_counter() - time_start:.2f}s: {best_result}")
+    return best_result
@@ -0,0 +1,238 @@
+"""
+Closed-form pairing lookup
+--------------------------
+Answers "who does player X meet in round r" and "in which round and slot
+do X and Y meet" in O(1), without building the whole schedule.
+
+Berger tables:
+    players (BYE appended for odd number) are p[0] .. p[n-1], p[n-1] is
+    the fixed player, other m = n-1 players sit on a wheel which is rotated
+    by n/2-1 positions every round:
+
+        position(p[i], round r) = (m-1 - i - r * (n/2-1)) mod m
+
+    positions k and m-2-k play together, the position m-1 plays the fixed
+    player. Players i and j meet in round (i + j) mod m, fixed player meets
+    player i in round 2*i mod m.
+
+Circle:
+    players (BYE inserted at the start for odd number) are p[0] .. p[n-1],
+    p[0] is fixed, other m = n-1 players rotate by 1 position every round:
+
+        position(p[i], round r) = (i - 1 + r) mod m
+
+    Players i and j meet in round -(i + j) / 2 mod m, fixed player meets
+    player i in round -i mod m.
+
+All indexes are 0-based. Player indexes are indexes in the list of players
+as given to berger_tables() / circle_tables(), i.e. without BYE. BYE is
+reported as opponent None.
+"""
+from typing import List, Optional, Dict
+from dataclasses import dataclass
+
+from .base import PlayerName, BYE
+
+
+@dataclass(frozen=True)
+class Pairing:
+    round_idx: int
+    slot_idx: int
+    player_idx: int
+    # None -> BYE
+    opponent_idx: Optional[int]
+    # colour - True when player is first in the pair
+    is_first: bool
+
+    @property
+    def is_bye(self) -> bool:
+        return self.opponent_idx is None
+
+
+def _check_args(nr_players: int, *player_idxs: Optional[int]):
+    if nr_players < 1:
+        raise ValueError(f"Number of players should be positive, got {nr_players}")
+    for player_idx in player_idxs:
+        if player_idx is not None and not (0 <= player_idx < nr_players):
+            raise ValueError(f"Player index {player_idx} out of range 0..{nr_players-1}")
+
+
+def _check_round(n: int, round_idx: int):
+    if not (0 <= round_idx < n - 1):
+        raise ValueError(f"Round index {round_idx} out of range 0..{n-2}")
+
+
+# ------------------------------------------------------------
+# Berger
+# ------------------------------------------------------------
+
+def _berger_to_internal(nr_players: int, player_idx: Optional[int]) -> int:
+    # BYE is appended at the end
+    return nr_players if player_idx is None else player_idx
+
+
+def _berger_from_internal(nr_players: int, idx: int) -> Optional[int]:
+    return None if idx == nr_players else idx
+
+
+def berger_pairing(nr_players: int, player_idx: Optional[int], round_idx: int) -> Pairing:
+    " opponent, slot and colour of player in round - same as berger_tables(), for player_idx=None returns BYE pairing "
+    if player_idx is None and nr_players % 2 == 0:
+        raise ValueError(f"No BYE for even number of players {nr_players}")
+    _check_args(nr_players, player_idx)
+    n = nr_players + nr_players % 2
+    _check_round(n, round_idx)
+    m = n - 1
+    shift = round_idx * (n // 2 - 1)
+    fixed = n - 1
+
+    idx = _berger_to_internal(nr_players, player_idx)
+    if idx == fixed:
+        opp = (-shift) % m
+        slot_idx, is_first = 0, (round_idx % 2 == 1)
+    else:
+        pos = (m - 1 - idx - shift) % m
+        if pos == m - 1:
+            opp = fixed
+            slot_idx, is_first = 0, (round_idx % 2 == 0)
+        else:
+            opp = (m - 1 - (m - 2 - pos) - shift) % m
+            if pos <= n // 2 - 2:
+                slot_idx, is_first = pos + 1, False
+            else:
+                slot_idx, is_first = m - 1 - pos, True
+
+    return Pairing(round_idx=round_idx,
+                   slot_idx=slot_idx,
+                   player_idx=player_idx,
+                   opponent_idx=_berger_from_internal(nr_players, opp),
+                   is_first=is_first)
+
+
+def berger_meeting(nr_players: int, player_idx: int, opponent_idx: Optional[int]) -> Pairing:
+    " round, slot and colour when two players meet - same as berger_tables(), opponent_idx=None for BYE "
+    if opponent_idx is None and nr_players % 2 == 0:
+        raise ValueError(f"No BYE for even number of players {nr_players}")
+    _check_args(nr_players, player_idx, opponent_idx)
+    if player_idx == opponent_idx:
+        raise ValueError(f"Player {player_idx} can not meet itself")
+    n = nr_players + nr_players % 2
+    m = n - 1
+    fixed = n - 1
+
+    idx = _berger_to_internal(nr_players, player_idx)
+    opp = _berger_to_internal(nr_players, opponent_idx)
+    if fixed in (idx, opp):
+        other = opp if idx == fixed else idx
+        round_idx = (2 * other) % m
+    else:
+        round_idx = (idx + opp) % m
+    return berger_pairing(nr_players, player_idx, round_idx)
+
+
+# ------------------------------------------------------------
+# Circle
+# ------------------------------------------------------------
+
+def _circle_to_internal(nr_players: int, player_idx: Optional[int]) -> int:
+    # BYE is inserted at the start
+    if nr_players % 2 == 0:
+        return player_idx
+    return 0 if player_idx is None else player_idx + 1
+
+
+def _circle_from_internal(nr_players: int, idx: int) -> Optional[int]:
+    if nr_players % 2 == 0:
+        return idx
+    return None if idx == 0 else idx - 1
+
+
+def circle_pairing(nr_players: int, player_idx: Optional[int], round_idx: int) -> Pairing:
+    " opponent, slot and colour of player in round - same as circle_tables(), for player_idx=None returns BYE pairing "
+    if player_idx is None and nr_players % 2 == 0:
+        raise ValueError(f"No BYE for even number of players {nr_players}")
+    _check_args(nr_players, player_idx)
+    n = nr_players + nr_players % 2
+    _check_round(n, round_idx)
+    m = n - 1
+
+    idx = _circle_to_internal(nr_players, player_idx)
+    if idx == 0:
+        opp = 1 + (m - 1 - round_idx) % m
+        slot_idx, is_first = 0, True
+    else:
+        pos = (idx - 1 + round_idx) % m
+        if pos == m - 1:
+            opp = 0
+            slot_idx, is_first = 0, False
+        else:
+            opp = 1 + (m - 2 - pos - round_idx) % m
+            if pos <= n // 2 - 2:
+                slot_idx, is_first = pos + 1, True
+            else:
+                slot_idx, is_first = m - 1 - pos, False
+
+    return Pairing(round_idx=round_idx,
+                   slot_idx=slot_idx,
+                   player_idx=player_idx,
+                   opponent_idx=_circle_from_internal(nr_players, opp),
+                   is_first=is_first)
+
+
+def circle_meeting(nr_players: int, player_idx: int, opponent_idx: Optional[int]) -> Pairing:
+    " round, slot and colour when two players meet - same as circle_tables(), opponent_idx=None for BYE "
+    if opponent_idx is None and nr_players % 2 == 0:
+        raise ValueError(f"No BYE for even number of players {nr_players}")
+    _check_args(nr_players, player_idx, opponent_idx)
+    if player_idx == opponent_idx:
+        raise ValueError(f"Player {player_idx} can not meet itself")
+    n = nr_players + nr_players % 2
+    m = n - 1
+
+    idx = _circle_to_internal(nr_players, player_idx)
+    opp = _circle_to_internal(nr_players, opponent_idx)
+    if 0 in (idx, opp):
+        round_idx = (-(idx + opp)) % m
+    else:
+        # m is odd, (m+1)/2 is inverse of 2
+        round_idx = (-(idx + opp) * ((m + 1) // 2)) % m
+    return circle_pairing(nr_players, player_idx, round_idx)
+
+
+class PairingLookup:
+    """
+    lookup by player names, e.g.:
+
+        lookup = PairingLookup(players)
+        lookup.opponent("Ana", round_nr=3)
+        lookup.meeting("Ana", "Bob")
+    """
+    def __init__(self, players: List[PlayerName], berger: bool = True):
+        if len(set(players)) != len(players):
+            raise ValueError("Players names should be unique")
+        self.players = list(players)
+        self.berger = berger
+        self.player_idxs: Dict[PlayerName, int] = {pl: idx for idx, pl in enumerate(self.players)}
+
+    def _player_idx(self, player: PlayerName) -> Optional[int]:
+        if player == BYE and BYE not in self.player_idxs:
+            return None
+        try:
+            return self.player_idxs[player]
+        except KeyError:
+            raise ValueError(f"Unknown player {player}")
+
+    def _name(self, player_idx: Optional[int]) -> PlayerName:
+        return BYE if player_idx is None else self.players[player_idx]
+
+    def pairing(self, player: PlayerName, round_nr: int) -> Pairing:
+        " round_nr is 1-based as in round_robin_rounds_to_str_list() "
+        function = berger_pairing if self.berger else circle_pairing
+        return function(len(self.players), self._player_idx(player), round_nr - 1)
+
+    def opponent(self, player: PlayerName, round_nr: int) -> PlayerName:
+        return self._name(self.pairing(player, round_nr).opponent_idx)
+
+    def meeting(self, player: PlayerName, other: PlayerName) -> Pairing:
+        function = berger_meeting if self.berger else circle_meeting
+        return function(len(self.players), self._player_idx(player), self._player_idx(other))
@@ -0,0 +1,175 @@
+"""
+Round order search
+------------------
+Diagonal equalizers of find_best_equalize_solution() swap pair in slot 0
+with slot given by round position in the pattern (get_swap_idxs()), round
+order from berger_tables() is kept. When rounds can be reordered, round at
+position i gets swap slot of position i - this changes the diagonal which
+the fixed player (in slot 0 of every Berger round) follows.
+
+Score depends only on per-player slot counts, so round order matters only
+through the pattern. Search is over positions of rounds in the pattern:
+move exchanges positions of 2 rounds, changes counts of at most 8 players
+and is evaluated in O(1) - counts are updated and reverted when move is
+rejected, no candidate is built or scored from scratch. Local search (first
+improvement, random move order, until no exchange improves) is started from
+original order for each of the best nr_patterns diagonal candidates
+(diagonal_scores()).
+
+    best_result = round_order_schedule(round_robin_rounds, players, seed=1)
+    best_result.best_round_order    # original round indexes in new order
+    best_result.best_rounds         # rounds in new order, pattern applied
+
+Result can be improved further by in-round optimizers, e.g.
+assignment_schedule(best_result.best_rounds, players).
+"""
+from typing import List, Optional, Dict
+import random
+import time
+
+from .base import (
+        PlayerName, RoundRobnRounds, JustScore, BestResult,
+        SwapCandidateScorer, get_score_lower_bound, slot_count_penalty, apply_swap_idxs,
+        )
+from .scoring import diagonal_scores, diagonal_swap_slots, DIAGONAL_EQ_TYPES
+
+NR_PATTERNS = 5
+# how often time budget is checked (moves)
+TIME_CHECK_EVERY = 1000
+
+
+class _PatternSearch:
+    " per-player slot counts of base rounds with swap slot (target) of each round "
+
+    def __init__(self, base: List[List[tuple]], nr_players: int):
+        self.base = base
+        self.nr_rounds, self.nr_slots = len(base), len(base[0])
+        self.penalties = [slot_count_penalty(sch_cnt) for sch_cnt in range(self.nr_rounds + 2)]
+        nr_slots = self.nr_slots
+        self.counts = [0] * (nr_players * nr_slots)
+        for round_pairs in base:
+            for slot_idx, (pl1, pl2) in enumerate(round_pairs):
+                self.counts[pl1 * nr_slots + slot_idx] += 1
+                self.counts[pl2 * nr_slots + slot_idx] += 1
+        self.score = sum(self.penalties[sch_cnt] for sch_cnt in self.counts)
+        self.targets = [0] * self.nr_rounds
+
+    def _move(self, player_idx: int, slot_from: int, slot_to: int) -> JustScore:
+        penalties, counts = self.penalties, self.counts
+        idx_from, idx_to = player_idx * self.nr_slots + slot_from, player_idx * self.nr_slots + slot_to
+        cnt_from, cnt_to = counts[idx_from], counts[idx_to]
+        counts[idx_from] = cnt_from - 1
+        counts[idx_to] = cnt_to + 1
+        return penalties[cnt_from - 1] - penalties[cnt_from] + penalties[cnt_to + 1] - penalties[cnt_to]
+
+    def set_target(self, round_idx: int, target: int) -> JustScore:
+        " pair from slot 0 of base round goes to target slot (0 - no swap), returns score delta "
+        target_old = self.targets[round_idx]
+        if target_old == target:
+            return 0
+        round_pairs = self.base[round_idx]
+        pl1, pl2 = round_pairs[0]
+        delta = 0
+        if target_old:
+            pl3, pl4 = round_pairs[target_old]
+            delta += (self._move(pl1, target_old, 0) + self._move(pl2, target_old, 0)
+                      + self._move(pl3, 0, target_old) + self._move(pl4, 0, target_old))
+        if target:
+            pl3, pl4 = round_pairs[target]
+            delta += (self._move(pl1, 0, target) + self._move(pl2, 0, target)
+                      + self._move(pl3, target, 0) + self._move(pl4, target, 0))
+        self.targets[round_idx] = target
+        self.score += delta
+        return delta
+
+    def exchange(self, round_idx_1: int, round_idx_2: int) -> JustScore:
+        " exchanges targets (pattern positions) of 2 rounds, returns score delta "
+        target_1, target_2 = self.targets[round_idx_1], self.targets[round_idx_2]
+        return self.set_target(round_idx_1, target_2) + self.set_target(round_idx_2, target_1)
+
+
+def round_order_schedule(
+        round_robin_rounds: RoundRobnRounds,
+        players: List[PlayerName],
+        nr_patterns: int = NR_PATTERNS,
+        time_budget: Optional[float] = None,
+        seed: Optional[int] = None,
+        target_score: Optional[JustScore] = None,
+        verbose: bool = False) -> BestResult:
+    """
+    nr_patterns - number of the best diagonal candidates (eq_type, offset_x)
+        local search is started from. Result has eq_type and offset_x of
+        the pattern and best_round_order.
+    time_budget - seconds for all patterns, None - until all local searches
+        end. Stops as well when score reaches target_score or lower bound.
+    """
+    rnd = random.Random(seed)
+    scorer = SwapCandidateScorer(round_robin_rounds, players=players)
+    base = scorer.base
+    nr_rounds, nr_slots = len(base), scorer.nr_schedules
+
+    stop_score = get_score_lower_bound(len(players))
+    if target_score is not None:
+        stop_score = max(stop_score, target_score)
+
+    best_result = BestResult(players=players)
+    best_result.score_before = scorer.score()
+    best_result.best_score = best_result.score_before
+    best_result.best_round_order = list(range(nr_rounds))
+    best_result.best_swap_idxs = [0] * nr_rounds
+
+    scores = diagonal_scores(base, len(players))
+    swap_slots = diagonal_swap_slots(DIAGONAL_EQ_TYPES, nr_rounds, nr_slots)
+    candidates = sorted(range(len(scores)), key=lambda cand_idx: scores[cand_idx])[:nr_patterns]
+
+    time_start = time.perf_counter()
+    nr_moves = 0
+    for cand_idx in candidates:
+        type_idx, offset_x = divmod(cand_idx, nr_slots)
+        pattern = [(slot_idx + offset_x) % nr_slots for slot_idx in swap_slots[type_idx]]
+        search = _PatternSearch(base, len(players))
+        for round_idx, target in enumerate(pattern):
+            search.set_target(round_idx, target)
+
+        improved, timeout = True, False
+        while improved and not timeout and search.score > stop_score:
+            improved = False
+            moves = [(round_idx_1, round_idx_2) for round_idx_1 in range(nr_rounds)
+                                                for round_idx_2 in range(round_idx_1 + 1, nr_rounds)
+                                                if search.targets[round_idx_1] != search.targets[round_idx_2]]
+            rnd.shuffle(moves)
+            for round_idx_1, round_idx_2 in moves:
+                nr_moves += 1
+                if nr_moves % TIME_CHECK_EVERY == 0 and time_budget is not None \
+                        and time.perf_counter() - time_start > time_budget:
+                    timeout = True
+                    break
+                if search.exchange(round_idx_1, round_idx_2) < 0:
+                    improved = True
+                    if search.score <= stop_score:
+                        break
+                else:
+                    search.exchange(round_idx_1, round_idx_2)
+
+        if verbose:
+            print(f"-- ROUND_ORDER: eq={DIAGONAL_EQ_TYPES[type_idx].value:<10} + {offset_x:>2}, "
+                  f"pattern={scores[cand_idx]:>4} -> {search.score:>4}")
+        if search.score < best_result.best_score:
+            best_result.best_score = search.score
+            best_result.best_eq_type = DIAGONAL_EQ_TYPES[type_idx]
+            best_result.best_offset_x = offset_x
+            # rounds with same target are interchangeable - taken in original order
+            rounds_by_target: Dict[int, List[int]] = {}
+            for round_idx in reversed(range(nr_rounds)):
+                rounds_by_target.setdefault(search.targets[round_idx], []).append(round_idx)
+            best_result.best_round_order = [rounds_by_target[target].pop() for target in pattern]
+            best_result.best_swap_idxs = pattern
+        if best_result.best_score <= stop_score or \
+                (time_budget is not None and time.perf_counter() - time_start > time_budget):
+            break
+
+    best_result.best_rounds = apply_swap_idxs([round_robin_rounds[round_idx] for round_idx in best_result.best_round_order],
+                                              best_result.best_swap_idxs)
+    if verbose:
+        print(f"-- ROUND_ORDER: done, {nr_moves} moves, {time.perf_counter() - time_start:.2f}s: {best_result}")
+    return best_result
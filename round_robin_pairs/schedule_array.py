@@ -0,0 +1,314 @@
+"""
+Compact schedule representation
+-------------------------------
+ScheduleArray stores rounds x slots x 2 block of small ints (player indexes)
+in one flat array.array ('h' = int16, or 'i' = int32 for very large number
+of players) plus the player names table.
+
+It behaves like RoundRobnRounds - len(), indexing and iterating return
+rounds as lists of (pl1, pl2) pairs of player names, and pairs can be
+assigned (used by swap()), so get_just_score(), equalize_schedules_in_rounds()
+and round_robin_rounds_to_str_list() work on it directly.
+
+When numpy is installed to_numpy() returns zero-copy (rounds, slots, 2) view.
+numpy is imported on first use, small schedules are built without it.
+
+Data can be read-only memoryview too (e.g. slice of mmap-ed file in store
+module) - then it is zero-copy and can not be changed.
+"""
+from typing import List, Optional, Dict, Iterator, Tuple, Sequence
+from array import array
+
+from .base import PlayerName, RoundRobnRounds, RoundRobinRow, BYE, PlayerTable, PlayerIdxRounds, optional_import
+
+# optional - imported on first use
+np = optional_import("numpy")
+
+INT16_MAX = 2**15 - 1
+
+
+def get_typecode(nr_players: int) -> str:
+    return "h" if nr_players <= INT16_MAX else "i"
+
+
+class ScheduleRow:
+    " view to one round in ScheduleArray - list like, pairs are (pl1, pl2) tuples of names "
+    __slots__ = ("schedule", "round_idx")
+
+    def __init__(self, schedule: "ScheduleArray", round_idx: int):
+        self.schedule = schedule
+        self.round_idx = round_idx
+
+    def __len__(self) -> int:
+        return self.schedule.nr_slots
+
+    def _offset(self, slot_idx: int) -> int:
+        nr_slots = self.schedule.nr_slots
+        if slot_idx < 0:
+            slot_idx += nr_slots
+        if not (0 <= slot_idx < nr_slots):
+            raise IndexError(f"Slot index {slot_idx} out of range")
+        return (self.round_idx * nr_slots + slot_idx) * 2
+
+    def __getitem__(self, slot_idx: int) -> Tuple[PlayerName, PlayerName]:
+        offset = self._offset(slot_idx)
+        data, players = self.schedule.data, self.schedule.players
+        return (players[data[offset]], players[data[offset+1]])
+
+    def __setitem__(self, slot_idx: int, pair: Tuple[PlayerName, PlayerName]):
+        offset = self._offset(slot_idx)
+        player_idxs = self.schedule.player_idxs
+        pl1, pl2 = pair
+        self.schedule.data[offset] = player_idxs[pl1]
+        self.schedule.data[offset+1] = player_idxs[pl2]
+
+    def __iter__(self) -> Iterator[Tuple[PlayerName, PlayerName]]:
+        return (self[slot_idx] for slot_idx in range(self.schedule.nr_slots))
+
+    def __eq__(self, other) -> bool:
+        return list(self) == [tuple(pair) for pair in other]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class ScheduleArray:
+    """
+    rounds x slots x 2 player indexes in flat array - index of pair member:
+        (round_idx * nr_slots + slot_idx) * 2 + (0 | 1)
+    """
+
+    def __init__(self, players: List[PlayerName], nr_rounds: int, nr_slots: int,
+                 data: Optional[array] = None):
+        self.table = PlayerTable(players)
+        self.players = self.table.players
+        self.player_idxs: Dict[PlayerName, int] = self.table.player_idxs
+        self.nr_rounds = nr_rounds
+        self.nr_slots = nr_slots
+        size = nr_rounds * nr_slots * 2
+        if data is None:
+            data = array(get_typecode(len(self.players)), [0]) * size
+        if len(data) != size:
+            raise ValueError(f"Expected data size {size}, got {len(data)}")
+        self.data = data
+
+    @classmethod
+    def from_rounds(cls, round_robin_rounds: RoundRobnRounds,
+                    players: Optional[List[PlayerName]] = None) -> "ScheduleArray":
+        " players if not provided are detected in order of appearance "
+        table = PlayerTable.from_rounds(round_robin_rounds) if players is None else PlayerTable(players)
+        return cls.from_indexes(table.players, table.intern_rounds(round_robin_rounds))
+
+    @classmethod
+    def from_indexes(cls, players: List[PlayerName],
+                     rounds_idxs: Sequence[Sequence[Tuple[int, int]]]) -> "ScheduleArray":
+        " from rounds of pairs of player indexes "
+        nr_rounds = len(rounds_idxs)
+        nr_slots = len(rounds_idxs[0]) if nr_rounds else 0
+        data = array(get_typecode(len(players)),
+                     [idx for round_pairs in rounds_idxs for pair in round_pairs for idx in pair])
+        return cls(players, nr_rounds, nr_slots, data)
+
+    @classmethod
+    def from_numpy(cls, players: List[PlayerName], block) -> "ScheduleArray":
+        " from numpy (rounds, slots, 2) block of player indexes "
+        nr_rounds, nr_slots, _ = block.shape
+        typecode = get_typecode(len(players))
+        data = array(typecode)
+        data.frombytes(np.ascontiguousarray(block, dtype=_numpy_dtype(typecode)).tobytes())
+        return cls(players, nr_rounds, nr_slots, data)
+
+    def to_rounds(self) -> RoundRobnRounds:
+        players, data, nr_slots = self.players, self.data, self.nr_slots
+        return [[(players[data[offset]], players[data[offset+1]])
+                    for offset in range(rnr * nr_slots * 2, (rnr + 1) * nr_slots * 2, 2)]
+                for rnr in range(self.nr_rounds)]
+
+    def to_indexes(self) -> PlayerIdxRounds:
+        " rounds of pairs of player indexes "
+        data, nr_slots = self.data, self.nr_slots
+        return [[(data[offset], data[offset+1])
+                    for offset in range(rnr * nr_slots * 2, (rnr + 1) * nr_slots * 2, 2)]
+                for rnr in range(self.nr_rounds)]
+
+    @property
+    def typecode(self) -> str:
+        # array.array or memoryview
+        return getattr(self.data, "typecode", None) or self.data.format
+
+    def to_numpy(self):
+        " zero-copy (rounds, slots, 2) view of player indexes "
+        if np is None:
+            raise ImportError("numpy is required for ScheduleArray.to_numpy()")
+        return np.frombuffer(self.data, dtype=_numpy_dtype(self.typecode)) \
+                 .reshape(self.nr_rounds, self.nr_slots, 2)
+
+    def pair_idxs(self, round_idx: int, slot_idx: int) -> Tuple[int, int]:
+        offset = (round_idx * self.nr_slots + slot_idx) * 2
+        return self.data[offset], self.data[offset+1]
+
+    def swap_slots(self, round_idx: int, slot_idx_1: int, slot_idx_2: int):
+        " same as swap() for RoundRobinRow, without names translation "
+        data = self.data
+        offset_1 = (round_idx * self.nr_slots + slot_idx_1) * 2
+        offset_2 = (round_idx * self.nr_slots + slot_idx_2) * 2
+        data[offset_1], data[offset_1+1], data[offset_2], data[offset_2+1] = \
+            data[offset_2], data[offset_2+1], data[offset_1], data[offset_1+1]
+
+    def nbytes(self) -> int:
+        return len(self.data) * self.data.itemsize
+
+    def copy(self) -> "ScheduleArray":
+        return ScheduleArray(self.players, self.nr_rounds, self.nr_slots, array(self.typecode, self.data))
+
+    def __deepcopy__(self, memo) -> "ScheduleArray":
+        return self.copy()
+
+    def __len__(self) -> int:
+        return self.nr_rounds
+
+    def __getitem__(self, round_idx: int) -> RoundRobinRow:
+        if round_idx < 0:
+            round_idx += self.nr_rounds
+        if not (0 <= round_idx < self.nr_rounds):
+            raise IndexError(f"Round index {round_idx} out of range")
+        return ScheduleRow(self, round_idx)
+
+    def __iter__(self) -> Iterator[RoundRobinRow]:
+        return (ScheduleRow(self, round_idx) for round_idx in range(self.nr_rounds))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ScheduleArray):
+            return (self.players == other.players
+                    and self.nr_slots == other.nr_slots
+                    and list(self.data) == list(other.data))
+        return self.to_rounds() == [[tuple(pair) for pair in round_pairs] for round_pairs in other]
+
+    def __repr__(self) -> str:
+        return f"ScheduleArray(players={len(self.players)}, rounds={self.nr_rounds}, slots={self.nr_slots})"
+
+
+def _numpy_dtype(typecode: str):
+    return np.int16 if typecode == "h" else np.intc
+
+
+# ------------------------------------------------------------
+# Vectorized construction
+# ------------------------------------------------------------
+# Uses closed-form positions from lookup module, for n players (with BYE),
+# m = n-1, round r, slot s (1..n/2-1):
+#
+#   berger: shift = r * (n/2-1) mod m
+#       slot 0: (m-shift) mod m with fixed n-1, fixed is second in even rounds
+#       slot s: ((s - shift) mod m, (m - s - shift) mod m)
+#
+#   circle:
+#       slot 0: (0, 1 + (m-1-r) mod m)
+#       slot s: (1 + (s-1-r) mod m, 1 + (m-1-s-r) mod m)
+
+ROUNDS_CHUNK = 1024
+# below this python loop is faster than numpy (and numpy is not imported)
+NUMPY_MIN_PLAYERS = 24
+
+
+def _windows(values, width: int):
+    " row j is values[j:j+width] - no copy "
+    return np.lib.stride_tricks.sliding_window_view(values, width)
+
+
+def _fill_slots_numpy(block, m: int, firsts, first_starts, seconds, second_starts):
+    # every round in slots 1.. is contiguous cyclic slice of firsts / seconds,
+    # so the whole block is one gather of sliding windows (in chunks of rounds)
+    width = block.shape[1] - 1
+    if not width:
+        return
+    firsts, seconds = _windows(firsts, width), _windows(seconds, width)
+    for r_from in range(0, m, ROUNDS_CHUNK):
+        r_to = min(r_from + ROUNDS_CHUNK, m)
+        block[r_from:r_to, 1:, 0] = firsts[first_starts[r_from:r_to]]
+        block[r_from:r_to, 1:, 1] = seconds[second_starts[r_from:r_to]]
+
+
+def _berger_fill_numpy(block, n: int):
+    m, n_half = n - 1, n // 2
+    rounds = np.arange(m, dtype=np.int64)
+    shift = (rounds * (n_half - 1)) % m
+    even = (rounds % 2 == 0)
+    other = (m - shift) % m
+    block[:, 0, 0] = np.where(even, other, n - 1)
+    block[:, 0, 1] = np.where(even, n - 1, other)
+    positions = np.arange(2 * m, dtype=np.int64)
+    # (s - shift) mod m  and  (-(s + shift)) mod m  for s = 1 ..
+    _fill_slots_numpy(block, m,
+                      (positions % m).astype(block.dtype), m + 1 - shift,
+                      (-positions % m).astype(block.dtype), 1 + shift)
+
+
+def _circle_fill_numpy(block, n: int):
+    m = n - 1
+    rounds = np.arange(m, dtype=np.int64)
+    block[:, 0, 0] = 0
+    block[:, 0, 1] = 1 + (m - 1 - rounds) % m
+    positions = np.arange(2 * m, dtype=np.int64)
+    # 1 + (s - 1 - r) mod m  and  1 + (-(s + r + 1)) mod m  for s = 1 ..
+    _fill_slots_numpy(block, m,
+                      (1 + positions % m).astype(block.dtype), m - rounds,
+                      (1 + (-positions % m)).astype(block.dtype), rounds + 2)
+
+
+def _berger_idxs_python(n: int) -> List[int]:
+    m, n_half = n - 1, n // 2
+    data: List[int] = []
+    for rnr in range(m):
+        shift = (rnr * (n_half - 1)) % m
+        other = (m - shift) % m
+        data.extend((other, n - 1) if rnr % 2 == 0 else (n - 1, other))
+        for slot in range(1, n_half):
+            data.append((slot - shift) % m)
+            data.append((m - slot - shift) % m)
+    return data
+
+
+def _circle_idxs_python(n: int) -> List[int]:
+    m, n_half = n - 1, n // 2
+    data: List[int] = []
+    for rnr in range(m):
+        data.extend((0, 1 + (m - 1 - rnr) % m))
+        for slot in range(1, n_half):
+            data.append(1 + (slot - 1 - rnr) % m)
+            data.append(1 + (m - 1 - slot - rnr) % m)
+    return data
+
+
+def _build_array(players: List[PlayerName], berger: bool) -> ScheduleArray:
+    n = len(players)
+    assert n > 0 
+    n_half = n // 2
+    typecode = get_typecode(n)
+    if np is not None and n >= NUMPY_MIN_PLAYERS:
+        data = array(typecode, [0]) * ((n - 1) * n_half * 2)
+        # filled in place through zero-copy view
+        block = np.frombuffer(data, dtype=_numpy_dtype(typecode)).reshape(n - 1, n_half, 2)
+        if berger:
+            _berger_fill_numpy(block, n)
+        else:
+            _circle_fill_numpy(block, n)
+    else:
+        data = array(typecode, _berger_idxs_python(n) if berger else _circle_idxs_python(n))
+    return ScheduleArray(players, n - 1, n_half, data)
+
+
+def berger_array(players: List[PlayerName]) -> ScheduleArray:
+    " same as berger_tables() (without ideal) computed in one batched index computation - numpy if available "
+    players = list(players)
+    if len(players) % 2 == 1:
+        players.append(BYE)
+    return _build_array(players, berger=True)
+
+
+def circle_array(players: List[PlayerName]) -> ScheduleArray:
+    " same as circle_tables() computed in one batched index computation - numpy if available "
+    players = list(players)
+    if len(players) % 2 == 1:
+        players.insert(0, BYE)
+    return _build_array(players, berger=False)
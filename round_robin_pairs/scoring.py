@@ -0,0 +1,326 @@
+"""
+Incremental scoring
+-------------------
+Same score as get_just_score(), but kept up to date on pair swaps.
+
+Swap of two pairs in a round moves 4 players between 2 schedules (slots),
+so only 4 per-player slot counts change and score delta is O(1):
+
+    scorer = IncrementalScore(round_robin_rounds, players=players)
+    delta = scorer.swap_delta(round_idx, 0, 3)   # no change
+    scorer.apply_swap(round_idx, 0, 3)           # changes schedule and score
+    scorer.undo()
+
+Batch scoring
+-------------
+Scores of many candidate schedules at once - one bincount over
+(candidate, player, slot) and penalty table lookup (numpy if available):
+
+    scores = batch_scores(candidates, nr_players)       # (C, rounds, slots, 2)
+    scores = batch_scores_permutations(base, perms)     # (C, rounds, slots)
+
+Diagonal scores
+---------------
+Scores of all equalize candidates (eq_type, offset_x) of find_best_equalize_solution()
+in one pass, without building candidates:
+
+    scores = diagonal_scores(base, nr_players)          # base - (rounds, slots, 2)
+"""
+from typing import List, Optional, Dict, Tuple, Union, Sequence
+
+from .base import (
+        PlayerName, RoundRobnRounds, JustScore, EqualizeType,
+        slot_count_penalty, get_swap_idxs,
+        )
+from .schedule_array import ScheduleArray, np
+
+# max. size of bincount per one chunk of candidates
+BATCH_COUNTS_MAX = 2**22
+
+# diagonal equalize types in find_best_equalize_solution() order
+DIAGONAL_EQ_TYPES = (
+        EqualizeType.DIAG_L2R, EqualizeType.DIAG_R2L, EqualizeType.DIAG_L2R2L,
+        EqualizeType.DIAG_R2L2R, EqualizeType.CROSS,
+        )
+
+
+class IncrementalScore:
+    """
+    counts are kept in flat list, index is:
+        player_idx * nr_slots + slot_idx
+    """
+
+    def __init__(self, round_robin_rounds: Union[RoundRobnRounds, ScheduleArray],
+                 players: Optional[List[PlayerName]] = None):
+        # schedule is own copy - changed by apply_swap()
+        if isinstance(round_robin_rounds, ScheduleArray):
+            self.schedule = round_robin_rounds.copy()
+        else:
+            self.schedule = ScheduleArray.from_rounds(round_robin_rounds, players=players)
+        self.players = self.schedule.players
+        self.nr_slots = self.schedule.nr_slots
+        self.nr_rounds = self.schedule.nr_rounds
+        self.penalties = [slot_count_penalty(sch_cnt) for sch_cnt in range(self.nr_rounds + 2)]
+
+        nr_slots = self.nr_slots
+        data = self.schedule.data
+        self.counts = [0] * (len(self.players) * nr_slots)
+        for offset in range(0, len(data), 2):
+            slot_idx = (offset // 2) % nr_slots
+            self.counts[data[offset] * nr_slots + slot_idx] += 1
+            self.counts[data[offset+1] * nr_slots + slot_idx] += 1
+
+        self.score_by_players: List[JustScore] = [
+                sum(self.penalties[sch_cnt] for sch_cnt in self.counts[pl_idx * nr_slots: (pl_idx + 1) * nr_slots])
+                for pl_idx in range(len(self.players))]
+        self.score: JustScore = sum(self.score_by_players)
+        self.history: List[Tuple[int, int, int]] = []
+
+    def slot_count(self, player_idx: int, slot_idx: int) -> int:
+        return self.counts[player_idx * self.nr_slots + slot_idx]
+
+    def _move_delta(self, player_idx: int, slot_from: int, slot_to: int) -> JustScore:
+        penalties, counts = self.penalties, self.counts
+        cnt_from = counts[player_idx * self.nr_slots + slot_from]
+        cnt_to = counts[player_idx * self.nr_slots + slot_to]
+        return (penalties[cnt_from - 1] - penalties[cnt_from]
+                + penalties[cnt_to + 1] - penalties[cnt_to])
+
+    def _move(self, player_idx: int, slot_from: int, slot_to: int):
+        delta = self._move_delta(player_idx, slot_from, slot_to)
+        self.counts[player_idx * self.nr_slots + slot_from] -= 1
+        self.counts[player_idx * self.nr_slots + slot_to] += 1
+        self.score_by_players[player_idx] += delta
+        return delta
+
+    def swap_delta(self, round_idx: int, slot_idx_1: int, slot_idx_2: int) -> JustScore:
+        " score change if pairs in slots would be swapped - nothing is changed "
+        if slot_idx_1 == slot_idx_2:
+            return 0
+        pl1, pl2 = self.schedule.pair_idxs(round_idx, slot_idx_1)
+        pl3, pl4 = self.schedule.pair_idxs(round_idx, slot_idx_2)
+        # all 4 players are different, so moves are independent
+        return (self._move_delta(pl1, slot_idx_1, slot_idx_2)
+                + self._move_delta(pl2, slot_idx_1, slot_idx_2)
+                + self._move_delta(pl3, slot_idx_2, slot_idx_1)
+                + self._move_delta(pl4, slot_idx_2, slot_idx_1))
+
+    def _swap(self, round_idx: int, slot_idx_1: int, slot_idx_2: int) -> JustScore:
+        if slot_idx_1 == slot_idx_2:
+            return 0
+        pl1, pl2 = self.schedule.pair_idxs(round_idx, slot_idx_1)
+        pl3, pl4 = self.schedule.pair_idxs(round_idx, slot_idx_2)
+        delta = (self._move(pl1, slot_idx_1, slot_idx_2)
+                 + self._move(pl2, slot_idx_1, slot_idx_2)
+                 + self._move(pl3, slot_idx_2, slot_idx_1)
+                 + self._move(pl4, slot_idx_2, slot_idx_1))
+        self.schedule.swap_slots(round_idx, slot_idx_1, slot_idx_2)
+        self.score += delta
+        return delta
+
+    def apply_swap(self, round_idx: int, slot_idx_1: int, slot_idx_2: int, record: bool = True) -> JustScore:
+        " swaps pairs in the schedule, returns score delta. record - False when undo() is not needed "
+        if record:
+            self.history.append((round_idx, slot_idx_1, slot_idx_2))
+        return self._swap(round_idx, slot_idx_1, slot_idx_2)
+
+    def undo(self) -> JustScore:
+        " reverts last apply_swap(), returns score delta "
+        return self._swap(*self.history.pop())
+
+    def copy(self) -> "IncrementalScore":
+        " independent copy of schedule and counts, history is not copied "
+        other = IncrementalScore.__new__(IncrementalScore)
+        other.schedule = self.schedule.copy()
+        other.players = other.schedule.players
+        other.nr_slots, other.nr_rounds = self.nr_slots, self.nr_rounds
+        other.penalties = self.penalties
+        other.counts = self.counts[:]
+        other.score_by_players = self.score_by_players[:]
+        other.score = self.score
+        other.history = []
+        return other
+
+    def get_score_by_players(self) -> Dict[PlayerName, JustScore]:
+        " same as score_by_players from get_just_score() "
+        return {pl: score for pl, score in zip(self.players, self.score_by_players)}
+
+
+def _penalties_table(nr_rounds: int) -> List[JustScore]:
+    return [slot_count_penalty(sch_cnt) for sch_cnt in range(nr_rounds + 1)]
+
+
+def batch_scores(candidates, nr_players: int) -> List[JustScore]:
+    """
+    candidates - (C, rounds, slots, 2) player indexes (numpy array or nested
+    sequences), returns list of C scores same as get_just_score()
+    """
+    if np is None:
+        return [_python_score(candidate, nr_players) for candidate in candidates]
+
+    candidates = np.asarray(candidates)
+    nr_candidates, nr_rounds, nr_slots, _ = candidates.shape
+    penalties = np.asarray(_penalties_table(nr_rounds))
+    size = nr_players * nr_slots
+    slots = np.arange(nr_slots, dtype=np.int64)[None, None, :, None]
+    chunk = max(1, BATCH_COUNTS_MAX // max(size, 1))
+
+    scores = np.empty(nr_candidates, dtype=penalties.dtype)
+    for c_from in range(0, nr_candidates, chunk):
+        c_to = min(c_from + chunk, nr_candidates)
+        cands = np.arange(c_to - c_from, dtype=np.int64)[:, None, None, None]
+        keys = cands * size + candidates[c_from:c_to].astype(np.int64) * nr_slots + slots
+        counts = np.bincount(keys.ravel(), minlength=(c_to - c_from) * size)
+        scores[c_from:c_to] = penalties[counts].reshape(c_to - c_from, size).sum(axis=1)
+    return scores.tolist()
+
+
+def batch_scores_permutations(base: ScheduleArray, permutations) -> List[JustScore]:
+    """
+    permutations - (C, rounds, slots) per-round slot permutations of base
+    schedule: permutations[c][r][s] is the slot in base round r whose pair
+    is moved to slot s. Returns list of C scores same as get_just_score()
+    """
+    if np is None:
+        return [_python_score(apply_permutation(base, permutation), len(base.players))
+                for permutation in permutations]
+
+    permutations = np.asarray(permutations, dtype=np.int64)
+    block = base.to_numpy()
+    rounds = np.arange(base.nr_rounds)[None, :, None]
+    return batch_scores(block[rounds, permutations], len(base.players))
+
+
+def apply_permutation(base: ScheduleArray, permutation: Sequence[Sequence[int]]) -> List[List[Tuple[int, int]]]:
+    " rounds of player indexes pairs with per-round slot permutation applied "
+    return [[base.pair_idxs(round_idx, slot_idx) for slot_idx in round_perm]
+            for round_idx, round_perm in enumerate(permutation)]
+
+
+def _python_score(candidate, nr_players: int) -> JustScore:
+    nr_rounds, nr_slots = len(candidate), len(candidate[0])
+    penalties = _penalties_table(nr_rounds)
+    counts = [0] * (nr_players * nr_slots)
+    for round_pairs in candidate:
+        for slot_idx, (pl1, pl2) in enumerate(round_pairs):
+            counts[pl1 * nr_slots + slot_idx] += 1
+            counts[pl2 * nr_slots + slot_idx] += 1
+    return sum(penalties[sch_cnt] for sch_cnt in counts)
+
+
+def diagonal_swap_slots(eq_types: Sequence[EqualizeType], nr_rounds: int, nr_slots: int) -> List[List[int]]:
+    """
+    per eq_type slot swapped with slot 0 in each round for offset_x 0, for
+    other offsets it is (slot + offset_x) % nr_slots - same as get_swap_idxs()
+    """
+    return [[idx_other % nr_slots for idx_other in get_swap_idxs(eq_type, nr_rounds=nr_rounds, nr_schedules=nr_slots)]
+            for eq_type in eq_types]
+
+
+def diagonal_scores(base, nr_players: int,
+                    eq_types: Sequence[EqualizeType] = DIAGONAL_EQ_TYPES) -> List[JustScore]:
+    """
+    base - (rounds, slots, 2) player indexes (numpy array or nested
+    sequences). Returns scores of all candidates ordered by eq_type, then
+    offset_x 0..slots-1 - same as SwapCandidateScorer.score() of
+    get_swap_idxs(eq_type, offset_x=offset_x).
+
+    Candidate changes only slot counts of players moved from / to slot 0,
+    and score is base score + penalty changes of those counts. offset_x
+    shifts swapped slot, so for slot swapped in round with offset 0 (t0):
+
+        - players from slot 0 go to (t0 + offset_x) % slots
+        - player from slot s goes to slot 0 for offset_x (s - t0) % slots
+
+    rounds with the same t0 hit the same counts, so changes are grouped
+    by (eq_type, player, slot, t0) - no candidate is built.
+    """
+    if np is None:
+        return _python_diagonal_scores(base, nr_players, eq_types)
+
+    base = np.asarray(base)
+    nr_rounds, nr_slots, _ = base.shape
+    if nr_slots == 1:
+        return [_python_score(base, nr_players)] * len(eq_types)
+    nr_types = len(eq_types)
+    # keys below are at most (eq_type, player, slot, t0)
+    dtype = np.int32 if nr_types * nr_players * nr_slots * nr_slots < 2**31 else np.int64
+    base = base.astype(dtype)
+    penalties = np.asarray([slot_count_penalty(sch_cnt) for sch_cnt in range(2 * nr_rounds + 2)])
+    slots = np.arange(nr_slots, dtype=dtype)
+    size = nr_players * nr_slots
+    type_offsets = np.arange(nr_types, dtype=dtype)[:, None] * size
+    swap_slots = np.asarray(diagonal_swap_slots(eq_types, nr_rounds, nr_slots), dtype=dtype)
+
+    counts = np.bincount((base * nr_slots + slots[None, :, None]).ravel(),
+                         minlength=size).reshape(nr_players, nr_slots)
+    base_score = penalties[counts].sum()
+    # (eq_type, player, t0) - players from slot 0
+    zero_players = base[:, 0, :].ravel()
+    zero_keys = type_offsets + zero_players * nr_slots + np.repeat(swap_slots, 2, axis=1)
+    zero_counts = np.bincount(zero_keys.ravel(), minlength=nr_types * size).reshape(nr_types, nr_players, nr_slots)
+
+    # (eq_type, player, offset_x) - players to slot 0, offset_x is (slot - t0) % nr_slots
+    rest_players = base[:, 1:, :].reshape(nr_rounds, -1)
+    rest_slots = np.repeat(slots[1:], 2)[None, :]
+    rest_t0 = swap_slots[:, :, None]
+    offsets = rest_slots - rest_t0
+    offsets += nr_slots * (offsets < 0)
+    rest_keys = (rest_players * nr_slots)[None]
+    to_zero = np.bincount((type_offsets[:, :, None] + rest_keys + offsets).ravel(),
+                          minlength=nr_types * size).reshape(nr_types, nr_players, nr_slots)
+
+    # slot 0 counts - (eq_type, offset_x, player)
+    from_zero = np.bincount(zero_players, minlength=nr_players)[None, None, :] \
+                - zero_counts[:, :, -slots % nr_slots].transpose(0, 2, 1)
+    counts_zero = counts[:, 0][None, None, :]
+    changes = (penalties[counts_zero - from_zero + to_zero.transpose(0, 2, 1)] - penalties[counts_zero]).sum(axis=2)
+
+    # slots 1.. - players from slot 0, as if nobody left these slots
+    type_idxs, player_idxs, t0s = np.nonzero(zero_counts)
+    counts_rest = counts[player_idxs, 1:]
+    moved = penalties[counts_rest + zero_counts[type_idxs, player_idxs, t0s][:, None]] - penalties[counts_rest]
+    moved_offsets = slots[None, 1:] - t0s[:, None]
+    moved_offsets += nr_slots * (moved_offsets < 0)
+    changes += np.bincount((type_idxs[:, None] * nr_slots + moved_offsets).ravel(), moved.ravel(),
+                           minlength=nr_types * nr_slots).reshape(nr_types, nr_slots).astype(changes.dtype)
+
+    # slots 1.. - players to slot 0. More rounds with the same t0 change the
+    # same count - sorted by (eq_type, player, slot, t0), n-th of them changes
+    # it from count - n + 1 to count - n. Offset and count are in low bits.
+    count_bits = (2 * nr_rounds + 1).bit_length()
+    payload_bits = (nr_types * nr_slots).bit_length() + count_bits
+    count = counts.ravel()[rest_keys + rest_slots] + zero_counts.ravel()[type_offsets[:, :, None] + rest_keys + rest_t0]
+    payload = ((np.arange(nr_types)[:, None, None] * nr_slots + offsets) << count_bits) + count
+    keys = ((((type_offsets[:, :, None] + rest_keys + rest_slots).astype(np.int64) * nr_slots + rest_t0)
+             << payload_bits) + payload).ravel()
+    keys.sort()
+    groups = keys >> payload_bits
+    starts = np.concatenate(([True], groups[1:] != groups[:-1]))
+    positions = np.arange(len(keys))
+    nr_before = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+    count = (keys & ((1 << count_bits) - 1)) - nr_before
+    changes += np.bincount((keys & ((1 << payload_bits) - 1)) >> count_bits,
+                           penalties[count - 1] - penalties[count],
+                           minlength=nr_types * nr_slots).reshape(nr_types, nr_slots).astype(changes.dtype)
+    return (base_score + changes).ravel().tolist()
+
+
+def _python_diagonal_scores(base, nr_players: int, eq_types: Sequence[EqualizeType]) -> List[JustScore]:
+    nr_rounds, nr_slots = len(base), len(base[0])
+    penalties = _penalties_table(nr_rounds)
+    scores = []
+    for swap_slots in diagonal_swap_slots(eq_types, nr_rounds, nr_slots):
+        for offset_x in range(nr_slots):
+            counts = [0] * (nr_players * nr_slots)
+            for round_pairs, idx_other in zip(base, swap_slots):
+                idx_other = (idx_other + offset_x) % nr_slots
+                for slot_idx, (pl1, pl2) in enumerate(round_pairs):
+                    if slot_idx == 0:
+                        slot_idx = idx_other
+                    elif slot_idx == idx_other:
+                        slot_idx = 0
+                    counts[pl1 * nr_slots + slot_idx] += 1
+                    counts[pl2 * nr_slots + slot_idx] += 1
+            scores.append(sum(penalties[sch_cnt] for sch_cnt in counts))
+    return scores
@@ -0,0 +1,272 @@
+"""
+Precomputed schedules store
+---------------------------
+Single binary file with precomputed tables for a range of number of players,
+opened via mmap. Loading of a table for any number of players is zero-copy
+(ScheduleArray over read-only memoryview of the file), no generation and no
+parsing of the whole file is needed - only the small offset index is read.
+
+File layout (header and index little-endian, data in native byte order
+recorded in the header):
+
+    header: magic "RRPS", version, byte order, nr. of entries
+    index:  per entry - variant, typecode, nr. of players, rounds, slots, offset
+    data:   per entry - rounds x slots x 2 player indexes, 8 bytes aligned
+
+Players in stored tables are indexes 0..n-1, BYE (odd number of players) is
+index n.
+
+Build with:
+
+    python -m round_robin_pairs.store build tables.rrps --from 3 --to 500
+
+and read with:
+
+    with ScheduleStore("tables.rrps") as store:
+        schedule = store.get(14, StoreVariant.BERGER_IDEAL, players=players)
+"""
+from typing import List, Optional, Dict, Tuple, Iterable
+from array import array
+from dataclasses import dataclass
+import argparse
+import enum
+import mmap
+import struct
+import sys
+import weakref
+
+from .base import (
+        PlayerName, BYE, has_ideal, berger_tables, find_best_equalize_solution,
+        )
+from .schedule_array import ScheduleArray, berger_array, circle_array, get_typecode, np
+
+MAGIC = b"RRPS"
+VERSION = 1
+HEADER = struct.Struct("<4sHBxI")
+INDEX_ENTRY = struct.Struct("<Bc2xIIIQ")
+ALIGN = 8
+BYTE_ORDERS = ("little", "big")
+
+# find_best_equalize_solution() is O(n^3) - limit for default builds
+BEST_MAX_PLAYERS = 60
+
+
+class StoreVariant(str, enum.Enum):
+    BERGER = "BERGER"
+    CIRCLE = "CIRCLE"
+    # only for even number of players which has ideal
+    BERGER_IDEAL = "BERGER_IDEAL"
+    # find_best_equalize_solution() without random search
+    BERGER_BEST = "BERGER_BEST"
+
+    @classmethod
+    def values(cls):
+        return [k for k,v in StoreVariant.__members__.items()]
+
+    @property
+    def code(self) -> int:
+        return StoreVariant.values().index(self.value)
+
+
+@dataclass
+class StoreEntry:
+    variant: StoreVariant
+    nr_players: int
+    nr_rounds: int
+    nr_slots: int
+    typecode: str
+    offset: int
+
+    @property
+    def size(self) -> int:
+        return self.nr_rounds * self.nr_slots * 2
+
+
+def store_players(nr_players: int) -> List[PlayerName]:
+    " labels of stored tables - 0..n-1 and BYE "
+    players: List[PlayerName] = list(range(nr_players))
+    if nr_players % 2 == 1:
+        players.append(BYE)
+    return players
+
+
+def _to_store_data(schedule: ScheduleArray, nr_players: int) -> array:
+    labels = store_players(nr_players)
+    if schedule.players == labels:
+        return schedule.data
+    label_idxs = {pl: idx for idx, pl in enumerate(labels)}
+    remap = [label_idxs[pl] for pl in schedule.players]
+    typecode = get_typecode(len(labels))
+    if np is not None:
+        src = schedule.to_numpy().ravel()
+        out = array(typecode, [0]) * len(src)
+        np.frombuffer(out, dtype=src.dtype)[:] = np.asarray(remap, dtype=src.dtype)[src]
+        return out
+    return array(typecode, [remap[idx] for idx in schedule.data])
+
+
+def build_variant(variant: StoreVariant, nr_players: int) -> Optional[ScheduleArray]:
+    " None when variant is not available for the number of players "
+    variant = StoreVariant(variant)
+    players = list(range(nr_players))
+    if variant == StoreVariant.BERGER:
+        return berger_array(players)
+    if variant == StoreVariant.CIRCLE:
+        return circle_array(players)
+    if variant == StoreVariant.BERGER_IDEAL:
+        if nr_players % 2 == 1 or not has_ideal(nr_players):
+            return None
+        return ScheduleArray.from_rounds(berger_tables(players, ideal=True), players=store_players(nr_players))
+    if variant == StoreVariant.BERGER_BEST:
+        labels = store_players(nr_players)
+        rounds = berger_tables(players)
+        best_result = find_best_equalize_solution(rounds, players=labels, brute_force_factor=None)
+        return ScheduleArray.from_rounds(best_result.best_rounds, players=labels)
+    raise ValueError(f"Unknown variant {variant}. Select one of: {', '.join(StoreVariant.values())}")
+
+
+def build_store(path: str, nr_players_from: int, nr_players_to: int,
+                variants: Iterable[StoreVariant] = (StoreVariant.BERGER, StoreVariant.CIRCLE, StoreVariant.BERGER_IDEAL),
+                best_max_players: int = BEST_MAX_PLAYERS,
+                verbose: bool = False) -> List[StoreEntry]:
+    assert 0 < nr_players_from <= nr_players_to
+    variants = [StoreVariant(variant) for variant in variants]
+    keys = [(variant, nr_players) for nr_players in range(nr_players_from, nr_players_to+1)
+                                  for variant in variants
+                                  if variant != StoreVariant.BERGER_BEST or nr_players <= best_max_players]
+
+    entries: List[StoreEntry] = []
+    with open(path, "wb") as fout:
+        # index is written at the end, when offsets are known
+        offset = HEADER.size + INDEX_ENTRY.size * len(keys)
+        fout.write(b"\0" * offset)
+        for variant, nr_players in keys:
+            schedule = build_variant(variant, nr_players)
+            if schedule is None:
+                continue
+            data = _to_store_data(schedule, nr_players)
+            padding = -offset % ALIGN
+            fout.write(b"\0" * padding)
+            offset += padding
+            entries.append(StoreEntry(variant=variant, nr_players=nr_players,
+                                      nr_rounds=schedule.nr_rounds, nr_slots=schedule.nr_slots,
+                                      typecode=data.typecode, offset=offset))
+            fout.write(data.tobytes())
+            offset += len(data) * data.itemsize
+            if verbose:
+                print(f"{variant.value:<12} {nr_players:>5} -> {offset:>12}")
+
+        fout.seek(0)
+        fout.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDERS.index(sys.byteorder), len(entries)))
+        for entry in entries:
+            fout.write(INDEX_ENTRY.pack(entry.variant.code, entry.typecode.encode("ascii"),
+                                        entry.nr_players, entry.nr_rounds, entry.nr_slots, entry.offset))
+    return entries
+
+
+class ScheduleStore:
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fin:
+            self.mmap = mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.mmap)
+        # returned by get() and still alive (by id), see close()
+        self.schedules: "weakref.WeakValueDictionary[int, ScheduleArray]" = weakref.WeakValueDictionary()
+
+        magic, version, byte_order, nr_entries = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"File {path} is not schedules store")
+        if version != VERSION:
+            raise ValueError(f"Store version {version} not supported, expected {VERSION}")
+        if BYTE_ORDERS[byte_order] != sys.byteorder:
+            raise ValueError(f"Store byte order is {BYTE_ORDERS[byte_order]}, rebuild it on this machine")
+
+        variants = StoreVariant.values()
+        self.entries: Dict[Tuple[StoreVariant, int], StoreEntry] = {}
+        for code, typecode, nr_players, nr_rounds, nr_slots, offset in \
+                INDEX_ENTRY.iter_unpack(self.mmap[HEADER.size: HEADER.size + INDEX_ENTRY.size * nr_entries]):
+            variant = StoreVariant(variants[code])
+            self.entries[(variant, nr_players)] = StoreEntry(
+                    variant=variant, nr_players=nr_players, nr_rounds=nr_rounds,
+                    nr_slots=nr_slots, typecode=typecode.decode("ascii"), offset=offset)
+
+    def get(self, nr_players: int, variant: StoreVariant = StoreVariant.BERGER,
+            players: Optional[List[PlayerName]] = None) -> ScheduleArray:
+        " zero-copy read-only schedule, players are labels 0..n-1 (+ BYE) if not given "
+        if self.mmap is None:
+            raise ValueError(f"Store {self.path} is closed")
+        variant = StoreVariant(variant)
+        entry = self.entries.get((variant, nr_players))
+        if entry is None:
+            raise KeyError(f"Variant {variant.value} for {nr_players} players not in store {self.path}")
+        if players is None:
+            players = store_players(nr_players)
+        else:
+            if len(players) != nr_players:
+                raise ValueError(f"Expected {nr_players} players, got {len(players)}")
+            players = list(players)
+            if nr_players % 2 == 1:
+                players.append(BYE)
+        itemsize = array(entry.typecode).itemsize
+        data = self.buffer[entry.offset: entry.offset + entry.size * itemsize].cast(entry.typecode)
+        schedule = ScheduleArray(players, entry.nr_rounds, entry.nr_slots, data)
+        self.schedules[id(schedule)] = schedule
+        return schedule
+
+    def __contains__(self, key: Tuple[StoreVariant, int]) -> bool:
+        variant, nr_players = key
+        return (StoreVariant(variant), nr_players) in self.entries
+
+    def close(self):
+        """
+        schedules returned by get() which are still alive get own copy of
+        data (no longer read-only), so mmap can be closed. Other views of
+        store data (e.g. slices, numpy arrays) must be released before,
+        otherwise BufferError is raised.
+        """
+        if self.mmap is None:
+            return
+        for schedule in list(self.schedules.values()):
+            if isinstance(schedule.data, memoryview):
+                data = array(schedule.typecode, schedule.data.tobytes())
+                schedule.data.release()
+                schedule.data = data
+        self.schedules.clear()
+        self.buffer.release()
+        try:
+            self.mmap.close()
+        except BufferError:
+            raise BufferError(f"Store {self.path} can not be closed, views of its data are still used")
+        self.mmap = None
+
+    def __enter__(self) -> "ScheduleStore":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m round_robin_pairs.store",
+                                     description="Precomputed schedules store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="build store file")
+    build_parser.add_argument("path")
+    build_parser.add_argument("--from", dest="nr_players_from", type=int, default=3)
+    build_parser.add_argument("--to", dest="nr_players_to", type=int, default=100)
+    build_parser.add_argument("--variants", nargs="+", choices=StoreVariant.values(),
+                              default=[StoreVariant.BERGER.value, StoreVariant.CIRCLE.value, StoreVariant.BERGER_IDEAL.value])
+    build_parser.add_argument("--best-max-players", type=int, default=BEST_MAX_PLAYERS)
+    build_parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        entries = build_store(args.path, args.nr_players_from, args.nr_players_to,
+                              variants=args.variants, best_max_players=args.best_max_players,
+                              verbose=args.verbose)
+        print(f"{args.path}: {len(entries)} tables")
+
+
+if __name__=="__main__":
+    main()
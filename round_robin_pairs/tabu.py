@@ -0,0 +1,271 @@
+"""
+Tabu / beam search optimizer
+----------------------------
+Directed search from ANALYSIS in doc/todo.txt - moves start from players
+with the most unjust schedules (highest per-player penalty). Pair of such
+player is moved in a round from slot the player plays too often to slot it
+plays too rarely. Pair displaced by that swap can be moved on in the same
+round (chain of 2 swaps - 3 pairs change slots).
+
+Search keeps beam_width branches. In each iteration directed moves of all
+branches are scored (O(1) per swap, IncrementalScore) and the best
+beam_width are applied, even when score gets worse. Pair can not return to
+the slot it left in the round for tabu_tenure iterations (unless it gives
+new best score), so search does not cycle.
+
+    best_result = tabu_schedule(round_robin_rounds, players, time_budget=1.0, seed=1)
+
+Benchmark against random search of find_best_equalize_solution() (BRUTE_FORCE)
+in the same time:
+
+    python -m round_robin_pairs.tabu --players 16 22 28 --brute-force-factor 100
+"""
+from typing import List, Optional, Dict, Tuple
+import argparse
+import random
+import time
+
+from .base import (
+        PlayerName, RoundRobnRounds, JustScore, BestResult, EqualizeType,
+        get_score_lower_bound, berger_tables, find_best_equalize_solution,
+        )
+from .scoring import IncrementalScore
+
+BEAM_WIDTH = 4
+TABU_TENURE = 10
+# number of the most unjust players moves start from
+DIRECTED_PLAYERS = 8
+# max. number of rounds and slots (random) tried for one player / displaced pair
+DIRECTED_SAMPLE = 4
+
+# (round_idx, slot_from, slot_to) - applied one after another
+Swap = Tuple[int, int, int]
+
+
+class _Branch:
+    " one schedule in the beam - scorer, slot of every player in every round and tabu list "
+
+    def __init__(self, scorer: IncrementalScore, positions: List[int], tabu: Dict[int, int]):
+        self.scorer = scorer
+        # index: round_idx * nr_players + player_idx
+        self.positions = positions
+        # tabu key -> iteration until it is tabu, see tabu_key()
+        self.tabu = tabu
+
+    @classmethod
+    def from_scorer(cls, scorer: IncrementalScore) -> "_Branch":
+        nr_players = len(scorer.players)
+        positions = [0] * (scorer.nr_rounds * nr_players)
+        for round_idx in range(scorer.nr_rounds):
+            for slot_idx in range(scorer.nr_slots):
+                pl1, pl2 = scorer.schedule.pair_idxs(round_idx, slot_idx)
+                positions[round_idx * nr_players + pl1] = slot_idx
+                positions[round_idx * nr_players + pl2] = slot_idx
+        return cls(scorer, positions, {})
+
+    def copy(self, iteration: int) -> "_Branch":
+        return _Branch(self.scorer.copy(), self.positions[:],
+                       {key: until for key, until in self.tabu.items() if until > iteration})
+
+    def tabu_key(self, round_idx: int, slot_from: int, slot_to: int) -> int:
+        " pair in slot_from is moving to slot_to - pair is identified by its first player "
+        scorer = self.scorer
+        pl1, _ = scorer.schedule.pair_idxs(round_idx, slot_from)
+        return ((round_idx * len(scorer.players) + pl1) * scorer.nr_slots) + slot_to
+
+    def is_tabu(self, swaps: List[Swap], iteration: int) -> bool:
+        round_idx, slot_idx_1, slot_idx_2 = swaps[0]
+        # final slots: pair from 1 -> 2, from 2 -> 1 (or to 3 for chain), from 3 -> 1
+        moves = [(slot_idx_1, slot_idx_2)]
+        if len(swaps) == 1:
+            moves.append((slot_idx_2, slot_idx_1))
+        else:
+            slot_idx_3 = swaps[1][2]
+            moves.extend([(slot_idx_2, slot_idx_3), (slot_idx_3, slot_idx_1)])
+        tabu = self.tabu
+        return any(tabu.get(self.tabu_key(round_idx, slot_from, slot_to), 0) > iteration
+                   for slot_from, slot_to in moves)
+
+    def apply(self, swaps: List[Swap], tabu_until: int):
+        scorer, positions = self.scorer, self.positions
+        nr_players = len(scorer.players)
+        for round_idx, slot_idx_1, slot_idx_2 in swaps:
+            # pairs can not return to slots they leave
+            self.tabu[self.tabu_key(round_idx, slot_idx_1, slot_idx_1)] = tabu_until
+            self.tabu[self.tabu_key(round_idx, slot_idx_2, slot_idx_2)] = tabu_until
+            scorer.apply_swap(round_idx, slot_idx_1, slot_idx_2, record=False)
+            for slot_idx in (slot_idx_1, slot_idx_2):
+                pl1, pl2 = scorer.schedule.pair_idxs(round_idx, slot_idx)
+                positions[round_idx * nr_players + pl1] = slot_idx
+                positions[round_idx * nr_players + pl2] = slot_idx
+
+    def directed_moves(self, rnd: random.Random, directed_players: int) -> List[Tuple[JustScore, List[Swap]]]:
+        " (score delta, swaps) - from the most unjust players "
+        scorer, positions = self.scorer, self.positions
+        nr_rounds, nr_slots = scorer.nr_rounds, scorer.nr_slots
+        nr_players = len(scorer.players)
+        counts, score_by_players = scorer.counts, scorer.score_by_players
+
+        # per player ideal is 1 - one slot once, other slots twice
+        unjust = [pl for pl in range(nr_players) if score_by_players[pl] > 1]
+        unjust.sort(key=lambda pl: (-score_by_players[pl], rnd.random()))
+
+        def sample(items: List[int]) -> List[int]:
+            return items if len(items) <= DIRECTED_SAMPLE else rnd.sample(items, DIRECTED_SAMPLE)
+
+        moves = []
+        for player_idx in unjust[:directed_players]:
+            pl_counts = counts[player_idx * nr_slots: (player_idx + 1) * nr_slots]
+            max_count = max(pl_counts)
+            slots_to = [slot_idx for slot_idx, sch_cnt in enumerate(pl_counts) if sch_cnt < 2]
+            if not slots_to or max_count < 2:
+                continue
+            rounds = [round_idx for round_idx in range(nr_rounds)
+                      if pl_counts[positions[round_idx * nr_players + player_idx]] == max_count]
+            for round_idx in sample(rounds):
+                slot_from = positions[round_idx * nr_players + player_idx]
+                for slot_to in sample(slots_to):
+                    swap_1 = (round_idx, slot_from, slot_to)
+                    delta_1 = scorer.swap_delta(*swap_1)
+                    moves.append((delta_1, [swap_1]))
+
+                    # chain - pair from slot_to (now in slot_from) moves on to its rare slot
+                    scorer.apply_swap(*swap_1)
+                    pl3, pl4 = scorer.schedule.pair_idxs(round_idx, slot_from)
+                    slots_next = [slot_next for slot_next in range(nr_slots)
+                                  if slot_next != slot_from and slot_next != slot_to
+                                  and (counts[pl3 * nr_slots + slot_next] < 2 or counts[pl4 * nr_slots + slot_next] < 2)]
+                    for slot_next in sample(slots_next):
+                        swap_2 = (round_idx, slot_from, slot_next)
+                        moves.append((delta_1 + scorer.swap_delta(*swap_2), [swap_1, swap_2]))
+                    scorer.undo()
+        return moves
+
+
+def tabu_schedule(
+        round_robin_rounds: RoundRobnRounds,
+        players: List[PlayerName],
+        max_iterations: Optional[int] = 2000,
+        time_budget: Optional[float] = None,
+        beam_width: int = BEAM_WIDTH,
+        tabu_tenure: int = TABU_TENURE,
+        directed_players: int = DIRECTED_PLAYERS,
+        seed: Optional[int] = None,
+        target_score: Optional[JustScore] = None,
+        verbose: bool = False) -> BestResult:
+    """
+    max_iterations and/or time_budget (seconds) - at least one is required,
+    when both are given the first one reached stops the search. Stops as
+    well when score reaches target_score or lower bound (ideal).
+    """
+    if not max_iterations and not time_budget:
+        raise ValueError("Provide max_iterations and/or time_budget")
+    assert beam_width > 0 and tabu_tenure >= 0
+
+    rnd = random.Random(seed)
+    scorer = IncrementalScore(round_robin_rounds, players=players)
+    nr_rounds, nr_slots = scorer.nr_rounds, scorer.nr_slots
+    beam = [_Branch.from_scorer(scorer)]
+
+    best_result = BestResult(players=players)
+    best_result.score_before = scorer.score
+    best_result.best_score = scorer.score
+    best_result.best_eq_type = EqualizeType.TABU
+    best_result.best_offset_x = 0
+    best_data = scorer.schedule.data[:]
+
+    stop_score = get_score_lower_bound(len(players))
+    if target_score is not None:
+        stop_score = max(stop_score, target_score)
+
+    time_start = time.perf_counter()
+    iteration = 0
+    while nr_slots > 1 and best_result.best_score > stop_score:
+        if (max_iterations and iteration >= max_iterations) \
+                or (time_budget and time.perf_counter() - time_start > time_budget):
+            break
+        iteration += 1
+
+        candidates = []
+        for branch_idx, branch in enumerate(beam):
+            score = branch.scorer.score
+            for delta, swaps in branch.directed_moves(rnd, directed_players):
+                candidates.append((score + delta, rnd.random(), branch_idx, swaps))
+        candidates.sort(key=lambda candidate: candidate[:2])
+
+        selected = []
+        for score, _, branch_idx, swaps in candidates:
+            # aspiration - tabu move is allowed when it gives new best score
+            if score < best_result.best_score or not beam[branch_idx].is_tabu(swaps, iteration):
+                selected.append((branch_idx, swaps))
+                if len(selected) == beam_width:
+                    break
+        if not selected:
+            # all moves tabu - random kick
+            round_idx = rnd.randrange(nr_rounds)
+            slot_idx_1, slot_idx_2 = rnd.sample(range(nr_slots), 2)
+            selected = [(rnd.randrange(len(beam)), [(round_idx, slot_idx_1, slot_idx_2)])]
+
+        # copies are made before parents are changed, first child of a parent reuses it
+        children, used = [], set()
+        for branch_idx, swaps in selected:
+            children.append((beam[branch_idx].copy(iteration) if branch_idx in used else beam[branch_idx], swaps))
+            used.add(branch_idx)
+        beam = []
+        for branch, swaps in children:
+            branch.apply(swaps, tabu_until=iteration + tabu_tenure)
+            beam.append(branch)
+            if branch.scorer.score < best_result.best_score:
+                best_result.best_score = branch.scorer.score
+                best_data = branch.scorer.schedule.data[:]
+                if verbose:
+                    print(f"-- TABU: it={iteration:>6}, beam={len(beam)}, score={branch.scorer.score}")
+
+    scorer.schedule.data = best_data
+    best_result.best_rounds = scorer.schedule.to_rounds()
+    if verbose:
+        print(f"-- TABU: done after {iteration} iterations, {time.perf_counter() - time_start:.2f}s: {best_result}")
+    return best_result
+
+
+def benchmark(nr_players_list: List[int], brute_force_factor: int = 100,
+              seed: int = 1, verbose: bool = False) -> List[Tuple[int, JustScore, JustScore, float]]:
+    """
+    random search (BRUTE_FORCE) of find_best_equalize_solution() vs tabu
+    search with the same time - returns (nr. players, random score, tabu
+    score, seconds) for each number of players
+    """
+    results = []
+    for nr_players in nr_players_list:
+        players = [str(pl) for pl in range(1, nr_players + 1)]
+        round_robin_rounds = berger_tables(players)
+
+        time_start = time.perf_counter()
+        random_result = find_best_equalize_solution(round_robin_rounds, players,
+                                                    brute_force_factor=brute_force_factor,
+                                                    stop_on_ideal=True, seed=seed)
+        elapsed = time.perf_counter() - time_start
+
+        tabu_result = tabu_schedule(round_robin_rounds, players, max_iterations=None,
+                                    time_budget=elapsed, seed=seed)
+        results.append((len(players), random_result.best_score, tabu_result.best_score, elapsed))
+        if verbose:
+            print(f"{len(players):>5} {random_result.best_score:>8} {tabu_result.best_score:>8} "
+                  f"{random_result.score_ideal:>8} {elapsed:>8.2f}s")
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m round_robin_pairs.tabu",
+                                     description="Tabu search vs random search benchmark")
+    parser.add_argument("--players", type=int, nargs="+", default=[10, 16, 22, 28, 40])
+    parser.add_argument("--brute-force-factor", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    print(f"{'players':>5} {'random':>8} {'tabu':>8} {'ideal':>8} {'time':>9}")
+    benchmark(args.players, brute_force_factor=args.brute_force_factor, seed=args.seed, verbose=True)
+
+
+if __name__=="__main__":
+    main()
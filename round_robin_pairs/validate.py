@@ -0,0 +1,218 @@
+"""
+Schedule validator
+------------------
+Checks that schedule is complete round-robin:
+
+    - number of players (with BYE for odd number of players) is even,
+      there are n-1 rounds and each round has n/2 pairs
+    - only known players, BYE only for odd number of players
+    - nobody plays with himself
+    - each player plays at most once per round
+    - every pair plays exactly once (n*(n-1)/2 pairs without duplicates,
+      so none is missing)
+
+Players are interned to ints, rounds of names are translated once.
+ScheduleArray (or numpy (rounds, slots, 2) block of player indexes) is
+checked without translation. With numpy (from NUMPY_MIN_PLAYERS players)
+pairs are marked in upper triangular boolean matrix (flat, n*(n-1)/2) and
+sorted players of each round are compared with 0..n-1 - few array
+operations, 5000 players in ~0.2s. Without numpy the triangular matrix is
+packed bit set (bytearray).
+
+First violation (in schedule order) is reported:
+
+    violation = find_violation(round_robin_rounds, players)
+    validate_schedule(round_robin_rounds, players)   # raises ValueError
+"""
+from typing import List, Optional
+from dataclasses import dataclass
+import enum
+
+from .base import PlayerName, BYE, PlayerTable
+from .schedule_array import ScheduleArray, np, NUMPY_MIN_PLAYERS
+
+
+class ViolationKind(str, enum.Enum):
+    PLAYERS = "PLAYERS"
+    SHAPE = "SHAPE"
+    SAME_PLAYER = "SAME_PLAYER"
+    TWICE_IN_ROUND = "TWICE_IN_ROUND"
+    DUPLICATE_PAIR = "DUPLICATE_PAIR"
+
+
+@dataclass
+class Violation:
+    kind: ViolationKind
+    message: str
+    round_idx: Optional[int] = None
+    slot_idx: Optional[int] = None
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def _pair_index(pl1: int, pl2: int, nr_players: int) -> int:
+    " index in upper triangular matrix (without diagonal), pl1 < pl2 "
+    return pl1 * (2 * nr_players - pl1 - 1) // 2 + pl2 - pl1 - 1
+
+
+def find_violation(round_robin_rounds, players: Optional[List[PlayerName]] = None) -> Optional[Violation]:
+    """
+    round_robin_rounds - rounds of pairs of names or ScheduleArray.
+    players - if not given detected from rounds, BYE is added for odd
+    number. Returns None when schedule is valid.
+    """
+    if isinstance(round_robin_rounds, ScheduleArray):
+        table = PlayerTable(round_robin_rounds.players)
+        if players is not None:
+            violation = _check_players(table, players)
+            if violation:
+                return violation
+        return _find_violation_idxs(round_robin_rounds, table)
+
+    try:
+        table = PlayerTable.from_rounds(round_robin_rounds, players=_with_bye(players) if players else None)
+    except Exception as ex:
+        return Violation(ViolationKind.PLAYERS, str(ex))
+    nr_slots = len(table) // 2
+    for round_idx, round_pairs in enumerate(round_robin_rounds):
+        if len(round_pairs) != nr_slots:
+            return Violation(ViolationKind.SHAPE, f"Round {round_idx + 1} has {len(round_pairs)} pairs, expected {nr_slots}",
+                             round_idx=round_idx)
+    schedule = ScheduleArray.from_indexes(table.players, table.intern_rounds(round_robin_rounds)) \
+                    if round_robin_rounds else ScheduleArray(table.players, 0, nr_slots)
+    return _find_violation_idxs(schedule, table)
+
+
+def validate_schedule(round_robin_rounds, players: Optional[List[PlayerName]] = None):
+    " raises ValueError with the first violation "
+    violation = find_violation(round_robin_rounds, players=players)
+    if violation:
+        raise ValueError(f"Invalid schedule: {violation}")
+
+
+def _with_bye(players: List[PlayerName]) -> List[PlayerName]:
+    players = list(players)
+    if len(players) % 2 == 1 and BYE not in players:
+        players.append(BYE)
+    return players
+
+
+def _check_players(table: PlayerTable, players: List[PlayerName]) -> Optional[Violation]:
+    players = _with_bye(players)
+    if set(players) != set(table.players):
+        return Violation(ViolationKind.PLAYERS, f"Schedule players differ from given players: "
+                                                f"{set(table.players) - set(players)} / {set(players) - set(table.players)}")
+    return None
+
+
+def _find_violation_idxs(schedule: ScheduleArray, table: PlayerTable) -> Optional[Violation]:
+    nr_players = len(table)
+    if BYE in table and (nr_players - 1) % 2 == 0:
+        return Violation(ViolationKind.PLAYERS, f"BYE with even number of players {nr_players - 1}")
+    if nr_players % 2 == 1:
+        return Violation(ViolationKind.PLAYERS, f"Odd number of players {nr_players}, BYE is missing")
+    if schedule.nr_rounds != nr_players - 1 or schedule.nr_slots != nr_players // 2:
+        return Violation(ViolationKind.SHAPE, f"Expected {nr_players - 1} rounds x {nr_players // 2} pairs, "
+                                              f"got {schedule.nr_rounds} x {schedule.nr_slots}")
+    if np is not None and nr_players >= NUMPY_MIN_PLAYERS:
+        return _find_violation_numpy(schedule, table)
+    return _find_violation_python(schedule, table)
+
+
+def _range_violation(nr_players: int) -> Violation:
+    return Violation(ViolationKind.PLAYERS, f"Player indexes out of range 0..{nr_players - 1}")
+
+
+def _pair_violation(kind: ViolationKind, schedule: ScheduleArray, table: PlayerTable,
+                    round_idx: int, slot_idx: int, player_idx: Optional[int] = None) -> Violation:
+    pl1, pl2 = (table.name(pl) for pl in schedule.pair_idxs(round_idx, slot_idx))
+    where = f"round {round_idx + 1}, slot {slot_idx + 1}"
+    if kind == ViolationKind.SAME_PLAYER:
+        message = f"Player {pl1} plays with himself in {where}"
+    elif kind == ViolationKind.TWICE_IN_ROUND:
+        message = f"Player {table.name(player_idx)} plays twice in {where}"
+    else:
+        message = f"Pair {pl1}-{pl2} plays again in {where}"
+    return Violation(kind, message, round_idx=round_idx, slot_idx=slot_idx)
+
+
+def _find_violation_python(schedule: ScheduleArray, table: PlayerTable) -> Optional[Violation]:
+    nr_players, nr_slots, data = len(table), schedule.nr_slots, schedule.data
+    if len(data) and (min(data) < 0 or max(data) >= nr_players):
+        return _range_violation(nr_players)
+    # packed upper triangular bit matrix
+    pairs_seen = bytearray((nr_players * (nr_players - 1) // 2 + 7) // 8)
+    # round in which player was last seen
+    player_rounds = [-1] * nr_players
+    for round_idx in range(schedule.nr_rounds):
+        for slot_idx in range(nr_slots):
+            offset = (round_idx * nr_slots + slot_idx) * 2
+            pl1, pl2 = data[offset], data[offset + 1]
+            if pl1 == pl2:
+                return _pair_violation(ViolationKind.SAME_PLAYER, schedule, table, round_idx, slot_idx)
+            for player_idx in (pl1, pl2):
+                if player_rounds[player_idx] == round_idx:
+                    return _pair_violation(ViolationKind.TWICE_IN_ROUND, schedule, table, round_idx, slot_idx, player_idx)
+                player_rounds[player_idx] = round_idx
+            pair_idx = _pair_index(min(pl1, pl2), max(pl1, pl2), nr_players)
+            mask = 1 << (pair_idx & 7)
+            if pairs_seen[pair_idx >> 3] & mask:
+                return _pair_violation(ViolationKind.DUPLICATE_PAIR, schedule, table, round_idx, slot_idx)
+            pairs_seen[pair_idx >> 3] |= mask
+    return None
+
+
+def _find_violation_numpy(schedule: ScheduleArray, table: PlayerTable) -> Optional[Violation]:
+    nr_players, nr_rounds, nr_slots = len(table), schedule.nr_rounds, schedule.nr_slots
+    if nr_rounds == 0:
+        return None
+    block = schedule.to_numpy()
+    if block.min() < 0 or block.max() >= nr_players:
+        return _range_violation(nr_players)
+    dtype = np.int32 if nr_players * nr_players < 2**31 else np.int64
+    pl1, pl2 = block[:, :, 0], block[:, :, 1]
+
+    # first violation of each kind as position round_idx * nr_slots + slot_idx, min is reported
+    positions = {}
+    same = (pl1 == pl2).ravel()
+    if same.any():
+        positions[ViolationKind.SAME_PLAYER] = int(np.argmax(same))
+
+    # n/2 pairs per round - sorted players of a round are 0..n-1 <=> nobody twice
+    full_rounds = (np.sort(block.reshape(nr_rounds, nr_players), axis=1)
+                   == np.arange(nr_players, dtype=block.dtype)).all(axis=1)
+    twice_player = None
+    if not full_rounds.all():
+        round_idx = int(np.argmin(full_rounds))
+        round_players = set()
+        for slot_idx in range(nr_slots):
+            for player_idx in schedule.pair_idxs(round_idx, slot_idx):
+                if player_idx in round_players and twice_player is None:
+                    positions[ViolationKind.TWICE_IN_ROUND] = round_idx * nr_slots + slot_idx
+                    twice_player = player_idx
+                round_players.add(player_idx)
+
+    low, high = np.minimum(pl1, pl2).ravel().astype(dtype), np.maximum(pl1, pl2).ravel().astype(dtype)
+    # _pair_index(), low * (2n - low - 1) is even
+    pair_idxs = ((low * (2 * nr_players - 1 - low)) >> 1) + high - low - 1
+    pair_idxs[low == high] = 0
+    nr_pairs = nr_players * (nr_players - 1) // 2
+    pairs_seen = np.zeros(nr_pairs, dtype=bool)
+    pairs_seen[pair_idxs] = True
+    # n*(n-1)/2 pairs - all seen <=> no duplicates
+    if not pairs_seen.all():
+        valid = low != high
+        _, first = np.unique(pair_idxs[valid], return_index=True)
+        repeated = np.ones(int(valid.sum()), dtype=bool)
+        repeated[first] = False
+        if repeated.any():
+            positions[ViolationKind.DUPLICATE_PAIR] = int(np.flatnonzero(valid)[np.argmax(repeated)])
+
+    if not positions:
+        return None
+    # same position - order of ViolationKind
+    kinds = list(ViolationKind)
+    kind = min(positions, key=lambda kind: (positions[kind], kinds.index(kind)))
+    round_idx, slot_idx = divmod(positions[kind], nr_slots)
+    return _pair_violation(kind, schedule, table, round_idx, slot_idx, twice_player)
@@ -19,8 +19,12 @@ from round_robin_pairs import (
         berger_tables, circle_tables, round_robin_rounds_to_str_list,
         equalize_schedules_in_rounds, EqualizeType, pprint_player_pairs_row,
         find_best_equalize_solution, has_ideal,
+        iter_berger_rounds, iter_circle_rounds,
+        )
+from round_robin_pairs.base import (
+        FMT_WIDTH, create_demo_rounds_str_list,
+        SwapCandidateScorer, get_swap_idxs, apply_swap_idxs,
         )
-from round_robin_pairs.base import FMT_WIDTH, create_demo_rounds_str_list
 
 class TestAll(unittest.TestCase):
     """
@@ -769,6 +773,98 @@ class TestAll(unittest.TestCase):
         self.assertEqual(has_ideal(48), True )
         self.assertEqual(has_ideal(50), True )
 
+    def test_iter_rounds_same_as_tables(self):
+        for nr_of_players in range(1, 30):
+            players = [str(pl) for pl in range(1, nr_of_players+1)]
+
+            rounds_iter = iter_berger_rounds(players)
+            self.assertEqual(len(players), nr_of_players)
+            self.assertEqual(list(rounds_iter), berger_tables(players[:]))
+
+            rounds_iter = iter_circle_rounds(players)
+            self.assertEqual(list(rounds_iter), circle_tables(players[:]))
+            self.assertEqual(len(players), nr_of_players)
+
+    def test_iter_rounds_one_at_a_time(self):
+        rounds_iter = iter_berger_rounds([str(pl) for pl in range(1, 7)])
+        self.assertEqual(next(rounds_iter), [['1', '6'], ['2', '5'], ['3', '4']])
+        self.assertEqual(next(rounds_iter), [('6', '4'), ['5', '3'], ['1', '2']])
+
+    def test_swap_candidates_same_as_equalize(self):
+        for nr_of_players in (4, 5, 10, 14, 16):
+            rounds_str_list, round_robin_rounds, players = \
+                create_demo_rounds_str_list(nr_of_players, berger=True, return_all=True)
+            nr_schedules = len(round_robin_rounds[0])
+            scorer = SwapCandidateScorer(round_robin_rounds, players=players)
+            for eq_type in ("DIAG_L2R", "DIAG_R2L", "DIAG_L2R2L", "DIAG_R2L2R", "CROSS"):
+                for offset_x in range(0, nr_schedules):
+                    rounds_new, score_before, score_after = \
+                        equalize_schedules_in_rounds(round_robin_rounds, eq_type=eq_type, offset_x=offset_x, players=players)
+                    swap_idxs = get_swap_idxs(eq_type, len(round_robin_rounds), nr_schedules, offset_x=offset_x)
+                    self.assertEqual((scorer.score(), scorer.score(swap_idxs)), (score_before, score_after))
+                    self.assertEqual(apply_swap_idxs(round_robin_rounds, swap_idxs), rounds_new)
+
+            best_result = find_best_equalize_solution(round_robin_rounds, players=players, brute_force_factor=10)
+            if best_result.best_eq_type != EqualizeType.BRUTE_FORCE:
+                rounds_new, _, _ = equalize_schedules_in_rounds(
+                        round_robin_rounds, eq_type=best_result.best_eq_type, offset_x=best_result.best_offset_x)
+                self.assertEqual(best_result.best_rounds, rounds_new)
+            self.assertEqual(apply_swap_idxs(round_robin_rounds, best_result.best_swap_idxs), best_result.best_rounds)
+
+    def test_find_best_stop(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(4, berger=True, return_all=True)
+
+        # lower bound is 4, can not be reached - all candidates are tried
+        best_result = find_best_equalize_solution(round_robin_rounds, players=players, brute_force_factor=1)
+        self.assertEqual((best_result.best_score, best_result.best_eq_type, best_result.best_offset_x), (7, "DIAG_L2R", 0))
+
+        # first candidate already has target score
+        best_result = find_best_equalize_solution(round_robin_rounds, players=players, brute_force_factor=1000, target_score=7)
+        self.assertEqual((best_result.best_score, best_result.best_eq_type), (7, "DIAG_L2R"))
+        self.assertEqual(round_robin_rounds_to_str_list(best_result.best_rounds),
+                         ["Round 1: 1-4 2-3", "Round 2: 1-2 4-3", "Round 3: 2-4 3-1"])
+
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(16, berger=True, return_all=True)
+        best_result = find_best_equalize_solution(round_robin_rounds, players=players, brute_force_factor=None, target_score=60)
+        self.assertEqual((best_result.best_score, best_result.best_eq_type, best_result.best_offset_x), (58, "DIAG_L2R", 2))
+        best_result_all = find_best_equalize_solution(round_robin_rounds, players=players, brute_force_factor=None)
+        best_result_no_stop = find_best_equalize_solution(round_robin_rounds, players=players, brute_force_factor=None, stop_on_ideal=False)
+        self.assertEqual(best_result_all, best_result_no_stop)
+        self.assertLess(best_result_all.best_score, 58)
+
+    def test_find_best_parallel_reproducible(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(10, berger=True, return_all=True)
+        for workers in (1, 2):
+            results = [find_best_equalize_solution(round_robin_rounds, players=players, 
+                            brute_force_factor=200, workers=workers, seed=42)
+                       for _ in range(2)]
+            self.assertEqual(results[0], results[1])
+            self.assertEqual(results[0].best_rounds, results[1].best_rounds)
+            self.assertEqual(results[0].score_before, 25)
+            self.assertTrue(results[0].best_score <= 23, results[0].best_score)
+
+    def test_find_best_executor(self):
+        from concurrent.futures import ProcessPoolExecutor
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(10, berger=True, return_all=True)
+        result = find_best_equalize_solution(round_robin_rounds, players=players,
+                        brute_force_factor=200, workers=2, seed=42)
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            # the same pool for more calls
+            for _ in range(2):
+                result_executor = find_best_equalize_solution(round_robin_rounds, players=players,
+                                        brute_force_factor=200, workers=2, seed=42, executor=executor)
+                self.assertEqual(result_executor, result)
+            # seed alone runs in this process - executor is not used
+            executor.shutdown()
+            result_seed = find_best_equalize_solution(round_robin_rounds, players=players,
+                                brute_force_factor=200, seed=42, executor=executor)
+            self.assertEqual(result_seed, find_best_equalize_solution(round_robin_rounds, players=players,
+                                              brute_force_factor=200, workers=1, seed=42))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+"""
+run like:
+
+    python -m unittest tests.test_annealing
+"""
+import unittest
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import anneal_schedule, find_best_equalize_solution, EqualizeType
+from round_robin_pairs.base import create_demo_rounds_str_list, get_just_score
+
+
+class TestAnnealing(unittest.TestCase):
+
+    def _check_result(self, round_robin_rounds, players, best_result):
+        # same pairs in every round, only schedules (slots) are changed
+        for round_pairs, round_pairs_new in zip(round_robin_rounds, best_result.best_rounds):
+            self.assertEqual(set(map(tuple, round_pairs)), set(round_pairs_new))
+        _, score, _, _ = get_just_score(players, len(round_robin_rounds[0]), best_result.best_rounds)
+        self.assertEqual(score, best_result.best_score)
+        self.assertEqual(best_result.best_eq_type, EqualizeType.ANNEALING)
+
+    def test_10_finds_ideal(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(10, berger=True, return_all=True)
+        # ideal exists for 10 players too (has_ideal() says no), not every seed finds it
+        best_result = anneal_schedule(round_robin_rounds, players, max_iterations=100_000, seed=3)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertEqual(best_result.score_before, 25)
+        self.assertEqual(best_result.best_score, 10)
+        self.assertTrue(best_result.is_ideal())
+
+    def test_16_better_than_find_best(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(16, berger=True, return_all=True)
+        best_result = anneal_schedule(round_robin_rounds, players, max_iterations=100_000, seed=1)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertEqual(best_result.score_before, 43)
+        # find_best_equalize_solution() without brute force gets 39
+        self.assertLess(best_result.best_score, 39)
+
+    def test_16_better_than_brute_force(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(16, berger=True, return_all=True)
+        brute_force_result = find_best_equalize_solution(round_robin_rounds, players, brute_force_factor=500, seed=1)
+        self.assertEqual(brute_force_result.best_eq_type, EqualizeType.BRUTE_FORCE)
+        # 20000 iterations take less time than brute force above (~1/3)
+        best_result = anneal_schedule(round_robin_rounds, players, max_iterations=20_000, seed=1)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertLess(best_result.best_score, brute_force_result.best_score)
+
+    def test_reproducible(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(22, berger=True, return_all=True)
+        best_result_1 = anneal_schedule(round_robin_rounds, players, max_iterations=5000, seed=7)
+        best_result_2 = anneal_schedule(round_robin_rounds, players, max_iterations=5000, seed=7)
+        self.assertEqual(best_result_1.best_rounds, best_result_2.best_rounds)
+        self._check_result(round_robin_rounds, players, best_result_1)
+
+    def test_budget_required(self):
+        with self.assertRaisesRegex(ValueError, "Provide max_iterations and/or time_budget"):
+            anneal_schedule([[("1", "2")]], ["1", "2"], max_iterations=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
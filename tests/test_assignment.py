@@ -0,0 +1,77 @@
+"""
+run like:
+
+    python -m unittest tests.test_assignment
+"""
+import unittest
+import os, sys
+import itertools
+import random
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import assignment_schedule, find_best_equalize_solution, EqualizeType
+from round_robin_pairs.assignment import linear_assignment
+from round_robin_pairs.base import create_demo_rounds_str_list, get_just_score
+
+
+class TestLinearAssignment(unittest.TestCase):
+
+    def test_same_as_all_permutations(self):
+        rnd = random.Random(1)
+        for _ in range(100):
+            size = rnd.randint(1, 6)
+            cost = [[rnd.randint(-3, 5) for _ in range(size)] for _ in range(size)]
+            cols = linear_assignment(cost)
+            self.assertEqual(sorted(cols), list(range(size)))
+            best = min(sum(cost[row][perm[row]] for row in range(size))
+                       for perm in itertools.permutations(range(size)))
+            self.assertEqual(sum(cost[row][col] for row, col in enumerate(cols)), best)
+
+    def test_empty(self):
+        self.assertEqual(linear_assignment([]), [])
+
+
+class TestAssignmentSchedule(unittest.TestCase):
+
+    def _check_result(self, round_robin_rounds, players, best_result):
+        # same pairs in every round, only schedules (slots) are changed
+        for round_pairs, round_pairs_new in zip(round_robin_rounds, best_result.best_rounds):
+            self.assertEqual(set(map(tuple, round_pairs)), set(round_pairs_new))
+        _, score, _, _ = get_just_score(players, len(round_robin_rounds[0]), best_result.best_rounds)
+        self.assertEqual(score, best_result.best_score)
+        self.assertEqual(best_result.best_eq_type, EqualizeType.ASSIGNMENT)
+
+    def test_improves_find_best(self):
+        for nr_of_players, score_find_best, score_expected in ((10, 23, 21), (16, 39, 33), (22, 55, 43)):
+            rounds_str_list, round_robin_rounds, players = \
+                create_demo_rounds_str_list(nr_of_players, berger=True, return_all=True)
+            find_best_result = find_best_equalize_solution(round_robin_rounds, players=players, brute_force_factor=None)
+            self.assertEqual(find_best_result.best_score, score_find_best)
+            best_result = assignment_schedule(find_best_result.best_rounds, players)
+            self._check_result(find_best_result.best_rounds, players, best_result)
+            self.assertEqual(best_result.score_before, score_find_best)
+            self.assertEqual(best_result.best_score, score_expected)
+
+    def test_berger_is_local_optimum(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(16, berger=True, return_all=True)
+        best_result = assignment_schedule(round_robin_rounds, players)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertEqual(best_result.best_score, best_result.score_before)
+        self.assertEqual(best_result.best_rounds, [list(map(tuple, round_pairs)) for round_pairs in round_robin_rounds])
+
+    def test_max_sweeps(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(22, berger=True, return_all=True)
+        find_best_result = find_best_equalize_solution(round_robin_rounds, players=players, brute_force_factor=None)
+        best_result_1 = assignment_schedule(find_best_result.best_rounds, players, max_sweeps=1)
+        best_result = assignment_schedule(find_best_result.best_rounds, players)
+        self._check_result(find_best_result.best_rounds, players, best_result_1)
+        self.assertLessEqual(best_result.best_score, best_result_1.best_score)
+        self.assertLess(best_result_1.best_score, find_best_result.best_score)
+
+
+if __name__ == '__main__':
+    unittest.main()
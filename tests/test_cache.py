@@ -0,0 +1,80 @@
+"""
+run like:
+
+    python -m unittest tests.test_cache
+"""
+import unittest
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import (
+        berger_tables, circle_tables, equalize_schedules_in_rounds,
+        TemplateCache, Algorithm,
+        )
+from round_robin_pairs.cache import relabel
+
+
+def as_tuples(rounds):
+    return [[tuple(pair) for pair in round_pairs] for round_pairs in rounds]
+
+
+class TestCache(unittest.TestCase):
+
+    def test_same_as_tables(self):
+        cache = TemplateCache()
+        for nr_of_players in range(1, 26):
+            players = [f"P{pl}" for pl in range(1, nr_of_players+1)]
+            self.assertEqual(cache.tables(players), as_tuples(berger_tables(players[:])))
+            self.assertEqual(cache.tables(players, algorithm="CIRCLE"), as_tuples(circle_tables(players[:])))
+            if nr_of_players % 2 == 0 and nr_of_players > 2 and (nr_of_players - 4) % 6 != 0:
+                self.assertEqual(cache.tables(players, ideal=True), as_tuples(berger_tables(players[:], ideal=True)))
+            self.assertEqual(len(players), nr_of_players)
+
+    def test_eq_type(self):
+        cache = TemplateCache()
+        players = [str(pl) for pl in range(1, 11)]
+        for offset_x in range(5):
+            rounds, _, _ = equalize_schedules_in_rounds(berger_tables(players[:]), eq_type="CROSS", offset_x=offset_x)
+            self.assertEqual(cache.tables(players, eq_type="CROSS", offset_x=offset_x), as_tuples(rounds))
+        with self.assertRaisesRegex(ValueError, "can not be cached"):
+            cache.tables(players, eq_type="BRUTE_FORCE")
+        with self.assertRaisesRegex(ValueError, "Ideal result not available for 10"):
+            cache.tables(players, ideal=True)
+
+    def test_relabel_and_counters(self):
+        cache = TemplateCache(max_size=2)
+        rounds_1 = cache.tables(["a", "b", "c", "d"])
+        rounds_2 = cache.tables(["w", "x", "y", "z"])
+        self.assertEqual(rounds_1[0], [("a", "d"), ("b", "c")])
+        self.assertEqual(rounds_2[0], [("w", "z"), ("x", "y")])
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (1, 1, 0, 1))
+
+        cache.tables(["a", "b", "c"])
+        cache.tables(["a", "b", "c", "d"], algorithm=Algorithm.CIRCLE)
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (1, 3, 1, 2))
+
+        # 3 players template is still cached, 4 players berger is evicted
+        cache.tables(["1", "2", "3"])
+        self.assertEqual(cache.stats().hits, 2)
+        cache.tables(["1", "2", "3", "4"])
+        self.assertEqual(cache.stats().misses, 4)
+
+        cache.set_max_size(1)
+        self.assertEqual((cache.stats().size, cache.stats().evictions), (1, 3))
+
+    def test_relabel_wrong_players(self):
+        cache = TemplateCache()
+        template = cache.get_template(Algorithm.BERGER, 10)
+        with self.assertRaisesRegex(ValueError, "Template is for 10 players, got 5"):
+            relabel(template, ["a", "b", "c", "d", "e"])
+        template = cache.get_template(Algorithm.BERGER, 5)
+        with self.assertRaisesRegex(ValueError, "Template is for 5 players, got 6"):
+            relabel(template, ["a", "b", "c", "d", "e", "f"])
+
+
+if __name__ == '__main__':
+    unittest.main()
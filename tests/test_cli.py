@@ -0,0 +1,127 @@
+"""
+run like:
+
+    python -m unittest tests.test_cli
+"""
+import unittest
+import tempfile
+import json
+import io
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import (
+        berger_tables, circle_tables, round_robin_rounds_to_str_list, find_best_equalize_solution,
+        TemplateCache, load_schedule,
+        )
+from round_robin_pairs.cli import main, run_batch
+
+
+def as_lists(rounds):
+    return [[list(pair) for pair in round_pairs] for round_pairs in rounds]
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _main(self, argv, stdin=""):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        return_code = main(argv, stdin=io.StringIO(stdin), stdout=stdout, stderr=stderr)
+        return return_code, stdout.getvalue(), stderr.getvalue()
+
+    def test_generate(self):
+        return_code, output, _ = self._main(["generate", "-n", "6", "--ideal"])
+        self.assertEqual(return_code, 0)
+        players = [str(nr) for nr in range(1, 7)]
+        self.assertEqual(output, "\n".join(round_robin_rounds_to_str_list(berger_tables(players, ideal=True))) + "\n")
+
+        return_code, output, _ = self._main(["generate", "a", "b", "c", "--algorithm", "CIRCLE", "--format", "ndjson"])
+        self.assertEqual(json.loads(output.splitlines()[0])["pairs"], as_lists(circle_tables(["a", "b", "c"]))[0])
+
+        # text stdout without binary buffer
+        return_code, output, errors = self._main(["generate", "-n", "6", "--format", "binary"])
+        self.assertEqual((return_code, output), (2, ""))
+        self.assertIn("Format BINARY needs binary output", errors)
+
+    def test_optimize(self):
+        return_code, output, errors = self._main(["optimize", "-n", "10"])
+        self.assertEqual(return_code, 0)
+        players = [str(nr) for nr in range(1, 11)]
+        best_result = find_best_equalize_solution(berger_tables(players[:]), players, brute_force_factor=None)
+        self.assertEqual(errors, f"score: {best_result.score_before} -> {best_result.best_score}\n")
+        self.assertEqual(output, "\n".join(round_robin_rounds_to_str_list(best_result.best_rounds, fmt_width=2)) + "\n")
+
+    def test_export_and_validate(self):
+        path_binary = os.path.join(self.tmp_dir.name, "rounds.rrpb")
+        path_csv = os.path.join(self.tmp_dir.name, "rounds.csv")
+        self.assertEqual(self._main(["export", "-n", "12", "--optimizer", "tabu", "--seed", "1", "-o", path_binary])[0], 0)
+        self.assertEqual(self._main(["export", "--input", path_binary, "-o", path_csv])[0], 0)
+        self.assertEqual(load_schedule(path_csv), load_schedule(path_binary).to_rounds())
+        self.assertEqual(self._main(["validate", path_csv]), (0, f"{path_csv}: OK\n", ""))
+
+        with open(path_csv) as fin:
+            lines = fin.read().splitlines()
+        # 2nd pair of round 1 replaced by 1st one
+        lines[2] = lines[1].replace("1,1,", "1,2,")
+        with open(path_csv, "w") as fout:
+            fout.write("\n".join(lines) + "\n")
+        return_code, output, _ = self._main(["validate", path_csv])
+        self.assertEqual(return_code, 1)
+        self.assertIn("plays twice in round 1, slot 2", output)
+
+        return_code, _, errors = self._main(["validate", os.path.join(self.tmp_dir.name, "rounds.txt")])
+        self.assertEqual(return_code, 2)
+        self.assertIn("Unknown format", errors)
+
+    def test_batch(self):
+        specs = [
+            {"id": 1, "players": ["a", "b", "c", "d", "e", "f"], "ideal": True},
+            {"id": 2, "nr_players": 10, "optimize": "best", "validate": True},
+            {"id": 3, "nr_players": 10, "optimize": "best"},
+            {"id": 4, "nr_players": 10, "ideal": True},
+            {"id": 5, "nr_players": 5, "output": "text", "algorithm": "CIRCLE"},
+            ]
+        stdin = "\n".join(json.dumps(spec) for spec in specs) + "\n\nnot json\n"
+        return_code, output, _ = self._main(["batch"], stdin=stdin)
+        self.assertEqual(return_code, 1)
+        results = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[0], {"id": 1, "rounds": as_lists(berger_tables(["a", "b", "c", "d", "e", "f"], ideal=True))})
+        self.assertIsNone(results[1]["violation"])
+        self.assertLess(results[1]["score"], results[1]["score_before"])
+        self.assertEqual(results[2]["rounds"], results[1]["rounds"])
+        self.assertIn("Ideal result not available", results[3]["error"])
+        self.assertEqual(results[4]["text"], round_robin_rounds_to_str_list(circle_tables([str(nr) for nr in range(1, 6)]), fmt_width=3))
+        self.assertEqual(results[5]["id"], None)
+        self.assertIn("error", results[5])
+
+    def test_batch_cache(self):
+        cache = TemplateCache()
+        spec_lines = [json.dumps({"id": idx, "players": [f"P{idx}-{nr}" for nr in range(16)], "optimize": "best"})
+                      for idx in range(50)]
+        stdout = io.StringIO()
+        self.assertEqual(run_batch(io.StringIO("\n".join(spec_lines)), stdout, cache=cache, flush_every=0), (50, 0))
+        stats = cache.stats()
+        # template and optimized template built once
+        self.assertEqual((stats.misses, stats.hits), (2, 49))
+        results = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        # same optimized template, other names
+        self.assertEqual(json.dumps(results[7]["rounds"]), json.dumps(results[0]["rounds"]).replace("P0-", "P7-"))
+
+        # seed is not used by "best" - cached once for any seed
+        spec_lines = [json.dumps({"players": [f"P{nr}" for nr in range(16)], "optimize": "best", "seed": seed})
+                      for seed in range(5)]
+        run_batch(io.StringIO("\n".join(spec_lines)), io.StringIO(), cache=cache)
+        stats = cache.stats()
+        self.assertEqual((stats.misses, stats.hits), (2, 49 + 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
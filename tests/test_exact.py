@@ -0,0 +1,66 @@
+"""
+run like:
+
+    python -m unittest tests.test_exact
+"""
+import unittest
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import exact_schedule, EqualizeType
+from round_robin_pairs.base import create_demo_rounds_str_list, get_just_score
+
+
+class TestExact(unittest.TestCase):
+
+    def _check_result(self, round_robin_rounds, players, exact_result):
+        best_result = exact_result.best_result
+        # same pairs in every round, only schedules (slots) are changed
+        for round_pairs, round_pairs_new in zip(round_robin_rounds, best_result.best_rounds):
+            self.assertEqual(set(map(tuple, round_pairs)), set(map(tuple, round_pairs_new)))
+        _, score, _, _ = get_just_score(players, len(round_robin_rounds[0]), best_result.best_rounds)
+        self.assertEqual(score, best_result.best_score)
+        self.assertLessEqual(exact_result.lower_bound, best_result.best_score)
+
+    def _exact(self, nr_of_players, **kwargs):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(nr_of_players, berger=True, return_all=True)
+        exact_result = exact_schedule(round_robin_rounds, players, **kwargs)
+        self._check_result(round_robin_rounds, players, exact_result)
+        return exact_result
+
+    def test_ideal_found(self):
+        # has_ideal() says no for 10 and 16
+        for nr_of_players in (9, 10, 16):
+            exact_result = self._exact(nr_of_players)
+            self.assertTrue(exact_result.proven_optimal)
+            self.assertEqual(exact_result.best_result.best_eq_type, EqualizeType.EXACT)
+            self.assertTrue(exact_result.best_result.is_ideal())
+            self.assertEqual(exact_result.lower_bound, exact_result.best_result.score_ideal)
+
+    def test_no_ideal_proven(self):
+        # ideal does not exist, find_best_equalize_solution() result is optimal
+        exact_result = self._exact(4)
+        self.assertTrue(exact_result.proven_optimal)
+        self.assertEqual(exact_result.lower_bound, 7)
+        self.assertEqual(exact_result.best_result.best_score, 7)
+        self.assertEqual(exact_result.best_result.best_eq_type, "DIAG_L2R")
+
+    def test_already_ideal(self):
+        exact_result = self._exact(14)
+        self.assertTrue(exact_result.proven_optimal)
+        self.assertEqual(exact_result.nodes, 0)
+        self.assertEqual(exact_result.best_result.best_eq_type, "DIAG_R2L2R")
+
+    def test_time_budget(self):
+        exact_result = self._exact(22, time_budget=0.2)
+        self.assertFalse(exact_result.proven_optimal)
+        self.assertEqual(exact_result.lower_bound, 22)
+        self.assertEqual(exact_result.best_result.best_score, 55)
+        self.assertLess(exact_result.elapsed, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
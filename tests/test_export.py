@@ -0,0 +1,110 @@
+"""
+run like:
+
+    python -m unittest tests.test_export
+"""
+import unittest
+import tempfile
+import io
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import (
+        berger_tables, circle_tables, berger_array, iter_berger_rounds, iter_circle_rounds,
+        build_store, ScheduleStore, ScheduleArray,
+        write_csv, read_csv, write_ndjson, read_ndjson, write_binary, read_binary,
+        export_schedule, load_schedule, ExportFormat,
+        )
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _players(self, nr_players):
+        # names which need quoting/escaping
+        return [f'Pl, "{nr}"' if nr % 3 == 0 else f"Pl {nr}" for nr in range(1, nr_players + 1)]
+
+    def test_text_roundtrip(self):
+        players_list = [self._players(nr_players) for nr_players in (3, 4, 9, 12)]
+        # line breaks in names
+        players_list.append(["a,b", 'c"d', "e\nf", "g\r\nh", "i\rj"])
+        for players in players_list:
+            rounds = berger_tables(players)
+            for write, read in ((write_csv, read_csv), (write_ndjson, read_ndjson)):
+                for source in (rounds, berger_array(players), iter_berger_rounds(players)):
+                    stream = io.StringIO(newline="")
+                    write(source, stream)
+                    stream.seek(0)
+                    schedule = read(stream)
+                    self.assertIsInstance(schedule, ScheduleArray)
+                    self.assertEqual(schedule, rounds)
+
+    def test_csv_format(self):
+        stream = io.StringIO(newline="")
+        write_csv(berger_tables(["a", "b", "c,d", "e"]), stream)
+        self.assertEqual(stream.getvalue().splitlines()[:3],
+                         ["round,slot,player1,player2", "1,1,a,e", '1,2,b,"c,d"'])
+
+    def test_ndjson_format(self):
+        stream = io.StringIO()
+        write_ndjson(berger_tables(["a", "b", "c", "d"]), stream)
+        self.assertEqual(stream.getvalue().splitlines()[0], '{"round": 1, "pairs": [["a", "d"], ["b", "c"]]}')
+
+    def test_binary_roundtrip(self):
+        for nr_players in (3, 4, 9, 12, 21):
+            players = self._players(nr_players)
+            rounds = circle_tables(players)
+            for source, kwargs in ((rounds, {}), (ScheduleArray.from_rounds(rounds), {}),
+                                   (iter_circle_rounds(players), {"players": players})):
+                stream = io.BytesIO()
+                write_binary(source, stream, **kwargs)
+                stream.seek(0)
+                schedule = read_binary(stream)
+                self.assertEqual(schedule, rounds)
+
+    def test_binary_errors(self):
+        players = self._players(6)
+        with self.assertRaisesRegex(ValueError, "Players are required"):
+            write_binary(iter_berger_rounds(players), io.BytesIO())
+        with self.assertRaisesRegex(ValueError, "Not a binary schedule"):
+            read_binary(io.BytesIO(b"round,slot"))
+        stream = io.BytesIO()
+        write_binary(berger_tables(players), stream)
+        with self.assertRaisesRegex(ValueError, "not multiple of round size"):
+            read_binary(io.BytesIO(stream.getvalue()[:-2]))
+
+    def test_binary_from_store(self):
+        # zero-copy memoryview data
+        path = os.path.join(self.tmp_dir.name, "tables.rrps")
+        build_store(path, 10, 10)
+        with ScheduleStore(path) as store:
+            schedule = store.get(10)
+            stream = io.BytesIO()
+            write_binary(schedule, stream)
+            rounds = schedule.to_rounds()
+        stream.seek(0)
+        self.assertEqual(read_binary(stream), rounds)
+
+    def test_files(self):
+        players = self._players(15)
+        rounds = berger_tables(players)
+        for file_name in ("rounds.csv", "rounds.ndjson", "rounds.jsonl", "rounds.rrpb"):
+            path = os.path.join(self.tmp_dir.name, file_name)
+            export_schedule(rounds, path)
+            self.assertEqual(load_schedule(path), rounds)
+        path = os.path.join(self.tmp_dir.name, "rounds.txt")
+        export_schedule(rounds, path, export_format=ExportFormat.NDJSON)
+        self.assertEqual(load_schedule(path, export_format="NDJSON"), rounds)
+        with self.assertRaisesRegex(ValueError, "Unknown format"):
+            load_schedule(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
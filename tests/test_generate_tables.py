@@ -0,0 +1,98 @@
+"""
+run like:
+
+    python -m unittest tests.test_generate_tables
+"""
+import unittest
+import contextlib
+import importlib.util
+import io
+import tempfile
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+# script name is not a module name
+spec = importlib.util.spec_from_file_location("generate_tables", os.path.join(root_path, "generate-tables.py"))
+generate_tables_module = importlib.util.module_from_spec(spec)
+# workers (--jobs) get generate_file() by module name
+sys.modules[spec.name] = generate_tables_module
+spec.loader.exec_module(generate_tables_module)
+get_file_name = generate_tables_module.get_file_name
+
+
+class TestGenerateTables(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tables_path = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _generate(self, nr_players_from=3, nr_players_to=6, tables_path=None, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return generate_tables_module.generate_tables(
+                    nr_players_from, nr_players_to, tables_path=tables_path or self.tables_path, **kwargs)
+
+    def _mtimes(self, nr_players_list):
+        return {nr_players: os.stat(os.path.join(self.tables_path, get_file_name(nr_players))).st_mtime_ns
+                for nr_players in nr_players_list}
+
+    def _read(self, tables_path, nr_players):
+        with open(os.path.join(tables_path, get_file_name(nr_players)), encoding="utf-8") as fin:
+            return fin.read()
+
+    def test_same_as_committed_tables(self):
+        self._generate(3, 12)
+        for nr_players in range(3, 13):
+            self.assertEqual(self._read(self.tables_path, nr_players),
+                             self._read(generate_tables_module.tables_path, nr_players))
+
+    def test_incremental(self):
+        manifest = self._generate()
+        self.assertEqual((manifest["last_run"]["generated"], manifest["last_run"]["written"]), (4, 4))
+        self.assertEqual(sorted(manifest["files"]), [get_file_name(nr_players) for nr_players in range(3, 7)])
+        mtimes = self._mtimes(range(3, 7))
+
+        # up to date - nothing generated, files untouched
+        manifest = self._generate()
+        self.assertEqual((manifest["last_run"]["generated"], manifest["last_run"]["written"]), (0, 0))
+        self.assertEqual(self._mtimes(range(3, 7)), mtimes)
+
+        # forced - generated, but not written since content is the same
+        manifest = self._generate(force=True)
+        self.assertEqual((manifest["last_run"]["generated"], manifest["last_run"]["written"]), (4, 0))
+        self.assertEqual(self._mtimes(range(3, 7)), mtimes)
+
+        # changed file on disk - only that one is generated again
+        with open(os.path.join(self.tables_path, get_file_name(5)), "a", encoding="utf-8") as fout:
+            fout.write("changed")
+        manifest = self._generate()
+        self.assertEqual((manifest["last_run"]["generated"], manifest["last_run"]["written"]), (1, 1))
+        self.assertNotIn("changed", self._read(self.tables_path, 5))
+
+    def test_params_changed(self):
+        self._generate()
+        mtimes = self._mtimes(range(3, 7))
+        # all params changed, only 4 players (without ideal) has new content
+        manifest = self._generate(optimized=True)
+        self.assertEqual((manifest["last_run"]["generated"], manifest["last_run"]["written"]), (4, 1))
+        self.assertTrue(manifest["files"][get_file_name(4)]["params"]["optimized"])
+        self.assertIn("## Berger (optimized)", self._read(self.tables_path, 4))
+        del mtimes[4]
+        self.assertEqual(self._mtimes([3, 5, 6]), mtimes)
+
+    def test_jobs(self):
+        manifest = self._generate(3, 12, optimized=True)
+        with tempfile.TemporaryDirectory() as tables_path:
+            manifest_jobs = self._generate(3, 12, optimized=True, jobs=2, tables_path=tables_path)
+            for fname, entry in manifest["files"].items():
+                self.assertEqual(manifest_jobs["files"][fname]["sha256"], entry["sha256"])
+            for nr_players in range(3, 13):
+                self.assertEqual(self._read(tables_path, nr_players), self._read(self.tables_path, nr_players))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+run like:
+
+    python -m unittest tests.test_genetic
+"""
+import unittest
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import genetic_schedule, EqualizeType, berger_array
+from round_robin_pairs.base import create_demo_rounds_str_list, get_just_score
+from round_robin_pairs.scoring import batch_scores_permutations, _penalties_table
+from round_robin_pairs import genetic
+
+np = genetic.np
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestGenetic(unittest.TestCase):
+
+    def _check_result(self, round_robin_rounds, players, best_result):
+        # same pairs in every round, only schedules (slots) are changed
+        for round_pairs, round_pairs_new in zip(round_robin_rounds, best_result.best_rounds):
+            self.assertEqual(set(map(tuple, round_pairs)), set(round_pairs_new))
+        _, score, _, _ = get_just_score(players, len(round_robin_rounds[0]), best_result.best_rounds)
+        self.assertEqual(score, best_result.best_score)
+        self.assertEqual(best_result.best_eq_type, EqualizeType.GENETIC)
+
+    def test_16_better_than_find_best(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(16, berger=True, return_all=True)
+        best_result = genetic_schedule(round_robin_rounds, players, max_generations=300, seed=1)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertEqual(best_result.score_before, 43)
+        # find_best_equalize_solution() without brute force gets 39
+        self.assertLess(best_result.best_score, 39)
+
+    def test_odd(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(9, berger=True, return_all=True)
+        best_result = genetic_schedule(round_robin_rounds, players, max_generations=300, seed=1)
+        self._check_result(round_robin_rounds, players, best_result)
+
+    def test_reproducible(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(22, berger=True, return_all=True)
+        best_result_1 = genetic_schedule(round_robin_rounds, players, max_generations=30, seed=7)
+        best_result_2 = genetic_schedule(round_robin_rounds, players, max_generations=30, seed=7)
+        self.assertEqual(best_result_1.best_rounds, best_result_2.best_rounds)
+        self._check_result(round_robin_rounds, players, best_result_1)
+
+    def test_counts_kept_by_swaps(self):
+        base = berger_array([str(pl) for pl in range(15)])
+        rng = np.random.default_rng(0)
+        genomes = np.broadcast_to(np.arange(base.nr_slots), (20, base.nr_rounds, base.nr_slots)).copy()
+        population = genetic._Population(base.to_numpy().astype(np.int64), genomes,
+                                         np.asarray(_penalties_table(base.nr_rounds)))
+        for _ in range(50):
+            population.mutate_directed(np.arange(10), rng)
+            population.mutate_random(np.arange(5, 20), rng)
+        self.assertEqual(population.fitness().tolist(), batch_scores_permutations(base, population.genomes))
+        for genome in population.genomes:
+            for round_perm in genome:
+                self.assertEqual(sorted(round_perm), list(range(base.nr_slots)))
+
+    def test_budget_required(self):
+        with self.assertRaisesRegex(ValueError, "Provide max_generations and/or time_budget"):
+            genetic_schedule([[("1", "2")]], ["1", "2"], max_generations=None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+run like:
+
+    python -m unittest tests.test_import_time
+
+timing check is run only when benchmarking:
+
+    ROUND_ROBIN_PAIRS_BENCHMARK=1 python -m unittest tests.test_import_time
+"""
+import unittest
+import subprocess
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+# seconds - import round_robin_pairs + small berger_tables() in fresh process,
+# ~0.01s (with numpy and dataclasses imported eagerly it was ~0.09s)
+IMPORT_TIME_BUDGET = 0.05
+# imported only when used
+LAZY_MODULES = ("numpy", "colorama", "pprint", "copy", "dataclasses",
+                "json", "csv", "argparse", "round_robin_pairs.schedule_array")
+
+CODE = f"""
+import sys, time
+time_start = time.perf_counter()
+import round_robin_pairs
+round_robin_pairs.berger_tables(["a", "b", "c", "d", "e"])
+elapsed = time.perf_counter() - time_start
+print(elapsed)
+print(",".join(name for name in {LAZY_MODULES!r} if name in sys.modules))
+"""
+
+
+def run_import():
+    output = subprocess.run([sys.executable, "-c", CODE], cwd=root_path, check=True,
+                            capture_output=True, text=True).stdout
+    elapsed, modules = output.splitlines()
+    return float(elapsed), [name for name in modules.split(",") if name]
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_lazy_modules(self):
+        _, modules = run_import()
+        self.assertEqual(modules, [])
+
+    @unittest.skipUnless(os.environ.get("ROUND_ROBIN_PAIRS_BENCHMARK"),
+                         "timing check, set ROUND_ROBIN_PAIRS_BENCHMARK=1 to run")
+    def test_import_time(self):
+        # the best of few runs - less sensitive to load of the machine
+        elapsed = min(run_import()[0] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_TIME_BUDGET)
+
+    def test_lazy_names(self):
+        import round_robin_pairs
+        for name in round_robin_pairs.__all__:
+            self.assertIsNotNone(getattr(round_robin_pairs, name), name)
+        self.assertIn("ScheduleArray", dir(round_robin_pairs))
+        with self.assertRaises(AttributeError):
+            round_robin_pairs.not_existing
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+run like:
+
+    python -m unittest tests.test_lookup
+"""
+import unittest
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import (
+        berger_tables, circle_tables,
+        berger_pairing, berger_meeting, circle_pairing, circle_meeting,
+        PairingLookup,
+        )
+
+
+class TestLookup(unittest.TestCase):
+
+    def _check_same_as_tables(self, function, pairing, meeting, nr_of_players):
+        players = list(range(nr_of_players))
+        rounds = function(players[:])
+
+        def to_idx(pl):
+            return None if pl == "BYE" else pl
+
+        for round_idx, round_pairs in enumerate(rounds):
+            for slot_idx, (pl1, pl2) in enumerate(round_pairs):
+                for pl, opp, is_first in ((pl1, pl2, True), (pl2, pl1, False)):
+                    expected = (round_idx, slot_idx, to_idx(pl), to_idx(opp), is_first)
+
+                    got = pairing(nr_of_players, to_idx(pl), round_idx)
+                    self.assertEqual((got.round_idx, got.slot_idx, got.player_idx, got.opponent_idx, got.is_first),
+                                     expected, (nr_of_players, round_idx, pl))
+
+                    if to_idx(pl) is not None:
+                        got = meeting(nr_of_players, to_idx(pl), to_idx(opp))
+                        self.assertEqual((got.round_idx, got.slot_idx, got.player_idx, got.opponent_idx, got.is_first),
+                                         expected, (nr_of_players, pl, opp))
+
+    def test_berger_same_as_tables(self):
+        for nr_of_players in range(1, 30):
+            self._check_same_as_tables(berger_tables, berger_pairing, berger_meeting, nr_of_players)
+
+    def test_circle_same_as_tables(self):
+        for nr_of_players in range(1, 30):
+            self._check_same_as_tables(circle_tables, circle_pairing, circle_meeting, nr_of_players)
+
+    def test_bye(self):
+        pairing = berger_pairing(5, 0, 0)
+        self.assertTrue(pairing.is_bye)
+        self.assertEqual((pairing.slot_idx, pairing.is_first), (0, True))
+        self.assertFalse(circle_pairing(6, 0, 0).is_bye)
+        with self.assertRaisesRegex(ValueError, "No BYE for even number of players 6"):
+            circle_meeting(6, 0, None)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, "Round index 5 out of range 0..4"):
+            berger_pairing(6, 0, 5)
+        with self.assertRaisesRegex(ValueError, "Player index 6 out of range 0..5"):
+            circle_pairing(6, 6, 0)
+        with self.assertRaisesRegex(ValueError, "Player 2 can not meet itself"):
+            berger_meeting(6, 2, 2)
+
+    def test_lookup_by_names(self):
+        lookup = PairingLookup(["1", "2", "3", "4", "5"])
+        # Round 4: BYE-5 1-4 2-3
+        self.assertEqual(lookup.opponent("1", 4), "4")
+        self.assertEqual(lookup.opponent("5", 4), "BYE")
+        pairing = lookup.meeting("5", "BYE")
+        self.assertEqual((pairing.round_idx, pairing.slot_idx, pairing.is_first), (3, 0, False))
+
+        lookup = PairingLookup(["1", "2", "3", "4", "5", "6"], berger=False)
+        # Round 2: 1-5 6-4 2-3
+        self.assertEqual(lookup.opponent("6", 2), "4")
+        self.assertEqual(lookup.meeting("6", "4").slot_idx, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
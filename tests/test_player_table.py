@@ -0,0 +1,61 @@
+"""
+run like:
+
+    python -m unittest tests.test_player_table
+"""
+import unittest
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import berger_tables, circle_tables, PlayerTable, ScheduleArray
+from round_robin_pairs.base import get_just_score, equalize_schedules_in_rounds, BYE
+
+
+class TestPlayerTable(unittest.TestCase):
+
+    def test_intern_rounds(self):
+        players = ["a", "b", "c", "d", "e"]
+        rounds = berger_tables(players)
+        table = PlayerTable.from_rounds(rounds)
+        self.assertEqual(sorted(table.players), sorted(players))
+        self.assertEqual(len(table), 6)
+        self.assertIn(BYE, table)
+        self.assertEqual(table.name(table.index("c")), "c")
+
+        rounds_idxs = table.intern_rounds(rounds)
+        self.assertEqual(sorted(pl for round_pairs in rounds_idxs for pair in round_pairs for pl in pair),
+                         sorted(list(range(6)) * 5))
+        self.assertEqual(table.names_rounds(rounds_idxs),
+                         [[tuple(pair) for pair in round_pairs] for round_pairs in rounds])
+
+    def test_detect_order(self):
+        rounds = [[("x", "y"), ("z", "w")], [("w", "x"), ("y", "z")]]
+        self.assertEqual(PlayerTable.from_rounds(rounds).players, ["x", "y", "z", "w"])
+        self.assertEqual(PlayerTable.from_rounds(rounds, players=["w", "x", "y", "z"]).players, ["w", "x", "y", "z"])
+
+    def test_errors(self):
+        rounds = [[("x", "y"), ("z", "w")]]
+        with self.assertRaisesRegex(Exception, "From schedules detected players which differs"):
+            PlayerTable.from_rounds(rounds, players=["x", "y", "z"])
+        with self.assertRaisesRegex(ValueError, "Players names should be unique"):
+            PlayerTable(["x", "y", "x"])
+
+    def test_schedule_array(self):
+        players = [str(pl) for pl in range(1, 11)]
+        rounds = circle_tables(players)
+        schedule = ScheduleArray.from_rounds(rounds, players=players)
+        table = PlayerTable(players)
+        self.assertEqual(table.intern_rounds(schedule), table.intern_rounds(rounds))
+        self.assertEqual(get_just_score(players, 5, schedule), get_just_score(players, 5, rounds))
+
+    def test_equalize_detects_players(self):
+        players = [str(pl) for pl in range(1, 15)]
+        rounds = berger_tables(players)
+        _, score_before, score_after = equalize_schedules_in_rounds(rounds, eq_type="DIAG_R2L2R")
+        self.assertEqual((score_before, score_after), get_just_score(players, 7, rounds)[1:2] + (14,))
+
+
+if __name__ == '__main__':
+    unittest.main()
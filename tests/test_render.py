@@ -0,0 +1,75 @@
+"""
+run like:
+
+    python -m unittest tests.test_render
+"""
+import unittest
+import os, sys
+import io
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import (
+        berger_tables, circle_tables, berger_array, round_robin_rounds_to_str_list,
+        write_round_robin_rounds, iter_round_robin_rounds_str,
+        )
+from round_robin_pairs.base import colorama
+
+
+def _players(nr_players, fmt_width):
+    return [f"{nr:>{fmt_width}}" for nr in range(1, nr_players + 1)]
+
+
+class TestRender(unittest.TestCase):
+
+    def test_write_same_as_str_list(self):
+        for fmt_width in (1, 2):
+            players = _players(9, fmt_width)
+            for round_robin_rounds in (berger_tables(players), circle_tables(players), berger_array(players)):
+                stream = io.StringIO()
+                write_round_robin_rounds(round_robin_rounds, stream, fmt_width=fmt_width)
+                lines = round_robin_rounds_to_str_list(round_robin_rounds, fmt_width=fmt_width)
+                self.assertEqual(stream.getvalue(), "\n".join(lines) + "\n")
+
+    def test_str_list(self):
+        self.assertEqual(round_robin_rounds_to_str_list(berger_tables(_players(4, 2)), fmt_width=2), [
+            'Round         1      2',
+            '----------------------',
+            'Round  1:  1- 4   2- 3',
+            'Round  2:  4- 3   1- 2',
+            'Round  3:  2- 4   3- 1',
+            '----------------------'])
+
+    def test_small_buffer(self):
+        players = _players(20, 2)
+        round_robin_rounds = berger_tables(players)
+        stream = io.StringIO()
+        write_round_robin_rounds(round_robin_rounds, stream, fmt_width=2, buffer_size=10)
+        self.assertEqual(stream.getvalue(),
+                         "\n".join(round_robin_rounds_to_str_list(round_robin_rounds, fmt_width=2)) + "\n")
+
+    def test_round_range(self):
+        players = _players(10, 2)
+        for round_robin_rounds in (berger_tables(players), berger_array(players)):
+            lines = round_robin_rounds_to_str_list(round_robin_rounds, fmt_width=2)
+            # header, separator, rounds, separator
+            self.assertEqual(list(iter_round_robin_rounds_str(round_robin_rounds, fmt_width=2, round_range=range(3, 6))),
+                             lines[:2] + lines[5:8] + lines[-1:])
+            stream = io.StringIO()
+            write_round_robin_rounds(round_robin_rounds, stream, fmt_width=1, round_range=range(8, 9))
+            self.assertEqual(stream.getvalue(), round_robin_rounds_to_str_list(round_robin_rounds)[8] + "\n")
+
+    @unittest.skipIf(colorama is None, "colorama not installed")
+    def test_mark_players(self):
+        players = _players(6, 1)
+        round_robin_rounds = berger_tables(players)
+        lines = round_robin_rounds_to_str_list(round_robin_rounds, mark_players=["1", "2"])
+        self.assertEqual(lines[0].count(colorama.Style.RESET_ALL), 2)
+        stream = io.StringIO()
+        write_round_robin_rounds(berger_array(players), stream, mark_players=["1", "2"])
+        self.assertEqual(stream.getvalue(), "\n".join(lines) + "\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+run like:
+
+    python -m unittest tests.test_round_order
+"""
+import unittest
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import round_order_schedule, find_best_equalize_solution
+from round_robin_pairs.base import create_demo_rounds_str_list, get_just_score
+from round_robin_pairs.round_order import _PatternSearch
+from round_robin_pairs.base import SwapCandidateScorer
+
+
+class TestRoundOrder(unittest.TestCase):
+
+    def _check_result(self, round_robin_rounds, players, best_result):
+        # rounds are reordered, pairs in each round are the same
+        self.assertEqual(sorted(best_result.best_round_order), list(range(len(round_robin_rounds))))
+        for round_idx, round_pairs_new in zip(best_result.best_round_order, best_result.best_rounds):
+            self.assertEqual(set(map(tuple, round_robin_rounds[round_idx])), set(map(tuple, round_pairs_new)))
+        _, score, _, _ = get_just_score(players, len(round_robin_rounds[0]), best_result.best_rounds)
+        self.assertEqual(score, best_result.best_score)
+
+    def test_better_than_find_best(self):
+        for nr_of_players, expected in ((10, 16), (16, 30), (22, 35)):
+            rounds_str_list, round_robin_rounds, players = \
+                create_demo_rounds_str_list(nr_of_players, berger=True, return_all=True)
+            best_result = round_order_schedule(round_robin_rounds, players, seed=1)
+            self._check_result(round_robin_rounds, players, best_result)
+            fixed_order_result = find_best_equalize_solution(round_robin_rounds, players, brute_force_factor=None)
+            self.assertLess(best_result.best_score, fixed_order_result.best_score)
+            self.assertEqual(best_result.best_score, expected)
+
+    def test_ideal(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(14, berger=True, return_all=True)
+        best_result = round_order_schedule(round_robin_rounds, players, seed=1)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertTrue(best_result.is_ideal())
+        self.assertEqual(best_result.best_round_order, list(range(13)))
+
+    def test_odd(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(9, berger=True, return_all=True)
+        best_result = round_order_schedule(round_robin_rounds, players, seed=1)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertLess(best_result.best_score, best_result.score_before)
+
+    def test_exchange_delta(self):
+        # exchange delta is the same as rescoring
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(12, berger=True, return_all=True)
+        scorer = SwapCandidateScorer(round_robin_rounds, players=players)
+        search = _PatternSearch(scorer.base, len(players))
+        for round_idx in range(len(round_robin_rounds)):
+            search.set_target(round_idx, (round_idx * 5) % 6)
+        self.assertEqual(search.score, scorer.score(search.targets))
+        for round_idx_1, round_idx_2 in ((0, 3), (4, 5), (10, 2), (3, 0)):
+            score = search.score
+            delta = search.exchange(round_idx_1, round_idx_2)
+            self.assertEqual(search.score, score + delta)
+            self.assertEqual(search.score, scorer.score(search.targets))
+
+
+if __name__ == '__main__':
+    unittest.main()
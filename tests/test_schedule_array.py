@@ -0,0 +1,105 @@
+"""
+run like:
+
+    python -m unittest tests.test_schedule_array
+"""
+import unittest
+import time
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import (
+        berger_tables, circle_tables, round_robin_rounds_to_str_list,
+        equalize_schedules_in_rounds, ScheduleArray,
+        berger_array, circle_array, berger_pairing,
+        )
+from round_robin_pairs.base import get_just_score
+from round_robin_pairs.schedule_array import (
+        np, _berger_idxs_python, _circle_idxs_python,
+        )
+
+
+class TestScheduleArray(unittest.TestCase):
+
+    def test_from_to_rounds(self):
+        for nr_of_players in range(1, 20):
+            players = [str(pl) for pl in range(1, nr_of_players+1)]
+            for function in (berger_tables, circle_tables):
+                rounds = function(players[:])
+                schedule = ScheduleArray.from_rounds(rounds)
+                self.assertEqual(schedule.to_rounds(), [[tuple(pair) for pair in row] for row in rounds])
+                self.assertEqual(schedule, rounds)
+                self.assertEqual(len(schedule), len(rounds))
+                self.assertEqual(schedule.data.typecode, "h")
+
+    def test_players_order(self):
+        players = ["1", "2", "3", "4", "5", "6"]
+        schedule = ScheduleArray.from_rounds(berger_tables(players[:]), players=players)
+        self.assertEqual(schedule.players, players)
+        self.assertEqual(schedule.pair_idxs(0, 0), (0, 5))
+        self.assertEqual(schedule[1][0], ("6", "4"))
+        self.assertEqual(schedule[-1][-1], ("5", "1"))
+        schedule.swap_slots(1, 0, 2)
+        self.assertEqual(list(schedule[1]), [("1", "2"), ("5", "3"), ("6", "4")])
+
+    def test_works_as_round_robin_rounds(self):
+        players = [f"{pl:>2}" for pl in range(1, 15)]
+        rounds = berger_tables(players[:])
+        schedule = ScheduleArray.from_rounds(rounds, players=players)
+
+        self.assertEqual(round_robin_rounds_to_str_list(schedule, fmt_width=2),
+                         round_robin_rounds_to_str_list(rounds, fmt_width=2))
+        self.assertEqual(get_just_score(players, 7, schedule)[:2],
+                         get_just_score(players, 7, rounds)[:2])
+
+        rounds_new, score_before, score_after = \
+                equalize_schedules_in_rounds(rounds, eq_type="DIAG_R2L2R", players=players)
+        schedule_new, score_before_2, score_after_2 = \
+                equalize_schedules_in_rounds(schedule, eq_type="DIAG_R2L2R", players=players)
+        self.assertIsInstance(schedule_new, ScheduleArray)
+        self.assertEqual((score_before, score_after), (score_before_2, score_after_2))
+        self.assertEqual(schedule_new, rounds_new)
+        # original is not changed
+        self.assertEqual(schedule, rounds)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy(self):
+        players = [str(pl) for pl in range(1, 9)]
+        schedule = ScheduleArray.from_rounds(berger_tables(players[:]), players=players)
+        block = schedule.to_numpy()
+        self.assertEqual(block.shape, (7, 4, 2))
+        self.assertEqual(block[0, 0].tolist(), [0, 7])
+        self.assertEqual(ScheduleArray.from_numpy(players, block), schedule)
+
+    def test_berger_circle_array(self):
+        for nr_of_players in list(range(1, 40)) + [101, 250]:
+            players = [str(pl) for pl in range(1, nr_of_players+1)]
+            n = nr_of_players + nr_of_players % 2
+
+            schedule = berger_array(players)
+            self.assertEqual(schedule, berger_tables(players[:]))
+            self.assertEqual(list(schedule.data), _berger_idxs_python(n))
+
+            schedule = circle_array(players)
+            self.assertEqual(schedule, circle_tables(players[:]))
+            self.assertEqual(list(schedule.data), _circle_idxs_python(n))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_berger_array_large(self):
+        players = list(range(10000))
+        time_start = time.perf_counter()
+        schedule = berger_array(players)
+        self.assertLess(time.perf_counter() - time_start, 1.0)
+
+        block = schedule.to_numpy()
+        for round_idx in (0, 1, 5000, 9998):
+            for slot_idx in (0, 1, 2500, 4999):
+                pl1, pl2 = block[round_idx, slot_idx].tolist()
+                pairing = berger_pairing(10000, pl1, round_idx)
+                self.assertEqual((pairing.slot_idx, pairing.opponent_idx, pairing.is_first), (slot_idx, pl2, True))
+
+
+if __name__ == '__main__':
+    unittest.main()
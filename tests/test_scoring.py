@@ -0,0 +1,158 @@
+"""
+run like:
+
+    python -m unittest tests.test_scoring
+"""
+import unittest
+import random
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import (
+        berger_tables, IncrementalScore, ScheduleArray,
+        batch_scores, batch_scores_permutations,
+        )
+from round_robin_pairs.base import (
+        get_just_score, swap, circle_tables, get_swap_idxs, SwapCandidateScorer,
+        find_best_equalize_solution,
+        )
+from round_robin_pairs import scoring
+
+
+class TestIncrementalScore(unittest.TestCase):
+
+    def test_same_as_get_just_score(self):
+        for nr_of_players in (4, 5, 6, 10, 14, 16):
+            players = [str(pl) for pl in range(1, nr_of_players+1)]
+            rounds = berger_tables(players)
+            nr_schedules = len(rounds[0])
+            scorer = IncrementalScore(rounds, players=players)
+
+            score_by_players, score, _, _ = get_just_score(players, nr_schedules, rounds)
+            self.assertEqual(scorer.score, score)
+            self.assertEqual(scorer.get_score_by_players(), score_by_players)
+
+            rnd = random.Random(nr_of_players)
+            for _ in range(200):
+                round_idx = rnd.randrange(len(rounds))
+                slot_idx_1, slot_idx_2 = rnd.randrange(nr_schedules), rnd.randrange(nr_schedules)
+                score_before = scorer.score
+                delta = scorer.swap_delta(round_idx, slot_idx_1, slot_idx_2)
+                self.assertEqual(scorer.score, score_before)
+                self.assertEqual(scorer.apply_swap(round_idx, slot_idx_1, slot_idx_2), delta)
+
+                swap(rounds[round_idx], (slot_idx_1, slot_idx_2))
+                score_by_players, score, _, _ = get_just_score(players, nr_schedules, rounds)
+                self.assertEqual(scorer.score, score)
+                self.assertEqual(scorer.score - score_before, delta)
+                self.assertEqual(scorer.get_score_by_players(), score_by_players)
+                self.assertEqual(scorer.schedule, rounds)
+
+    def test_undo(self):
+        players = [str(pl) for pl in range(1, 11)]
+        rounds = berger_tables(players)
+        scorer = IncrementalScore(rounds)
+        score = scorer.score
+        deltas = [scorer.apply_swap(0, 0, 3), scorer.apply_swap(1, 0, 2), scorer.apply_swap(0, 1, 4)]
+        self.assertEqual(scorer.score, score + sum(deltas))
+        for delta in reversed(deltas):
+            self.assertEqual(scorer.undo(), -delta)
+        self.assertEqual(scorer.score, score)
+        self.assertEqual(scorer.schedule, rounds)
+
+        # not recorded - can not be undone, score is updated
+        delta = scorer.apply_swap(1, 0, 2, record=False)
+        self.assertEqual(scorer.history, [])
+        self.assertEqual(scorer.score, score + delta)
+        self.assertNotEqual(scorer.schedule, rounds)
+
+
+class TestBatchScores(unittest.TestCase):
+
+    def _random_candidates(self, nr_of_players, nr_candidates):
+        players = [str(pl) for pl in range(1, nr_of_players+1)]
+        rounds = berger_tables(players)
+        base = ScheduleArray.from_rounds(rounds, players=players)
+        rnd = random.Random(nr_of_players)
+        permutations, expected = [], []
+        for _ in range(nr_candidates):
+            permutation = []
+            for round_idx in range(base.nr_rounds):
+                round_perm = list(range(base.nr_slots))
+                rnd.shuffle(round_perm)
+                permutation.append(round_perm)
+            permutations.append(permutation)
+            candidate = [[rounds[round_idx][slot_idx] for slot_idx in round_perm]
+                         for round_idx, round_perm in enumerate(permutation)]
+            expected.append(get_just_score(players, base.nr_slots, candidate)[1])
+        return base, permutations, expected
+
+    def _check(self):
+        for nr_of_players in (4, 7, 10, 16):
+            base, permutations, expected = self._random_candidates(nr_of_players, 30)
+            self.assertEqual(batch_scores_permutations(base, permutations), expected)
+            candidates = [scoring.apply_permutation(base, permutation) for permutation in permutations]
+            self.assertEqual(batch_scores(candidates, len(base.players)), expected)
+
+    @unittest.skipIf(scoring.np is None, "numpy not installed")
+    def test_numpy(self):
+        self._check()
+        # chunks of candidates
+        batch_counts_max = scoring.BATCH_COUNTS_MAX
+        try:
+            scoring.BATCH_COUNTS_MAX = 100
+            self._check()
+        finally:
+            scoring.BATCH_COUNTS_MAX = batch_counts_max
+
+    def test_python(self):
+        np = scoring.np
+        try:
+            scoring.np = None
+            self._check()
+        finally:
+            scoring.np = np
+
+
+class TestDiagonalScores(unittest.TestCase):
+
+    def _check(self):
+        for function, nr_of_players in ((berger_tables, 3), (berger_tables, 4), (berger_tables, 10),
+                                        (berger_tables, 15), (berger_tables, 22),
+                                        (circle_tables, 7), (circle_tables, 12)):
+            players = [str(pl) for pl in range(1, nr_of_players+1)]
+            rounds = function(players)
+            players_all = sorted(set(pl for round_pairs in rounds for pair in round_pairs for pl in pair))
+            scorer = SwapCandidateScorer(rounds, players=players_all)
+            nr_schedules = scorer.nr_schedules
+            expected = [scorer.score(get_swap_idxs(eq_type, nr_rounds=len(rounds), nr_schedules=nr_schedules, offset_x=offset_x))
+                        for eq_type in scoring.DIAGONAL_EQ_TYPES
+                        for offset_x in range(nr_schedules)]
+            self.assertEqual(scoring.diagonal_scores(scorer.base, len(players_all)), expected)
+
+    @unittest.skipIf(scoring.np is None, "numpy not installed")
+    def test_numpy(self):
+        self._check()
+
+    def test_python(self):
+        np = scoring.np
+        try:
+            scoring.np = None
+            self._check()
+        finally:
+            scoring.np = np
+
+    def test_find_best_unchanged(self):
+        # same selection as candidates scored one by one
+        for nr_of_players, target_score, expected in ((10, None, (23, "DIAG_R2L2R", 0)),
+                                                      (16, 60, (58, "DIAG_L2R", 2))):
+            players = [str(pl) for pl in range(1, nr_of_players+1)]
+            best_result = find_best_equalize_solution(berger_tables(players), players,
+                                                      brute_force_factor=None, target_score=target_score)
+            self.assertEqual((best_result.best_score, best_result.best_eq_type, best_result.best_offset_x), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
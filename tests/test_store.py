@@ -0,0 +1,98 @@
+"""
+run like:
+
+    python -m unittest tests.test_store
+"""
+import unittest
+import tempfile
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import (
+        berger_tables, circle_tables, find_best_equalize_solution,
+        ScheduleStore, StoreVariant, build_store,
+        )
+from round_robin_pairs.store import main
+
+
+def as_tuples(rounds):
+    return [[tuple(pair) for pair in round_pairs] for round_pairs in rounds]
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "tables.rrps")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_build_and_read(self):
+        build_store(self.path, 3, 30, variants=StoreVariant.values(), best_max_players=12)
+        store = ScheduleStore(self.path)
+        for nr_of_players in range(3, 31):
+            players = [f"P{pl}" for pl in range(1, nr_of_players+1)]
+
+            schedule = store.get(nr_of_players, players=players)
+            self.assertEqual(schedule, berger_tables(players[:]))
+            self.assertEqual(store.get(nr_of_players, "CIRCLE", players=players), circle_tables(players[:]))
+
+            if nr_of_players % 2 == 0 and (nr_of_players - 4) % 6 != 0:
+                self.assertEqual(store.get(nr_of_players, StoreVariant.BERGER_IDEAL, players=players),
+                                 berger_tables(players[:], ideal=True))
+            else:
+                self.assertNotIn((StoreVariant.BERGER_IDEAL, nr_of_players), store)
+
+            if nr_of_players <= 12:
+                rounds = berger_tables(players)
+                best_result = find_best_equalize_solution(rounds, players=players, brute_force_factor=None)
+                self.assertEqual(store.get(nr_of_players, StoreVariant.BERGER_BEST, players=players[:nr_of_players]),
+                                 best_result.best_rounds)
+            else:
+                self.assertNotIn((StoreVariant.BERGER_BEST, nr_of_players), store)
+
+        store.close()
+
+    def test_zero_copy_read_only(self):
+        build_store(self.path, 5, 6)
+        with ScheduleStore(self.path) as store:
+            schedule = store.get(5)
+            self.assertEqual(schedule[0][0], (0, "BYE"))
+            self.assertIsInstance(schedule.data, memoryview)
+            with self.assertRaises(TypeError):
+                schedule.swap_slots(0, 0, 1)
+            with self.assertRaisesRegex(KeyError, "Variant BERGER for 7 players not in store"):
+                store.get(7)
+
+    def test_schedule_alive_after_close(self):
+        build_store(self.path, 10, 10)
+        with ScheduleStore(self.path) as store:
+            schedule = store.get(10, players=list("abcdefghij"))
+        # data copied on close, mmap is closed
+        self.assertIsNone(store.mmap)
+        self.assertNotIsInstance(schedule.data, memoryview)
+        self.assertEqual(schedule, berger_tables(list("abcdefghij")))
+        self.assertEqual(schedule.to_rounds()[0][0], ("a", "j"))
+        store.close()
+        with self.assertRaisesRegex(ValueError, "is closed"):
+            store.get(10)
+
+    def test_close_with_data_views(self):
+        build_store(self.path, 10, 10)
+        store = ScheduleStore(self.path)
+        data = store.get(10).data[:4]
+        with self.assertRaisesRegex(BufferError, "views of its data are still used"):
+            store.close()
+        data.release()
+
+    def test_main(self):
+        main(["build", self.path, "--from", "3", "--to", "8", "--variants", "BERGER"])
+        with ScheduleStore(self.path) as store:
+            self.assertEqual(sorted(nr for _, nr in store.entries), [3, 4, 5, 6, 7, 8])
+
+
+if __name__ == '__main__':
+    unittest.main()
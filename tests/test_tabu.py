@@ -0,0 +1,72 @@
+"""
+run like:
+
+    python -m unittest tests.test_tabu
+"""
+import unittest
+import os, sys
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import tabu_schedule, EqualizeType
+from round_robin_pairs.base import create_demo_rounds_str_list, get_just_score
+from round_robin_pairs.tabu import benchmark
+
+
+class TestTabu(unittest.TestCase):
+
+    def _check_result(self, round_robin_rounds, players, best_result):
+        # same pairs in every round, only schedules (slots) are changed
+        for round_pairs, round_pairs_new in zip(round_robin_rounds, best_result.best_rounds):
+            self.assertEqual(set(map(tuple, round_pairs)), set(round_pairs_new))
+        _, score, _, _ = get_just_score(players, len(round_robin_rounds[0]), best_result.best_rounds)
+        self.assertEqual(score, best_result.best_score)
+        self.assertEqual(best_result.best_eq_type, EqualizeType.TABU)
+
+    def test_10_finds_ideal(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(10, berger=True, return_all=True)
+        best_result = tabu_schedule(round_robin_rounds, players, max_iterations=300, seed=1)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertEqual(best_result.score_before, 25)
+        self.assertTrue(best_result.is_ideal())
+
+    def test_16_better_than_find_best(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(16, berger=True, return_all=True)
+        best_result = tabu_schedule(round_robin_rounds, players, max_iterations=300, seed=1)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertEqual(best_result.score_before, 43)
+        # find_best_equalize_solution() without brute force gets 39
+        self.assertLess(best_result.best_score, 39)
+
+    def test_beam_width_1(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(16, berger=True, return_all=True)
+        best_result = tabu_schedule(round_robin_rounds, players, max_iterations=300, beam_width=1, seed=1)
+        self._check_result(round_robin_rounds, players, best_result)
+        self.assertLess(best_result.best_score, 39)
+
+    def test_reproducible(self):
+        rounds_str_list, round_robin_rounds, players = \
+            create_demo_rounds_str_list(22, berger=True, return_all=True)
+        best_result_1 = tabu_schedule(round_robin_rounds, players, max_iterations=30, seed=7)
+        best_result_2 = tabu_schedule(round_robin_rounds, players, max_iterations=30, seed=7)
+        self.assertEqual(best_result_1.best_rounds, best_result_2.best_rounds)
+        self._check_result(round_robin_rounds, players, best_result_1)
+
+    def test_budget_required(self):
+        with self.assertRaisesRegex(ValueError, "Provide max_iterations and/or time_budget"):
+            tabu_schedule([[("1", "2")]], ["1", "2"], max_iterations=None)
+
+    def test_benchmark(self):
+        (nr_players, random_score, tabu_score, elapsed), = benchmark([16], brute_force_factor=100, seed=1)
+        # tabu gets the same time as random search, few iterations are enough to match it
+        self.assertEqual(nr_players, 16)
+        self.assertLessEqual(random_score, 39)
+        self.assertLessEqual(tabu_score, random_score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+run like:
+
+    python -m unittest tests.test_validate
+"""
+import unittest
+import os, sys
+import time
+
+root_path = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, root_path)
+
+from round_robin_pairs import (
+        berger_tables, circle_tables, berger_array, circle_array, ScheduleArray,
+        find_violation, validate_schedule, ViolationKind,
+        )
+from round_robin_pairs import validate
+from round_robin_pairs.base import BYE
+
+
+def _players(nr_players):
+    return [f"P{nr:02}" for nr in range(1, nr_players + 1)]
+
+
+class TestValidate(unittest.TestCase):
+
+    def setUp(self):
+        # numpy path for small schedules too
+        self.numpy_min_players = validate.NUMPY_MIN_PLAYERS
+        validate.NUMPY_MIN_PLAYERS = 0
+
+    def tearDown(self):
+        validate.NUMPY_MIN_PLAYERS = self.numpy_min_players
+
+    def _find_violation(self, round_robin_rounds, players=None):
+        " numpy (if available) and python must report the same "
+        violation = find_violation(round_robin_rounds, players)
+        np_orig = validate.np
+        validate.np = None
+        try:
+            violation_python = find_violation(round_robin_rounds, players)
+        finally:
+            validate.np = np_orig
+        self.assertEqual(violation, violation_python)
+        return violation
+
+    def test_valid(self):
+        for nr_players in range(3, 21):
+            players = _players(nr_players)
+            for function in (berger_tables, circle_tables):
+                round_robin_rounds = function(players)
+                self.assertIsNone(self._find_violation(round_robin_rounds, players))
+                self.assertIsNone(self._find_violation(round_robin_rounds))
+                validate_schedule(round_robin_rounds, players)
+            for function in (berger_array, circle_array):
+                self.assertIsNone(self._find_violation(function(players), players))
+
+    def test_ideal(self):
+        players = _players(12)
+        self.assertIsNone(self._find_violation(berger_tables(players, ideal=True), players))
+
+    def test_twice_in_round(self):
+        players = _players(6)
+        round_robin_rounds = [list(round_pairs) for round_pairs in berger_tables(players)]
+        # P01 plays twice in round 3
+        pl1, pl2 = round_robin_rounds[2][2]
+        round_robin_rounds[2][2] = ("P01", pl2)
+        violation = self._find_violation(round_robin_rounds, players)
+        self.assertEqual(violation.kind, ViolationKind.TWICE_IN_ROUND)
+        self.assertEqual((violation.round_idx, violation.slot_idx), (2, 2))
+        self.assertIn("P01 plays twice", str(violation))
+        with self.assertRaisesRegex(ValueError, "Invalid schedule: Player P01 plays twice in round 3, slot 3"):
+            validate_schedule(round_robin_rounds, players)
+
+    def test_same_player(self):
+        players = _players(6)
+        round_robin_rounds = [list(round_pairs) for round_pairs in circle_tables(players)]
+        pl1, pl2 = round_robin_rounds[1][0]
+        round_robin_rounds[1][0] = (pl1, pl1)
+        violation = self._find_violation(round_robin_rounds, players)
+        self.assertEqual(violation.kind, ViolationKind.SAME_PLAYER)
+        self.assertEqual((violation.round_idx, violation.slot_idx), (1, 0))
+
+    def test_duplicate_pair(self):
+        players = _players(8)
+        round_robin_rounds = [list(round_pairs) for round_pairs in berger_tables(players)]
+        # round 5 replaced by round 2 - rounds stay valid, pairs are duplicated
+        round_robin_rounds[4] = list(round_robin_rounds[1])
+        violation = self._find_violation(round_robin_rounds, players)
+        self.assertEqual(violation.kind, ViolationKind.DUPLICATE_PAIR)
+        self.assertEqual((violation.round_idx, violation.slot_idx), (4, 0))
+
+    def test_first_violation(self):
+        players = _players(8)
+        round_robin_rounds = [list(round_pairs) for round_pairs in berger_tables(players)]
+        round_robin_rounds[5] = list(round_robin_rounds[0])
+        pl1, pl2 = round_robin_rounds[3][1]
+        round_robin_rounds[3][1] = (pl1, pl1)
+        violation = self._find_violation(round_robin_rounds, players)
+        self.assertEqual(violation.kind, ViolationKind.SAME_PLAYER)
+        self.assertEqual((violation.round_idx, violation.slot_idx), (3, 1))
+
+    def test_players(self):
+        players = _players(6)
+        round_robin_rounds = berger_tables(players)
+        violation = self._find_violation(round_robin_rounds, players[:-1] + ["X"])
+        self.assertEqual(violation.kind, ViolationKind.PLAYERS)
+        violation = self._find_violation(berger_array(players), players[:-1] + ["X"])
+        self.assertEqual(violation.kind, ViolationKind.PLAYERS)
+        # BYE with even number of players
+        violation = self._find_violation(ScheduleArray(players + [BYE], 0, 3))
+        self.assertEqual(violation.kind, ViolationKind.PLAYERS)
+        self.assertIn("BYE with even number", str(violation))
+
+    def test_shape(self):
+        players = _players(6)
+        round_robin_rounds = berger_tables(players)
+        violation = self._find_violation(round_robin_rounds[:-1], players)
+        self.assertEqual(violation.kind, ViolationKind.SHAPE)
+        round_robin_rounds = [list(round_pairs) for round_pairs in round_robin_rounds]
+        round_robin_rounds[2].pop()
+        violation = self._find_violation(round_robin_rounds, players)
+        self.assertEqual(violation.kind, ViolationKind.SHAPE)
+        self.assertEqual(violation.round_idx, 2)
+
+    @unittest.skipIf(validate.np is None, "numpy not installed")
+    def test_large(self):
+        schedule = berger_array(_players(5000))
+        time_start = time.perf_counter()
+        self.assertIsNone(find_violation(schedule))
+        self.assertLess(time.perf_counter() - time_start, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()